@@ -1,4 +1,25 @@
+import logging
+
 from .analytics import Analytics
 from .enums import Measure, Group, Frequency
 from .formatter import Formatter
-from .client import Client
\ No newline at end of file
+from .columnar import ColumnarTable, DictionaryColumn, CohortMatrix
+from .records import Record, TimeSeriesRecord, RetentionRecord, ReviewRecord
+from .export import Exporter, NDJSONExporter, CSVExporter, ParquetExporter
+from .client import Client
+from .ratelimit import RateLimiter
+from .coordination import Coordinator, MemoryCoordinator, SQLiteCoordinator
+from .instrumentation import Instrumentation, RequestEvent, Metrics, Histogram
+from .transport import ReplayTransport, RecordingTransport
+from .decoder import JSONDecoder
+from .reviews import Reviews
+from .bulk import BulkExtractor, Job, JobResult
+from .cache import Cache, MemoryCache, SQLiteCache
+from .singleflight import SingleFlight, AsyncSingleFlight
+from .sync import IncrementalSync, StateStore, MemoryStateStore, SQLiteStateStore
+from .async_client import AsyncClient
+from .async_analytics import AsyncAnalytics
+from .async_reviews import AsyncReviews
+
+# The library only emits log records; configuring handlers is left to the application.
+logging.getLogger(__name__).addHandler(logging.NullHandler())
\ No newline at end of file
@@ -1,8 +1,18 @@
 import json
-from typing import List, Optional, Callable
+import logging
+import itertools
+import collections
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Callable, Tuple, Union
 import datetime as dt
 from .enums import Measure, Group, Frequency
 from .formatter import Formatter
+from .cache import Cache
+from .singleflight import SingleFlight
+from .exceptions import AppStoreConnectAnalyticsIncompleteError
+
+logger = logging.getLogger(__name__)
 
 
 class Analytics:
@@ -10,19 +20,82 @@ class Analytics:
     The Analytics class is used to retrieve analytics data from the App Store Connect API.
     """
 
-    def __init__(self, client):
+    MAX_APPS_PER_REQUEST = 25
+
+    # Number of top ranked segments returned by a grouped request
+    GROUP_LIMIT = 10
+
+    # Measures whose segments add up to the total
+    ADDITIVE_MEASURES = (
+        Measure.CRASHES,
+        Measure.INSTALLS,
+        Measure.UNINSTALLS,
+        Measure.UNITS,
+        Measure.SALES,
+    )
+
+    # Groupings whose requests can carry several measures; grouped requests rank
+    # the segments by a single metric.
+    MULTI_MEASURE_GROUPINGS = (Group.TOTAL,)
+
+    # Maximum number of periods requested in one time series request. Grouped
+    # requests rank their top segments per request, so they are only chunked when
+    # dimension filters pin the segments; see `_get_chunk_periods`.
+    CHUNK_PERIODS = {
+        Frequency.DAY: 90,
+        Frequency.WEEK: 26,
+        Frequency.MONTH: 12,
+    }
+
+    # Weekday on which the weekly periods of the API start (Sunday).
+    WEEK_START = 6
+
+    def __init__(
+        self,
+        client,
+        max_apps_per_request: int = MAX_APPS_PER_REQUEST,
+        max_workers: int = 4,
+        chunk_periods: Optional[Dict[Frequency, int]] = None,
+        cache: Optional[Cache] = None,
+        group_limit: int = GROUP_LIMIT,
+        single_flight: Optional[SingleFlight] = None,
+    ):
         """
         Initializes the Analytics class.
 
         :param client: The client to use for the requests.
         :type client: AppStoreConnectClient
+        :param max_apps_per_request: The maximum number of app IDs packed into one request.
+        :type max_apps_per_request: int
+        :param max_workers: The maximum number of date range chunks fetched concurrently (default: 4).
+        :type max_workers: int
+        :param chunk_periods: The maximum number of periods per request for each frequency,
+            overriding `CHUNK_PERIODS`. Grouped requests are not chunked unless their
+            dimension filters pin the segments.
+        :type chunk_periods: Optional[Dict[Frequency, int]]
+        :param cache: The cache of the responses keyed by the account of the client and the
+            request payload (default: None).
+        :type cache: Optional[Cache]
+        :param group_limit: The number of top ranked segments requested by grouped
+            requests (default: 10).
+        :type group_limit: int
+        :param single_flight: The coalescing of identical concurrent requests, which can be
+            shared by several Analytics objects; only requests of the same account are
+            coalesced. An AsyncSingleFlight for AsyncAnalytics (default: None).
+        :type single_flight: Optional[SingleFlight]
         """
         self.client = client
+        self.max_apps_per_request = max_apps_per_request
+        self.max_workers = max_workers
+        self.chunk_periods = {**Analytics.CHUNK_PERIODS, **(chunk_periods or {})}
+        self.cache = cache
+        self.group_limit = group_limit
+        self.single_flight = single_flight
 
     def get_time_series(
         self,
-        app_id: str,
-        measure: Measure,
+        app_id: Union[str, List[str]],
+        measure: Union[Measure, List[Measure]],
         start_date: dt.date,
         end_date: dt.date,
         grouping: Optional[Group] = Group.TOTAL,
@@ -33,9 +106,95 @@ class Analytics:
         """
         Method to retrieve the time series data for the specified measure and grouping.
 
-        :param app_id: The App Store Connect app IDs.
-        :type app_id: str
-        :param measure: The measure to retrieve data for.
+        :param app_id: The App Store Connect app ID or a list of app IDs. The app IDs
+            are packed into as few requests as `max_apps_per_request` allows.
+        :type app_id: Union[str, List[str]]
+        :param measure: The measure or a list of measures to retrieve data for. Several
+            measures are fetched in one request where the grouping allows it and in
+            concurrent requests otherwise; the rows then carry a column per measure.
+        :type measure: Union[Measure, List[Measure]]
+        :param start_date: The start date for the time series data. Long date ranges
+            are split into chunks of at most `chunk_periods` periods that are fetched
+            concurrently and merged in order. Grouped requests are split only when the
+            dimension filters select at most `group_limit` segments of the grouping,
+            otherwise every chunk would rank its own top segments.
+        :type start_date: dt.date
+        :param end_date: The end date for the time series data.
+        :type end_date: dt.date
+        :param grouping: The grouping to retrieve data for.
+        :type grouping: Group
+        :param frequency: The frequency to retrieve data for.
+        :type frequency: Frequency
+        :param dimension_filters: The dimension filters to apply to the data.
+        :type dimension_filters: List
+        :param formatter: The formatter to apply to the data.
+        :type formatter: Callable
+
+        :return: The time series data.
+        :rtype: dict
+        """
+        # Get the endpoint for the request.
+        url = self.client.get_endpoint(
+            subject="time-series",
+        )
+
+        # Do one request per batch of measures, date range chunk and batch of app IDs.
+        batches = [
+            self._get_time_series_payloads(
+                app_id=app_id,
+                measure=measures,
+                start_date=start_date,
+                end_date=end_date,
+                grouping=grouping,
+                frequency=frequency,
+                dimension_filters=dimension_filters,
+            )
+            for measures in self._get_measure_batches(measure=measure, grouping=grouping)
+        ]
+
+        # All requests are in flight together, the responses of every batch are merged in order.
+        responses = self._request_all(url=url, payloads=list(itertools.chain.from_iterable(batches)))
+
+        data = self._join_time_series(datas=[
+            self._merge_time_series(responses=itertools.islice(responses, len(payloads)))
+            for payloads in batches
+        ])
+
+        return formatter(data=data, grouping=grouping, measure=measure)
+
+    def get_complete_time_series(
+        self,
+        app_id: Union[str, List[str]],
+        measure: Measure,
+        start_date: dt.date,
+        end_date: dt.date,
+        grouping: Group,
+        frequency: Frequency = Frequency.DAY,
+        option_keys: Optional[List[str]] = None,
+        dimension_filters: Optional[List] = None,
+        formatter: Callable = Formatter.run,
+        reconcile: bool = True,
+        tolerance: float = 0.0,
+        strict: bool = False,
+    ):
+        """
+        Method to retrieve the time series data of all segments of the grouping.
+
+        Grouped requests return only the `group_limit` top ranked segments. When a
+        response is saturated, i.e. an app has as many segments as the limit, the
+        segments missing from any response, i.e. the `option_keys` and the ranked
+        segments some app lacks, are fetched again with dimension filters selecting at
+        most `group_limit` of them per request, and the partitions are fetched
+        concurrently. Without `option_keys` the long tail
+        cannot be requested and a truncation warning is logged instead.
+
+        For additive measures the sums of the segments are reconciled date by date
+        against the `Group.TOTAL` series of every app, ignoring the values hidden by
+        the privacy threshold.
+
+        :param app_id: The App Store Connect app ID or a list of app IDs.
+        :type app_id: Union[str, List[str]]
+        :param measure: The measure to retrieve data for; a list of measures raises a ValueError.
         :type measure: Measure
         :param start_date: The start date for the time series data.
         :type start_date: dt.date
@@ -45,38 +204,206 @@ class Analytics:
         :type grouping: Group
         :param frequency: The frequency to retrieve data for.
         :type frequency: Frequency
+        :param option_keys: All segment keys of the grouping, e.g. the storefront codes
+            for Group.COUNTRY (default: None).
+        :type option_keys: Optional[List[str]]
         :param dimension_filters: The dimension filters to apply to the data.
         :type dimension_filters: List
         :param formatter: The formatter to apply to the data.
         :type formatter: Callable
+        :param reconcile: Whether to reconcile the segments against the totals (default: True).
+        :type reconcile: bool
+        :param tolerance: The accepted sum of the absolute differences of the dates (default: 0.0).
+        :type tolerance: float
+        :param strict: Whether to raise an AppStoreConnectAnalyticsIncompleteError when
+            the segments do not add up to the totals (default: False).
+        :type strict: bool
 
         :return: The time series data.
         :rtype: dict
         """
-        # Get the endpoint for the request.
+        self._check_single_measure(measure=measure, method="get_complete_time_series")
+
         url = self.client.get_endpoint(
             subject="time-series",
         )
 
-        # Do the request.
-        payload = {
-            "adamId": [str(app_id)],
-            "measures": [measure.value],
-            "frequency": frequency.value,
-            "startTime": start_date.strftime("%Y-%m-%d") + "T00:00:00Z",
-            "endTime": end_date.strftime("%Y-%m-%d") + "T00:00:00Z",
+        kwargs = {
+            "app_id": app_id,
+            "measure": measure,
+            "start_date": start_date,
+            "end_date": end_date,
+            "grouping": grouping,
+            "frequency": frequency,
         }
 
-        if grouping != Group.TOTAL:
-            payload["group"] = self._get_group(grouping=grouping, measure=measure)
+        responses = list(self._request_all(
+            url=url,
+            payloads=self._get_time_series_payloads(dimension_filters=dimension_filters, **kwargs),
+        ))
 
-        data = self.client.request(url=url, method="POST", data=payload)
+        data, payloads = self._get_remaining_segments(
+            responses=responses,
+            option_keys=option_keys,
+            dimension_filters=dimension_filters,
+            **kwargs,
+        )
+
+        if payloads:
+            data = self._merge_time_series(
+                responses=self._request_all(url=url, payloads=payloads),
+                data=data,
+            )
+
+        if reconcile and measure in Analytics.ADDITIVE_MEASURES:
+            totals = self._merge_time_series(
+                responses=self._request_all(
+                    url=url,
+                    payloads=self._get_time_series_payloads(
+                        dimension_filters=dimension_filters,
+                        **{**kwargs, "grouping": Group.TOTAL},
+                    ),
+                )
+            )
+
+            self._check_totals(
+                data=data,
+                totals=totals,
+                grouping=grouping,
+                measure=measure,
+                tolerance=tolerance,
+                strict=strict,
+            )
 
         return formatter(data=data, grouping=grouping, measure=measure)
-    
+
+    def _get_remaining_segments(
+        self,
+        responses: List[dict],
+        option_keys: Optional[List[str]],
+        dimension_filters: Optional[List],
+        **kwargs,
+    ) -> Tuple[dict, List[dict]]:
+        """
+        Merges the segments of the top ranked pass and returns the payloads of the
+        segments to fetch again.
+
+        When the responses are saturated, the segments missing from any response,
+        i.e. the `option_keys` and the ranked segments some app lacks, are
+        partitioned into requests of at most `group_limit` segments. Without
+        `option_keys` a truncation warning is logged instead.
+
+        :param responses: The decoded responses of the top ranked pass.
+        :type responses: List[dict]
+        :param option_keys: All segment keys of the grouping.
+        :type option_keys: Optional[List[str]]
+        :param dimension_filters: The dimension filters to apply to the data.
+        :type dimension_filters: List
+        :param kwargs: The arguments of `_get_time_series_payloads` shared by the requests.
+        :type kwargs: dict
+
+        :return: The merged response and the payloads of the remaining segments.
+        :rtype: Tuple[dict, List[dict]]
+        """
+        grouping = kwargs.get("grouping")
+
+        if not self._is_saturated(responses=responses, limit=self.group_limit):
+            return self._merge_time_series(responses=responses), []
+
+        if not option_keys:
+            logger.warning(
+                "The %s segments are truncated to the top %d, pass option_keys to fetch all of them",
+                grouping.value,
+                self.group_limit,
+            )
+
+            return self._merge_time_series(responses=responses), []
+
+        # Keep the segments of the top ranked pass only when every response has them;
+        # the others are fetched again, also when they are missing from option_keys.
+        complete_keys = self._get_complete_keys(responses=responses)
+        ranked_keys = [
+            Analytics._get_series_key(item=item)[1]
+            for response in responses
+            for item in response.get("results") or []
+        ]
+        remaining = [
+            key
+            for key in dict.fromkeys(list(option_keys) + ranked_keys)
+            if key is not None and key not in complete_keys
+        ]
+
+        data = self._merge_time_series(
+            responses=(
+                {**response, "results": [
+                    item
+                    for item in response.get("results") or []
+                    if Analytics._get_series_key(item=item)[1] in complete_keys
+                ]}
+                for response in responses
+            )
+        )
+
+        payloads = []
+
+        for i in range(0, len(remaining), self.group_limit):
+            partition = remaining[i:i + self.group_limit]
+
+            payloads.extend(self._get_time_series_payloads(
+                dimension_filters=list(dimension_filters or []) + [
+                    {"dimensionKey": grouping.value, "optionKeys": partition}
+                ],
+                group_limit=len(partition),
+                **kwargs,
+            ))
+
+        logger.debug("Fetching %d segments in %d partitioned requests", len(remaining), len(payloads))
+
+        return data, payloads
+
+    @staticmethod
+    def _check_totals(
+        data: dict,
+        totals: dict,
+        grouping: Group,
+        measure: Measure,
+        tolerance: float = 0.0,
+        strict: bool = False,
+    ) -> None:
+        """
+        Logs, or raises when strict, the dates on which the segments do not add up to the totals.
+
+        :param data: The merged grouped response.
+        :type data: dict
+        :param totals: The merged response of the totals.
+        :type totals: dict
+        :param grouping: The grouping of the data.
+        :type grouping: Group
+        :param measure: The measure of the data.
+        :type measure: Measure
+        :param tolerance: The accepted sum of the absolute differences of the dates (default: 0.0).
+        :type tolerance: float
+        :param strict: Whether to raise an AppStoreConnectAnalyticsIncompleteError (default: False).
+        :type strict: bool
+        """
+        gaps = Analytics._reconcile_time_series(
+            data=data,
+            totals=totals,
+            measure=measure,
+            tolerance=tolerance,
+        )
+
+        if gaps:
+            logger.warning("The %s segments do not add up to the totals: %s", grouping.value, gaps)
+
+            if strict:
+                raise AppStoreConnectAnalyticsIncompleteError(
+                    message=F"The {grouping.value} segments do not add up to the totals: {gaps}",
+                    gaps=gaps,
+                )
 
     def get_retentions(self,
-            app_id: str,
+            app_id: Union[str, List[str]],
             start_date: dt.datetime = dt.datetime.utcnow() - dt.timedelta(days=7),
             end_date: dt.datetime = dt.datetime.utcnow(),
             frequency: Frequency = Frequency.DAY,
@@ -85,8 +412,8 @@ class Analytics:
             ) -> list:
         """Method to retrieve the retentions data for the specified app, time range and if passed, dimension filters.
 
-        :param app_id: The App Store Connect app ID.
-        :type app_id: str
+        :param app_id: The App Store Connect app ID or a list of app IDs.
+        :type app_id: Union[str, List[str]]
         :param start_date: The start date for the retentions data.
         :type start_date: dt.datetime
         :param end_date: The end date for the retentions data.
@@ -108,22 +435,858 @@ class Analytics:
             subject="retention",
         )
 
-        # Do the request.
+        # Do one request per batch of app IDs.
+        responses = []
+
+        for app_ids in self._get_app_id_batches(app_id=app_id):
+
+            payload = self._get_retentions_payload(
+                app_id=app_ids,
+                start_date=start_date,
+                end_date=end_date,
+                frequency=frequency,
+                dimension_filters=dimension_filters,
+            )
+
+            responses.append(self._request(url=url, payload=payload))
+
+        data = self._merge_responses(responses=responses)
+
+        return formatter(data=data, grouping=dimension_filters)
+
+    def iter_time_series(
+        self,
+        app_id: Union[str, List[str]],
+        measure: Measure,
+        start_date: dt.date,
+        end_date: dt.date,
+        grouping: Optional[Group] = Group.TOTAL,
+        frequency: Frequency = Frequency.DAY,
+        dimension_filters: Optional[List] = None,
+        formatter: Callable = Formatter.iter_run,
+        stream: bool = False,
+    ) -> Iterator:
+        """
+        Method to iterate over the time series rows, response by response.
+
+        The rows of a date range chunk are yielded as soon as the chunk arrives,
+        while the following chunks are still being fetched.
+
+        :param app_id: The App Store Connect app ID or a list of app IDs.
+        :type app_id: Union[str, List[str]]
+        :param measure: The measure to retrieve data for; a list of measures raises a ValueError.
+        :type measure: Measure
+        :param start_date: The start date for the time series data.
+        :type start_date: dt.date
+        :param end_date: The end date for the time series data.
+        :type end_date: dt.date
+        :param grouping: The grouping to retrieve data for.
+        :type grouping: Group
+        :param frequency: The frequency to retrieve data for.
+        :type frequency: Frequency
+        :param dimension_filters: The dimension filters to apply to the data.
+        :type dimension_filters: List
+        :param formatter: The formatter applied to every response, returning an iterable of rows.
+        :type formatter: Callable
+        :param stream: Whether to parse the responses incrementally while they are received.
+            Only a batch of series is then kept in memory, the requests are sent one
+            after another and the cache is bypassed (default: False).
+        :type stream: bool
+
+        :return: The time series rows.
+        :rtype: Iterator
+        """
+        self._check_single_measure(measure=measure, method="iter_time_series")
+
+        # Get the endpoint for the request.
+        url = self.client.get_endpoint(
+            subject="time-series",
+        )
+
+        payloads = self._get_time_series_payloads(
+            app_id=app_id,
+            measure=measure,
+            start_date=start_date,
+            end_date=end_date,
+            grouping=grouping,
+            frequency=frequency,
+            dimension_filters=dimension_filters,
+        )
+
+        if stream:
+            responses = self._stream_all(url=url, payloads=payloads)
+        else:
+            responses = self._request_all(url=url, payloads=payloads)
+
+        for data in self._dedupe_time_series(responses=responses):
+            yield from formatter(data=data, grouping=grouping, measure=measure)
+
+    def iter_retentions(self,
+            app_id: Union[str, List[str]],
+            start_date: dt.datetime,
+            end_date: dt.datetime,
+            frequency: Frequency = Frequency.DAY,
+            dimension_filters: Optional[list] = None,
+            formatter: Callable = Formatter.iter_retentions
+            ) -> Iterator:
+        """Method to iterate over the retentions rows, response by response.
+
+        :param app_id: The App Store Connect app ID or a list of app IDs.
+        :type app_id: Union[str, List[str]]
+        :param start_date: The start date for the retentions data.
+        :type start_date: dt.datetime
+        :param end_date: The end date for the retentions data.
+        :type end_date: dt.datetime
+        :param frequency: The frequency to retrieve data for.
+        :type frequency: Frequency
+        :param dimension_filters: The dimension filters to apply to the data. (default: None)
+        :type dimension_filters: list
+        :param formatter: The formatter applied to every response, returning an iterable of rows.
+        :type formatter: Callable
+
+        :return: The retentions rows.
+        :rtype: Iterator
+        """
+
+        # Get the endpoint for the request.
+        url = self.client.get_endpoint(
+            subject="retention",
+        )
+
+        dimension_filters = dimension_filters or []
+
+        for app_ids in self._get_app_id_batches(app_id=app_id):
+
+            payload = self._get_retentions_payload(
+                app_id=app_ids,
+                start_date=start_date,
+                end_date=end_date,
+                frequency=frequency,
+                dimension_filters=dimension_filters,
+            )
+
+            yield from formatter(data=self._request(url=url, payload=payload), grouping=dimension_filters)
+
+    def _get_time_series_payloads(
+        self,
+        app_id,
+        measure,
+        start_date,
+        end_date,
+        grouping,
+        frequency,
+        dimension_filters=None,
+        group_limit=None,
+    ) -> List[dict]:
+        """
+        Returns the payloads of all requests needed for the time series, ordered by date.
+
+        :param app_id: The App Store Connect app ID or a list of app IDs.
+        :type app_id: Union[str, List[str]]
+        :param measure: The measure or a list of measures to retrieve data for.
+        :type measure: Union[Measure, List[Measure]]
+        :param start_date: The start date for the time series data.
+        :type start_date: dt.date
+        :param end_date: The end date for the time series data.
+        :type end_date: dt.date
+        :param grouping: The grouping to retrieve data for.
+        :type grouping: Group
+        :param frequency: The frequency to retrieve data for.
+        :type frequency: Frequency
+        :param dimension_filters: The dimension filters to apply to the data.
+        :type dimension_filters: Optional[List[dict]]
+        :param group_limit: The number of top ranked segments, `group_limit` of the
+            Analytics object when None.
+        :type group_limit: Optional[int]
+
+        :return: The payloads for the requests.
+        :rtype: List[dict]
+        """
+        group_limit = self.group_limit if group_limit is None else group_limit
+
+        return [
+            self._get_time_series_payload(
+                app_id=app_ids,
+                measure=measure,
+                start_date=chunk_start,
+                end_date=chunk_end,
+                grouping=grouping,
+                frequency=frequency,
+                dimension_filters=dimension_filters,
+                group_limit=group_limit,
+            )
+            for chunk_start, chunk_end in self._get_date_chunks(
+                start_date=start_date,
+                end_date=end_date,
+                frequency=frequency,
+                periods=self._get_chunk_periods(
+                    grouping=grouping,
+                    frequency=frequency,
+                    dimension_filters=dimension_filters,
+                    group_limit=group_limit,
+                ),
+            )
+            for app_ids in self._get_app_id_batches(app_id=app_id)
+        ]
+
+    def _get_chunk_periods(self, grouping, frequency, dimension_filters, group_limit) -> Optional[int]:
+        """
+        Returns the maximum number of periods per request, None to send the date range at once.
+
+        A grouped request returns the `group_limit` top ranked segments of its own
+        date range, so chunks of one range could rank different segments and the
+        series of a segment would have gaps. Grouped requests are therefore only
+        chunked when the dimension filters select at most `group_limit` segments of
+        the grouping, which then appear in every chunk.
+
+        :param grouping: The grouping to retrieve data for.
+        :type grouping: Group
+        :param frequency: The frequency to retrieve data for.
+        :type frequency: Frequency
+        :param dimension_filters: The dimension filters to apply to the data.
+        :type dimension_filters: Optional[List[dict]]
+        :param group_limit: The number of top ranked segments.
+        :type group_limit: int
+
+        :return: The number of periods or None.
+        :rtype: Optional[int]
+        """
+        if grouping == Group.TOTAL:
+            return self.chunk_periods.get(frequency)
+
+        for dimension_filter in dimension_filters or []:
+            option_keys = dimension_filter.get("optionKeys") or []
+
+            if dimension_filter.get("dimensionKey") == grouping.value and 0 < len(option_keys) <= group_limit:
+                return self.chunk_periods.get(frequency)
+
+        return None
+
+    def _request(self, url: str, payload: dict) -> dict:
+        """
+        Sends the request, answering it from the cache when possible.
+
+        :param url: The URL of the API endpoint.
+        :type url: str
+        :param payload: The payload of the request.
+        :type payload: dict
+
+        :return: The decoded response.
+        :rtype: dict
+        """
+        if self.cache is not None:
+            data = self.cache.get(url=url, payload=payload, identity=getattr(self.client, "identity", None))
+
+            if data is not None:
+                logger.debug("Cache hit: %s", url)
+                return data
+
+        if self.single_flight is not None:
+            return self.single_flight.do(
+                key=self._get_key(url=url, payload=payload),
+                function=lambda: self._fetch(url=url, payload=payload),
+            )
+
+        return self._fetch(url=url, payload=payload)
+
+    def _get_key(self, url: str, payload: dict) -> str:
+        """
+        Returns the key coalescing the request, scoped to the account of the client.
+
+        Clients without an `identity` are scoped to themselves.
+
+        :param url: The URL of the API endpoint.
+        :type url: str
+        :param payload: The payload of the request.
+        :type payload: dict
+
+        :return: The key of the request.
+        :rtype: str
+        """
+        identity = getattr(self.client, "identity", None)
+
+        if identity is None:
+            identity = f"client-{id(self.client)}"
+
+        return Cache.get_key(url=url, payload=payload, identity=identity)
+
+    def _fetch(self, url: str, payload: dict) -> dict:
+        """
+        Sends the request and stores the response in the cache.
+
+        :param url: The URL of the API endpoint.
+        :type url: str
+        :param payload: The payload of the request.
+        :type payload: dict
+
+        :return: The decoded response.
+        :rtype: dict
+        """
+        data = self.client.request(url=url, method="POST", data=payload)
+
+        if self.cache is not None:
+            self.cache.set(url=url, payload=payload, value=data, identity=getattr(self.client, "identity", None))
+
+        return data
+
+    def _request_all(self, url: str, payloads: List[dict]) -> Iterator[dict]:
+        """
+        Sends the requests concurrently and yields the responses in the order of the payloads.
+
+        At most `max_workers` responses are in flight or buffered at any time.
+
+        :param url: The URL of the API endpoint.
+        :type url: str
+        :param payloads: The payloads of the requests.
+        :type payloads: List[dict]
+
+        :return: The decoded responses.
+        :rtype: Iterator[dict]
+        """
+        if len(payloads) == 1 or self.max_workers <= 1:
+            for payload in payloads:
+                yield self._request(url=url, payload=payload)
+            return
+
+        futures = deque()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                for payload in payloads:
+                    futures.append(
+                        executor.submit(self._request, url=url, payload=payload)
+                    )
+
+                    if len(futures) >= self.max_workers:
+                        yield futures.popleft().result()
+
+                while futures:
+                    yield futures.popleft().result()
+
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def _stream_all(self, url: str, payloads: List[dict], batch_size: int = 256) -> Iterator[dict]:
+        """
+        Sends the requests one by one and yields their series in batches as they are parsed.
+
+        :param url: The URL of the API endpoint.
+        :type url: str
+        :param payloads: The payloads of the requests.
+        :type payloads: List[dict]
+        :param batch_size: The maximum number of series per yielded response (default: 256).
+        :type batch_size: int
+
+        :return: The responses with at most `batch_size` series each.
+        :rtype: Iterator[dict]
+        """
+        for payload in payloads:
+            items = self.client.stream(url=url, method="POST", data=payload, path="results")
+
+            while True:
+                results = list(itertools.islice(items, batch_size))
+
+                if not results:
+                    break
+
+                yield {"size": len(results), "results": results}
+
+    @staticmethod
+    def _get_date_chunks(start_date, end_date, frequency, periods) -> List[tuple]:
+        """
+        Splits the date range into consecutive chunks of at most `periods` periods.
+
+        Monthly chunks start on the first day of a month and weekly chunks on
+        `WEEK_START`, so no period is split between two chunks.
+
+        :param start_date: The start date of the range.
+        :type start_date: dt.date
+        :param end_date: The end date of the range (inclusive).
+        :type end_date: dt.date
+        :param frequency: The frequency of the periods.
+        :type frequency: Frequency
+        :param periods: The maximum number of periods per chunk, None to disable chunking.
+        :type periods: Optional[int]
+
+        :return: The list of (start, end) tuples.
+        :rtype: List[tuple]
+        """
+        if not periods:
+            return [(start_date, end_date)]
+
+        if isinstance(start_date, dt.datetime):
+            start_date = start_date.date()
+
+        if isinstance(end_date, dt.datetime):
+            end_date = end_date.date()
+
+        chunks = []
+        chunk_start = start_date
+
+        while chunk_start <= end_date:
+
+            if frequency == Frequency.MONTH:
+                month = chunk_start.month - 1 + periods
+                next_start = dt.date(chunk_start.year + month // 12, month % 12 + 1, 1)
+            elif frequency == Frequency.WEEK:
+                week_start = chunk_start - dt.timedelta(days=(chunk_start.weekday() - Analytics.WEEK_START) % 7)
+                next_start = week_start + dt.timedelta(weeks=periods)
+            else:
+                next_start = chunk_start + dt.timedelta(days=periods)
+
+            chunks.append((chunk_start, min(next_start - dt.timedelta(days=1), end_date)))
+            chunk_start = next_start
+
+        return chunks
+
+    @staticmethod
+    def _merge_time_series(responses: Iterable[dict], data: Optional[dict] = None) -> dict:
+        """
+        Merges time series responses ordered by date into one response.
+
+        The series of the responses are joined by app and segment. Records that are
+        not newer than the last merged record of the series are dropped, which
+        removes the periods repeated at the chunk boundaries. The responses are
+        consumed one by one, so only the merged records are kept in memory.
+
+        :param responses: The decoded responses ordered by date.
+        :type responses: Iterable[dict]
+        :param data: The already merged response to extend (default: None).
+        :type data: Optional[dict]
+
+        :return: The merged response.
+        :rtype: dict
+        """
+        if data is None:
+            data = {"size": 0, "results": []}
+
+        series = {
+            Analytics._get_series_key(item=item): item
+            for item in data.get("results")
+        }
+
+        for response in responses:
+
+            for item in response.get("results") or []:
+                key = Analytics._get_series_key(item=item)
+                entry = series.get(key)
+
+                if entry is None:
+                    entry = series[key] = {**item, "data": list(item.get("data") or [])}
+                    data.get("results").append(entry)
+                    continue
+
+                # Totals of a single chunk do not describe the merged series.
+                entry.pop("totals", None)
+
+                records = entry.get("data")
+                last_date = records[-1].get("date") if records else None
+
+                records.extend(
+                    record
+                    for record in item.get("data") or []
+                    if last_date is None or record.get("date") > last_date
+                )
+
+        data["size"] = len(data.get("results"))
+
+        return data
+
+    @staticmethod
+    def _dedupe_time_series(responses: Iterable[dict], last_dates: Optional[dict] = None) -> Iterator[dict]:
+        """
+        Drops the records repeated at the chunk boundaries from time series responses.
+
+        Unlike `_merge_time_series`, the responses are yielded one by one and
+        only the date of the last record of every series is remembered.
+
+        :param responses: The decoded responses ordered by date.
+        :type responses: Iterable[dict]
+        :param last_dates: The dates of the last records of the series, shared by
+            successive calls on the responses of one request (default: None).
+        :type last_dates: Optional[dict]
+
+        :return: The responses without the repeated records.
+        :rtype: Iterator[dict]
+        """
+        last_dates = {} if last_dates is None else last_dates
+
+        for response in responses:
+            results = []
+
+            for item in response.get("results") or []:
+                key = Analytics._get_series_key(item=item)
+                last_date = last_dates.get(key)
+
+                records = [
+                    record
+                    for record in item.get("data") or []
+                    if last_date is None or record.get("date") > last_date
+                ]
+
+                if records:
+                    last_dates[key] = records[-1].get("date")
+
+                results.append({**item, "data": records})
+
+            yield {**response, "results": results}
+
+    @staticmethod
+    def _join_time_series(datas: List[dict]) -> dict:
+        """
+        Joins merged time series responses of different measures into one response.
+
+        The series are joined by app and segment and their records by date, so every
+        record carries the values of all measures.
+
+        :param datas: The merged responses, one per batch of measures.
+        :type datas: List[dict]
+
+        :return: The joined response.
+        :rtype: dict
+        """
+        if len(datas) == 1:
+            return datas[0]
+
+        results = []
+        series = {}
+
+        for data in datas:
+
+            for item in data.get("results") or []:
+                key = Analytics._get_series_key(item=item)
+                entry = series.get(key)
+
+                if entry is None:
+                    records = {record.get("date"): dict(record) for record in item.get("data") or []}
+                    series[key] = ({**item, "data": None}, records)
+                    results.append(key)
+                    continue
+
+                entry[0].pop("totals", None)
+
+                for record in item.get("data") or []:
+                    entry[1].setdefault(record.get("date"), {}).update(record)
+
+        data = {"size": len(results), "results": []}
+
+        for key in results:
+            item, records = series[key]
+            item["data"] = [records[date] for date in sorted(records)]
+            data.get("results").append(item)
+
+        return data
+
+    @staticmethod
+    def _is_saturated(responses: Iterable[dict], limit: int) -> bool:
+        """
+        Returns whether an app has as many segments as the limit in any of the responses.
+
+        :param responses: The decoded grouped responses.
+        :type responses: Iterable[dict]
+        :param limit: The number of top ranked segments requested.
+        :type limit: int
+
+        :return: Whether segments may be missing.
+        :rtype: bool
+        """
+        for response in responses:
+            counts = collections.Counter(item.get("adamId") for item in response.get("results") or [])
+
+            if counts and max(counts.values()) >= limit:
+                return True
+
+        return False
+
+    @staticmethod
+    def _get_complete_keys(responses: List[dict]) -> set:
+        """
+        Returns the segment keys present for every app in every response.
+
+        :param responses: The decoded grouped responses.
+        :type responses: List[dict]
+
+        :return: The segment keys.
+        :rtype: set
+        """
+        keys = None
+
+        for response in responses:
+            apps = collections.defaultdict(set)
+
+            for item in response.get("results") or []:
+                app_id, key = Analytics._get_series_key(item=item)
+                apps[app_id].add(key)
+
+            for app_keys in apps.values() or [set()]:
+                keys = app_keys if keys is None else keys & app_keys
+
+        return keys or set()
+
+    @staticmethod
+    def _reconcile_time_series(data: dict, totals: dict, measure: Measure, tolerance: float = 0.0) -> dict:
+        """
+        Compares the sums of the segments of every app with its totals, date by date.
+
+        The absolute differences of the dates are added up, so a surplus on one date
+        does not hide a shortfall on another. The records hidden by the privacy
+        threshold (negative values) are excluded on both sides, together with the
+        dates they hide.
+
+        :param data: The merged grouped response.
+        :type data: dict
+        :param totals: The merged response of the totals.
+        :type totals: dict
+        :param measure: The measure of the data.
+        :type measure: Measure
+        :param tolerance: The accepted sum of the absolute differences (default: 0.0).
+        :type tolerance: float
+
+        :return: The sum of the absolute differences of the totals and the sums of the
+            segments by app ID.
+        :rtype: dict
+        """
+        sums = collections.defaultdict(lambda: collections.defaultdict(float))
+        hidden = collections.defaultdict(set)
+
+        for item in data.get("results") or []:
+            app_id = item.get("adamId")
+
+            for record in item.get("data") or []:
+                value = record.get(measure.value)
+
+                if value is None or value < 0:
+                    hidden[app_id].add(record.get("date"))
+                else:
+                    sums[app_id][record.get("date")] += value
+
+        gaps = {}
+
+        for item in totals.get("results") or []:
+            app_id = item.get("adamId")
+            difference = 0.0
+
+            for record in item.get("data") or []:
+                value = record.get(measure.value)
+                date = record.get("date")
+
+                if value is None or value < 0 or date in hidden[app_id]:
+                    continue
+
+                difference += abs(value - sums[app_id].get(date, 0.0))
+
+            if difference > tolerance:
+                gaps[app_id] = difference
+
+        return gaps
+
+    @staticmethod
+    def _get_series_key(item: dict) -> tuple:
+        """
+        Returns the key identifying the series of a time series result.
+
+        :param item: The time series result.
+        :type item: dict
+
+        :return: The app ID and the segment key.
+        :rtype: tuple
+        """
+        group = item.get("group")
+
+        return item.get("adamId"), None if group is None else group.get("key")
+
+    def _get_app_id_batches(self, app_id: Union[str, List[str]]) -> List[List[str]]:
+        """
+        Splits the app IDs into batches of at most `max_apps_per_request` IDs.
+
+        :param app_id: The App Store Connect app ID or a list of app IDs.
+        :type app_id: Union[str, List[str]]
+
+        :return: The batches of app IDs.
+        :rtype: List[List[str]]
+        """
+        app_ids = self._get_app_ids(app_id=app_id)
+        size = max(1, self.max_apps_per_request)
+
+        return [app_ids[i:i + size] for i in range(0, len(app_ids), size)]
+
+    @staticmethod
+    def _check_single_measure(measure, method: str) -> None:
+        """
+        Raises a ValueError unless the measure is a single Measure.
+
+        :param measure: The measure passed by the caller.
+        :type measure: Measure
+        :param method: The name of the method, used in the message.
+        :type method: str
+        """
+        if not isinstance(measure, Measure):
+            raise ValueError(
+                f"{method} supports a single measure, got: {measure}. "
+                + "Use get_time_series to retrieve several measures."
+            )
+
+    @staticmethod
+    def _get_measures(measure: Union[Measure, List[Measure]]) -> List[Measure]:
+        """
+        Returns the measures as a list of unique measures.
+
+        :param measure: The measure or a list of measures.
+        :type measure: Union[Measure, List[Measure]]
+
+        :return: The list of measures.
+        :rtype: List[Measure]
+        """
+        if isinstance(measure, Measure):
+            return [measure]
+
+        return list(dict.fromkeys(measure))
+
+    @staticmethod
+    def _get_measure_batches(measure: Union[Measure, List[Measure]], grouping: Group) -> List[List[Measure]]:
+        """
+        Splits the measures into batches that can be fetched in one request.
+
+        :param measure: The measure or a list of measures.
+        :type measure: Union[Measure, List[Measure]]
+        :param grouping: The grouping to retrieve data for.
+        :type grouping: Group
+
+        :return: The batches of measures.
+        :rtype: List[List[Measure]]
+        """
+        measures = Analytics._get_measures(measure=measure)
+
+        if grouping in Analytics.MULTI_MEASURE_GROUPINGS:
+            return [measures]
+
+        return [[item] for item in measures]
+
+    @staticmethod
+    def _get_app_ids(app_id: Union[str, List[str]]) -> List[str]:
+        """
+        Returns the app IDs as a list of unique strings.
+
+        :param app_id: The App Store Connect app ID or a list of app IDs.
+        :type app_id: Union[str, List[str]]
+
+        :return: The list of app IDs.
+        :rtype: List[str]
+        """
+        if isinstance(app_id, (str, int)):
+            return [str(app_id)]
+
+        return list(dict.fromkeys(str(item) for item in app_id))
+
+    @staticmethod
+    def _merge_responses(responses: List[dict]) -> dict:
+        """
+        Merges the responses of several batched requests into one response.
+
+        :param responses: The decoded responses.
+        :type responses: List[dict]
+
+        :return: The merged response.
+        :rtype: dict
+        """
+        if len(responses) == 1:
+            return responses[0]
+
+        results = []
+
+        for response in responses:
+            results.extend(response.get("results") or [])
+
+        return {"size": len(results), "results": results}
+
+    @staticmethod
+    def _get_time_series_payload(
+        app_id,
+        measure,
+        start_date,
+        end_date,
+        grouping,
+        frequency,
+        dimension_filters=None,
+        group_limit=GROUP_LIMIT,
+    ):
+        """
+        Returns the payload of the time series request.
+
+        :param app_id: The App Store Connect app ID or a list of app IDs.
+        :type app_id: Union[str, List[str]]
+        :param measure: The measure or a list of measures to retrieve data for.
+        :type measure: Union[Measure, List[Measure]]
+        :param start_date: The start date for the time series data.
+        :type start_date: dt.date
+        :param end_date: The end date for the time series data.
+        :type end_date: dt.date
+        :param grouping: The grouping to retrieve data for.
+        :type grouping: Group
+        :param frequency: The frequency to retrieve data for.
+        :type frequency: Frequency
+        :param dimension_filters: The dimension filters to apply to the data.
+        :type dimension_filters: Optional[List[dict]]
+        :param group_limit: The number of top ranked segments (default: 10).
+        :type group_limit: int
+
+        :return: The payload for the request.
+        :rtype: dict
+        """
+        measures = Analytics._get_measures(measure=measure)
+
         payload = {
-            "adamId": [str(app_id)],
+            "adamId": Analytics._get_app_ids(app_id=app_id),
+            "measures": [item.value for item in measures],
             "frequency": frequency.value,
             "startTime": start_date.strftime("%Y-%m-%d") + "T00:00:00Z",
             "endTime": end_date.strftime("%Y-%m-%d") + "T00:00:00Z",
-            "dimensionFilters": dimension_filters
         }
 
-        data = self.client.request(url=url, method="POST", data=payload)
+        if grouping != Group.TOTAL:
+            payload["group"] = Analytics._get_group(grouping=grouping, measure=measures[0], limit=group_limit)
 
-        return formatter(data=data, grouping=dimension_filters)
+        if dimension_filters:
+            payload["dimensionFilters"] = dimension_filters
+
+        return payload
+
+    @staticmethod
+    def _get_retentions_payload(
+        app_id,
+        start_date,
+        end_date,
+        frequency,
+        dimension_filters,
+    ):
+        """
+        Returns the payload of the retentions request.
+
+        :param app_id: The App Store Connect app ID or a list of app IDs.
+        :type app_id: Union[str, List[str]]
+        :param start_date: The start date for the retentions data.
+        :type start_date: dt.datetime
+        :param end_date: The end date for the retentions data.
+        :type end_date: dt.datetime
+        :param frequency: The frequency to retrieve data for.
+        :type frequency: Frequency
+        :param dimension_filters: The dimension filters to apply to the data.
+        :type dimension_filters: list
 
+        :return: The payload for the request.
+        :rtype: dict
+        """
+        return {
+            "adamId": Analytics._get_app_ids(app_id=app_id),
+            "frequency": frequency.value,
+            "startTime": start_date.strftime("%Y-%m-%d") + "T00:00:00Z",
+            "endTime": end_date.strftime("%Y-%m-%d") + "T00:00:00Z",
+            "dimensionFilters": dimension_filters
+        }
 
     @staticmethod
-    def _get_group(grouping, measure):
+    def _get_group(grouping, measure, limit=GROUP_LIMIT):
         """
         Returns the group for the request.
 
@@ -131,6 +1294,8 @@ class Analytics:
         :type grouping: Group
         :param measure: The measure to retrieve data for.
         :type measure: Measure
+        :param limit: The number of top ranked segments (default: 10).
+        :type limit: int
 
         :return: The group for the request.
         :rtype: dict
@@ -139,5 +1304,5 @@ class Analytics:
             "dimension": grouping.value,
             "metric": measure.value,
             "rank": "DESCENDING",
-            "limit": 10,
+            "limit": limit,
         }
@@ -0,0 +1,441 @@
+import asyncio
+import datetime as dt
+from typing import AsyncIterator, List, Optional, Callable, Union
+from .analytics import Analytics
+from .enums import Group, Frequency, Measure
+from .formatter import Formatter
+
+
+class AsyncAnalytics(Analytics):
+    """
+    The AsyncAnalytics class is used to retrieve analytics data from the App Store Connect API
+    with an AsyncClient.
+    """
+
+    async def get_time_series(
+        self,
+        app_id: Union[str, List[str]],
+        measure: Union[Measure, List[Measure]],
+        start_date: dt.date,
+        end_date: dt.date,
+        grouping: Optional[Group] = Group.TOTAL,
+        frequency: Frequency = Frequency.DAY,
+        dimension_filters: Optional[List] = None,
+        formatter: Callable = Formatter.run,
+    ):
+        """
+        Method to retrieve the time series data for the specified measure and grouping.
+
+        :param app_id: The App Store Connect app ID or a list of app IDs. The app IDs
+            are packed into as few requests as `max_apps_per_request` allows.
+        :type app_id: Union[str, List[str]]
+        :param measure: The measure or a list of measures to retrieve data for. Several
+            measures are fetched in one request where the grouping allows it and in
+            concurrent requests otherwise; the rows then carry a column per measure.
+        :type measure: Union[Measure, List[Measure]]
+        :param start_date: The start date for the time series data. Long date ranges
+            are split into chunks of at most `chunk_periods` periods that are fetched
+            concurrently and merged in order.
+        :type start_date: dt.date
+        :param end_date: The end date for the time series data.
+        :type end_date: dt.date
+        :param grouping: The grouping to retrieve data for.
+        :type grouping: Group
+        :param frequency: The frequency to retrieve data for.
+        :type frequency: Frequency
+        :param dimension_filters: The dimension filters to apply to the data.
+        :type dimension_filters: List
+        :param formatter: The formatter to apply to the data.
+        :type formatter: Callable
+
+        :return: The time series data.
+        :rtype: dict
+        """
+        # Get the endpoint for the request.
+        url = self.client.get_endpoint(
+            subject="time-series",
+        )
+
+        # Do one request per batch of measures, date range chunk and batch of app IDs.
+        batches = [
+            self._get_time_series_payloads(
+                app_id=app_id,
+                measure=measures,
+                start_date=start_date,
+                end_date=end_date,
+                grouping=grouping,
+                frequency=frequency,
+                dimension_filters=dimension_filters,
+            )
+            for measures in self._get_measure_batches(measure=measure, grouping=grouping)
+        ]
+
+        # The batches of measures are fetched concurrently.
+        datas = await asyncio.gather(*[
+            self._get_merged_time_series(url=url, payloads=payloads)
+            for payloads in batches
+        ])
+
+        data = self._join_time_series(datas=list(datas))
+
+        return formatter(data=data, grouping=grouping, measure=measure)
+
+    async def iter_time_series(
+        self,
+        app_id: Union[str, List[str]],
+        measure: Measure,
+        start_date: dt.date,
+        end_date: dt.date,
+        grouping: Optional[Group] = Group.TOTAL,
+        frequency: Frequency = Frequency.DAY,
+        dimension_filters: Optional[List] = None,
+        formatter: Callable = Formatter.iter_run,
+    ) -> AsyncIterator:
+        """
+        Method to iterate asynchronously over the time series rows, response by response.
+
+        The chunks are fetched window by window and the rows of a window are yielded
+        before the next window is requested.
+
+        :param app_id: The App Store Connect app ID or a list of app IDs.
+        :type app_id: Union[str, List[str]]
+        :param measure: The measure to retrieve data for; a list of measures raises a ValueError.
+        :type measure: Measure
+        :param start_date: The start date for the time series data.
+        :type start_date: dt.date
+        :param end_date: The end date for the time series data.
+        :type end_date: dt.date
+        :param grouping: The grouping to retrieve data for.
+        :type grouping: Group
+        :param frequency: The frequency to retrieve data for.
+        :type frequency: Frequency
+        :param dimension_filters: The dimension filters to apply to the data.
+        :type dimension_filters: List
+        :param formatter: The formatter applied to every response, returning an iterable of rows.
+        :type formatter: Callable
+
+        :return: The time series rows.
+        :rtype: AsyncIterator
+        """
+        self._check_single_measure(measure=measure, method="iter_time_series")
+
+        # Get the endpoint for the request.
+        url = self.client.get_endpoint(
+            subject="time-series",
+        )
+
+        payloads = self._get_time_series_payloads(
+            app_id=app_id,
+            measure=measure,
+            start_date=start_date,
+            end_date=end_date,
+            grouping=grouping,
+            frequency=frequency,
+            dimension_filters=dimension_filters,
+        )
+
+        # The dates of the last records are shared by the windows of the request.
+        last_dates = {}
+
+        async for responses in self._request_all(url=url, payloads=payloads):
+            for data in self._dedupe_time_series(responses=responses, last_dates=last_dates):
+                for row in formatter(data=data, grouping=grouping, measure=measure):
+                    yield row
+
+    async def _get_merged_time_series(self, url: str, payloads: List[dict], data: Optional[dict] = None) -> dict:
+        """
+        Fetches the chunks window by window and merges them in order.
+
+        :param url: The URL of the API endpoint.
+        :type url: str
+        :param payloads: The payloads of the requests ordered by date.
+        :type payloads: List[dict]
+        :param data: The already merged response to extend (default: None).
+        :type data: Optional[dict]
+
+        :return: The merged response.
+        :rtype: dict
+        """
+        async for responses in self._request_all(url=url, payloads=payloads):
+            data = self._merge_time_series(responses=responses, data=data)
+
+        return data
+
+    async def get_complete_time_series(
+        self,
+        app_id: Union[str, List[str]],
+        measure: Measure,
+        start_date: dt.date,
+        end_date: dt.date,
+        grouping: Group,
+        frequency: Frequency = Frequency.DAY,
+        option_keys: Optional[List[str]] = None,
+        dimension_filters: Optional[List] = None,
+        formatter: Callable = Formatter.run,
+        reconcile: bool = True,
+        tolerance: float = 0.0,
+        strict: bool = False,
+    ):
+        """
+        Method to retrieve the time series data of all segments of the grouping.
+
+        The steps are those of `Analytics.get_complete_time_series`; the partitioned
+        requests of the remaining segments and the requests of the totals are fetched
+        concurrently.
+
+        :param app_id: The App Store Connect app ID or a list of app IDs.
+        :type app_id: Union[str, List[str]]
+        :param measure: The measure to retrieve data for; a list of measures raises a ValueError.
+        :type measure: Measure
+        :param start_date: The start date for the time series data.
+        :type start_date: dt.date
+        :param end_date: The end date for the time series data.
+        :type end_date: dt.date
+        :param grouping: The grouping to retrieve data for.
+        :type grouping: Group
+        :param frequency: The frequency to retrieve data for.
+        :type frequency: Frequency
+        :param option_keys: All segment keys of the grouping, e.g. the storefront codes
+            for Group.COUNTRY (default: None).
+        :type option_keys: Optional[List[str]]
+        :param dimension_filters: The dimension filters to apply to the data.
+        :type dimension_filters: List
+        :param formatter: The formatter to apply to the data.
+        :type formatter: Callable
+        :param reconcile: Whether to reconcile the segments against the totals (default: True).
+        :type reconcile: bool
+        :param tolerance: The accepted sum of the absolute differences of the dates (default: 0.0).
+        :type tolerance: float
+        :param strict: Whether to raise an AppStoreConnectAnalyticsIncompleteError when
+            the segments do not add up to the totals (default: False).
+        :type strict: bool
+
+        :return: The time series data.
+        :rtype: dict
+        """
+        self._check_single_measure(measure=measure, method="get_complete_time_series")
+
+        url = self.client.get_endpoint(
+            subject="time-series",
+        )
+
+        kwargs = {
+            "app_id": app_id,
+            "measure": measure,
+            "start_date": start_date,
+            "end_date": end_date,
+            "grouping": grouping,
+            "frequency": frequency,
+        }
+
+        responses = [
+            response
+            async for responses in self._request_all(
+                url=url,
+                payloads=self._get_time_series_payloads(dimension_filters=dimension_filters, **kwargs),
+            )
+            for response in responses
+        ]
+
+        data, payloads = self._get_remaining_segments(
+            responses=responses,
+            option_keys=option_keys,
+            dimension_filters=dimension_filters,
+            **kwargs,
+        )
+
+        # The remaining segments and the totals are fetched concurrently.
+        fetches = [self._get_merged_time_series(url=url, payloads=payloads, data=data)]
+
+        if reconcile and measure in Analytics.ADDITIVE_MEASURES:
+            fetches.append(self._get_merged_time_series(
+                url=url,
+                payloads=self._get_time_series_payloads(
+                    dimension_filters=dimension_filters,
+                    **{**kwargs, "grouping": Group.TOTAL},
+                ),
+            ))
+
+        data, *totals = await asyncio.gather(*fetches)
+
+        if totals:
+            self._check_totals(
+                data=data,
+                totals=totals[0],
+                grouping=grouping,
+                measure=measure,
+                tolerance=tolerance,
+                strict=strict,
+            )
+
+        return formatter(data=data, grouping=grouping, measure=measure)
+
+    async def get_retentions(self,
+            app_id: Union[str, List[str]],
+            start_date: dt.datetime = dt.datetime.utcnow() - dt.timedelta(days=7),
+            end_date: dt.datetime = dt.datetime.utcnow(),
+            frequency: Frequency = Frequency.DAY,
+            dimension_filters: list = [],
+            formatter: Callable = Formatter.retentions
+            ) -> list:
+        """Method to retrieve the retentions data for the specified app, time range and if passed, dimension filters.
+
+        :param app_id: The App Store Connect app ID or a list of app IDs.
+        :type app_id: Union[str, List[str]]
+        :param start_date: The start date for the retentions data.
+        :type start_date: dt.datetime
+        :param end_date: The end date for the retentions data.
+        :type end_date: dt.datetime
+        :param frequency: The frequency to retrieve data for.
+        :type frequency: Frequency
+        :param dimension_filters: The dimension filters to apply to the data. (default: []), example: 
+[{dimensionKey: "source", optionKeys: ["Search"]}]
+        :type dimension_filters: list
+        :param formatter: The formatter to apply to the data.
+        :type formatter: Callable
+
+        :return: The retentions data.
+        :rtype: list
+        """
+
+        # Get the endpoint for the request.
+        url = self.client.get_endpoint(
+            subject="retention",
+        )
+
+        # Do one request per batch of app IDs.
+        responses = await asyncio.gather(*[
+            self._request(
+                url=url,
+                payload=self._get_retentions_payload(
+                    app_id=app_ids,
+                    start_date=start_date,
+                    end_date=end_date,
+                    frequency=frequency,
+                    dimension_filters=dimension_filters,
+                ),
+            )
+            for app_ids in self._get_app_id_batches(app_id=app_id)
+        ])
+
+        data = self._merge_responses(responses=list(responses))
+
+        return formatter(data=data, grouping=dimension_filters)
+
+    async def iter_retentions(self,
+            app_id: Union[str, List[str]],
+            start_date: dt.datetime,
+            end_date: dt.datetime,
+            frequency: Frequency = Frequency.DAY,
+            dimension_filters: Optional[list] = None,
+            formatter: Callable = Formatter.iter_retentions
+            ) -> AsyncIterator:
+        """Method to iterate asynchronously over the retentions rows, response by response.
+
+        :param app_id: The App Store Connect app ID or a list of app IDs.
+        :type app_id: Union[str, List[str]]
+        :param start_date: The start date for the retentions data.
+        :type start_date: dt.datetime
+        :param end_date: The end date for the retentions data.
+        :type end_date: dt.datetime
+        :param frequency: The frequency to retrieve data for.
+        :type frequency: Frequency
+        :param dimension_filters: The dimension filters to apply to the data. (default: None)
+        :type dimension_filters: list
+        :param formatter: The formatter applied to every response, returning an iterable of rows.
+        :type formatter: Callable
+
+        :return: The retentions rows.
+        :rtype: AsyncIterator
+        """
+
+        # Get the endpoint for the request.
+        url = self.client.get_endpoint(
+            subject="retention",
+        )
+
+        dimension_filters = dimension_filters or []
+
+        for app_ids in self._get_app_id_batches(app_id=app_id):
+
+            data = await self._request(
+                url=url,
+                payload=self._get_retentions_payload(
+                    app_id=app_ids,
+                    start_date=start_date,
+                    end_date=end_date,
+                    frequency=frequency,
+                    dimension_filters=dimension_filters,
+                ),
+            )
+
+            for row in formatter(data=data, grouping=dimension_filters):
+                yield row
+
+    async def _request_all(self, url: str, payloads: List[dict]) -> AsyncIterator[List[dict]]:
+        """
+        Sends the requests window by window and yields the responses of every window
+        in the order of the payloads.
+
+        At most `max_workers` requests are in flight at any time.
+
+        :param url: The URL of the API endpoint.
+        :type url: str
+        :param payloads: The payloads of the requests.
+        :type payloads: List[dict]
+
+        :return: The decoded responses of every window.
+        :rtype: AsyncIterator[List[dict]]
+        """
+        window = max(1, self.max_workers)
+
+        for i in range(0, len(payloads), window):
+            yield list(await asyncio.gather(*[
+                self._request(url=url, payload=payload)
+                for payload in payloads[i:i + window]
+            ]))
+
+    async def _request(self, url: str, payload: dict) -> dict:
+        """
+        Sends the request, answering it from the cache when possible.
+
+        :param url: The URL of the API endpoint.
+        :type url: str
+        :param payload: The payload of the request.
+        :type payload: dict
+
+        :return: The decoded response.
+        :rtype: dict
+        """
+        if self.cache is not None:
+            data = self.cache.get(url=url, payload=payload, identity=getattr(self.client, "identity", None))
+
+            if data is not None:
+                return data
+
+        if self.single_flight is not None:
+            return await self.single_flight.do(
+                key=self._get_key(url=url, payload=payload),
+                function=lambda: self._fetch(url=url, payload=payload),
+            )
+
+        return await self._fetch(url=url, payload=payload)
+
+    async def _fetch(self, url: str, payload: dict) -> dict:
+        """
+        Sends the request and stores the response in the cache.
+
+        :param url: The URL of the API endpoint.
+        :type url: str
+        :param payload: The payload of the request.
+        :type payload: dict
+
+        :return: The decoded response.
+        :rtype: dict
+        """
+        data = await self.client.request(url=url, method="POST", data=payload)
+
+        if self.cache is not None:
+            self.cache.set(url=url, payload=payload, value=data, identity=getattr(self.client, "identity", None))
+
+        return data
@@ -0,0 +1,361 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import functools
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+from .client import Client
+from .ratelimit import RateLimiter
+from .retry import RetryState
+from .coordination import Coordinator
+from .instrumentation import Instrumentation
+from .decoder import JSONDecoder
+
+logger = logging.getLogger(__name__)
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+class AsyncClient:
+    """
+    An asyncio based client for interacting with the App Store Connect API.
+    """
+
+    BASE_URL = Client.BASE_URL
+
+    get_endpoint = staticmethod(Client.get_endpoint)
+
+    def __init__(
+        self,
+        mayacinfo: str,
+        max_concurrency: int = 50,
+        pool_maxsize: int = 100,
+        rate_limiter: Optional[RateLimiter] = None,
+        coordinator: Optional[Coordinator] = None,
+        session_ttl: float = 1800,
+        instrumentation: Optional[Instrumentation] = None,
+        decoder: Optional[Callable[[bytes], Any]] = None,
+    ):
+        """
+        Initializes the AsyncClient class.
+
+        :param mayacinfo: The myacinfo cookie value for the App Store Connect API.
+        :type mayacinfo: str
+        :param max_concurrency: The maximum number of requests in flight (default: 50).
+        :type max_concurrency: int
+        :param pool_maxsize: The maximum number of keep-alive connections (default: 100).
+        :type pool_maxsize: int
+        :param rate_limiter: The rate limit controller shared by all requests of the client,
+            it may also be shared with other clients (default: a new RateLimiter).
+        :type rate_limiter: Optional[RateLimiter]
+        :param coordinator: The backend sharing the authentication session and a global
+            request budget with other clients of the same account (default: None).
+        :type coordinator: Optional[Coordinator]
+        :param session_ttl: The number of seconds after which the itctx session is
+            refreshed proactively (default: 1800).
+        :type session_ttl: float
+        :param instrumentation: The instrumentation receiving the request events (default: None).
+        :type instrumentation: Optional[Instrumentation]
+        :param decoder: The callable decoding the raw response bodies
+            (default: a JSONDecoder using orjson when installed).
+        :type decoder: Optional[Callable[[bytes], Any]]
+        """
+
+        if aiohttp is None:
+            raise ImportError(
+                "AsyncClient requires the aiohttp package. "
+                + "Install it with: pip install surquest-utils-appstoreconnect-analytics-api[async]"
+            )
+
+        self.__mayacinfo = mayacinfo
+        self.identity = Client.get_identity(mayacinfo=mayacinfo)
+        self.__apple_widget_key = None
+        self.__itctx = None
+        self.__session_expires_at = 0.0
+        self.__pool_maxsize = pool_maxsize
+        self.__session = None
+        self.__auth_lock = asyncio.Lock()
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self.coordinator = coordinator
+        self.session_ttl = session_ttl
+        self.instrumentation = instrumentation
+        self.decoder = decoder if decoder is not None else JSONDecoder()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Closes the underlying HTTP session and releases its pooled connections.
+        """
+
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    @property
+    def session(self):
+        """
+        Returns the HTTP session shared by all requests of the client.
+
+        The session is created lazily, because aiohttp binds it to the running
+        event loop.
+
+        :return: The HTTP session.
+        :rtype: aiohttp.ClientSession
+        """
+
+        if self.__session is None:
+            self.__session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.__pool_maxsize),
+                headers=Client.HEADERS,
+                cookies={"myacinfo": self.__mayacinfo},
+            )
+
+        return self.__session
+
+    async def request(
+        self,
+        url: str,
+        method: str = "POST",
+        data: Optional[Dict] = None,
+    ) -> dict:
+        """
+        Sends a request to the App Store Connect API.
+
+        :param url: The URL of the API endpoint.
+        :type url: str
+        :param method: The HTTP method to use (default: "POST").
+        :type method: str
+        :param data: The request data (default: None).
+        :type data: Optional[Dict]
+        :return: The decoded API response.
+        :rtype: dict
+        """
+
+        # The coordinator may block, so it is called in an executor instead of by the state.
+        state = RetryState(client=self, method=method, url=url, coordinate=False)
+
+        while True:
+            wait = state.get_wait()
+
+            if self.coordinator is not None:
+                wait = max(wait, await self._coordinate(self.coordinator.acquire))
+
+            await asyncio.sleep(wait)
+            state.start()
+
+            try:
+                itctx = await self._get_itctx()
+                status, headers, body = await self.do_request(url=url, method=method, data=data)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as error:
+                sleep = state.on_connection_error(error=error)
+
+                if sleep is None:
+                    raise
+
+                await asyncio.sleep(sleep)
+                continue
+
+            action, sleep = state.on_response(status=status, headers=headers, size=len(body))
+
+            if status == 429 and self.coordinator is not None:
+                await self._coordinate(
+                    self.coordinator.on_throttle,
+                    retry_after=RateLimiter.parse_retry_after(headers.get("Retry-After")),
+                )
+
+            if action == RetryState.DONE:
+                break
+
+            if action == RetryState.REAUTHENTICATE:
+                await self._reset_session(itctx=itctx)
+            else:
+                await asyncio.sleep(sleep)
+
+        if status != 200:
+            raise state.on_failure(status=status, text=body.decode(errors="replace"))
+
+        state.on_success()
+
+        if self.coordinator is not None:
+            await self._coordinate(self.coordinator.on_success)
+
+        return self.decoder(body)
+
+    async def do_request(
+        self,
+        url: str,
+        method: str = "POST",
+        data: Optional[Dict] = None,
+    ) -> tuple:
+        """
+        Sends a request to the App Store Connect API.
+
+        :param url: The URL of the API endpoint.
+        :type url: str
+        :param method: The HTTP method to use (default: "POST").
+        :type method: str
+        :param data: The request data (default: None).
+        :type data: Optional[Dict]
+        :return: The status code, the headers and the raw body of the API response.
+        :rtype: tuple
+        """
+
+        logger.debug("Requesting URL: %s %s", method, url)
+
+        # Make sure the widget key and the itctx cookie are bootstrapped.
+        await self._get_itctx()
+        headers = {"X-Apple-Widget-Key": await self._get_apple_widget_key()}
+
+        async with self.semaphore:
+            async with self.session.request(
+                method=method,
+                url=url,
+                json=data,
+                headers=headers,
+            ) as response:
+                return response.status, response.headers, await response.read()
+
+    async def _get_apple_widget_key(self) -> str:
+        """
+        Retrieves the authentication service key for the App Store Connect API.
+
+        :return: The authentication service key.
+        :rtype: str
+        """
+
+        if self.__apple_widget_key is not None:
+            return self.__apple_widget_key
+
+        async with self.__auth_lock:
+            if self.__apple_widget_key is None:
+                await self._fetch_apple_widget_key()
+
+        return self.__apple_widget_key
+
+    async def _fetch_apple_widget_key(self) -> None:
+        """
+        Fetches the authentication service key. Must be called with the authentication lock held.
+        """
+
+        logger.debug("Fetching the Apple widget key.")
+
+        async with self.session.get(url=Client.WIDGET_KEY_URL) as response:
+            data = await response.json(content_type=None)
+
+        self.__apple_widget_key = data.get("authServiceKey")
+
+    async def _get_itctx(self) -> str:
+        """
+        Retrieves the itctx cookie for the App Store Connect API.
+
+        The session is bootstrapped by one task at a time and refreshed once
+        it is older than `session_ttl`.
+
+        :return: The itctx cookie value.
+        :rtype: str
+        """
+
+        if self.__itctx is not None and time.monotonic() < self.__session_expires_at:
+            return self.__itctx
+
+        async with self.__auth_lock:
+            # Another task may have refreshed the session while this one waited for the lock.
+            if self.__itctx is None or time.monotonic() >= self.__session_expires_at:
+                await self._bootstrap_session()
+
+        return self.__itctx
+
+    async def _bootstrap_session(self) -> None:
+        """
+        Bootstraps the itctx session, or adopts the one shared by the coordinator.
+
+        Must be called with the authentication lock held.
+        """
+
+        if self.coordinator is not None:
+            session = await self._coordinate(self.coordinator.get_session)
+
+            if session is None and not await self._coordinate(self.coordinator.claim_bootstrap):
+                session = await self._coordinate(self.coordinator.wait_for_session)
+
+            if session is not None:
+                logger.debug("Adopting the session shared by the coordinator.")
+                self.__apple_widget_key = session.get("widget_key")
+                self.__itctx = session.get("itctx")
+                self.__session_expires_at = time.monotonic() + self.session_ttl
+
+                if self.__itctx is not None:
+                    self.session.cookie_jar.update_cookies({"itctx": self.__itctx})
+
+                return
+
+        if self.__apple_widget_key is None:
+            await self._fetch_apple_widget_key()
+
+        headers = {
+            "X-Apple-Widget-Key": self.__apple_widget_key,
+            **Client.SESSION_HEADERS,
+        }
+
+        logger.debug("Bootstrapping the itctx session.")
+
+        # The itctx cookie set by the response is stored in the session cookie jar.
+        async with self.session.get(url=Client.SESSION_URL, headers=headers) as response:
+            cookie = response.cookies.get("itctx")
+
+        self.__itctx = cookie.value if cookie is not None else None
+        self.__session_expires_at = time.monotonic() + self.session_ttl
+
+        if self.coordinator is not None:
+            await self._coordinate(
+                self.coordinator.set_session,
+                {"widget_key": self.__apple_widget_key, "itctx": self.__itctx},
+            )
+
+    async def _reset_session(self, itctx: Optional[str]) -> None:
+        """
+        Discards the itctx session rejected by the API, so the next request
+        bootstraps a new one.
+
+        :param itctx: The itctx cookie value of the rejected request. The session
+            is kept when another task has already replaced it.
+        :type itctx: Optional[str]
+        """
+
+        async with self.__auth_lock:
+            if self.__itctx != itctx:
+                return
+
+            self.__itctx = None
+            self.__session_expires_at = 0.0
+            self.session.cookie_jar.clear(lambda cookie: cookie.key == "itctx")
+
+            if self.coordinator is not None:
+                await self._coordinate(self.coordinator.clear_session, itctx=itctx)
+
+    async def _coordinate(self, function: Callable, *args, **kwargs) -> Any:
+        """
+        Calls a method of the coordinator for the account of the client in the default
+        executor, so a coordinator blocking on a lock, a database or a wait does not
+        block the event loop.
+
+        :param function: The bound method of the coordinator.
+        :type function: Callable
+        :return: The value returned by the method.
+        :rtype: Any
+        """
+
+        return await asyncio.get_running_loop().run_in_executor(
+            None, functools.partial(function, *args, identity=self.identity, **kwargs)
+        )
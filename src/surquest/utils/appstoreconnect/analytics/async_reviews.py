@@ -0,0 +1,169 @@
+import asyncio
+from typing import AsyncIterator, Callable
+import datetime as dt
+from .formatter import Formatter
+from .reviews import Reviews
+
+
+class AsyncReviews(Reviews):
+    """
+    The AsyncReviews class is used to retrieve reviews from the App Store Connect API
+    with an AsyncClient.
+    """
+
+    async def fetch(
+        self,
+        app_id: str,
+        start_date: dt.datetime = dt.datetime(2020, 1, 1),
+        end_date: dt.datetime = dt.datetime(2050, 12, 31),
+        country: str | None = None,
+        last_known_review_id: int | None = None,
+        formatter: Callable = Formatter.reviews,
+    ):
+        """
+        Method to retrieve reviews of the AppStore app.
+
+        Up to `max_workers` review pages are requested at a time, see Reviews.fetch.
+
+        :param app_id: The App Store Connect app ID.
+        :type app_id: str
+        :param start_date: The start date for the reviews.
+        :type start_date: dt.date
+        :param end_date: The end date for the reviews.
+        :type end_date: dt.date
+        :param formatter: The formatter to apply to the data.
+        :type formatter: Callable
+
+        :return: List of reviews.
+        :rtype: dict
+        """
+
+        key = self._get_checkpoint_key(
+            app_id=app_id,
+            start_date=start_date,
+            end_date=end_date,
+            country=country,
+            last_known_review_id=last_known_review_id,
+        )
+
+        # Output variable with all reviews
+        state, reviews = self._load_checkpoint(key=key)
+
+        async for page_reviews in self._iter_pages(
+            key=key,
+            state=state,
+            app_id=app_id,
+            start_date=start_date,
+            end_date=end_date,
+            country=country,
+            last_known_review_id=last_known_review_id,
+        ):
+            reviews.extend(page_reviews)
+
+        self._clear_checkpoint(key=key, state=state)
+
+        return state.get("reviews_count"), formatter(data=reviews)
+
+    async def iter_reviews(
+        self,
+        app_id: str,
+        start_date: dt.datetime = dt.datetime(2020, 1, 1),
+        end_date: dt.datetime = dt.datetime(2050, 12, 31),
+        country: str | None = None,
+        last_known_review_id: int | None = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Method to iterate over reviews of the AppStore app page by page.
+
+        :param app_id: The App Store Connect app ID.
+        :type app_id: str
+        :param start_date: The start date for the reviews.
+        :type start_date: dt.date
+        :param end_date: The end date for the reviews.
+        :type end_date: dt.date
+
+        :return: The reviews, newest first.
+        :rtype: AsyncIterator[dict]
+        """
+
+        key = self._get_checkpoint_key(
+            app_id=app_id,
+            start_date=start_date,
+            end_date=end_date,
+            country=country,
+            last_known_review_id=last_known_review_id,
+        )
+
+        state, _ = self._load_checkpoint(key=key, load_reviews=False)
+
+        async for page_reviews in self._iter_pages(
+            key=key,
+            state=state,
+            app_id=app_id,
+            start_date=start_date,
+            end_date=end_date,
+            country=country,
+            last_known_review_id=last_known_review_id,
+        ):
+            for review in page_reviews:
+                yield review
+
+        self._clear_checkpoint(key=key, state=state)
+
+    async def _iter_pages(
+        self,
+        key: str,
+        state: dict,
+        app_id: str,
+        start_date: dt.datetime,
+        end_date: dt.datetime,
+        country: str | None,
+        last_known_review_id: int | None,
+    ) -> AsyncIterator[list]:
+        """
+        Requests the review pages and yields the kept reviews of every page in order.
+
+        :param key: The checkpoint key of the fetch.
+        :type key: str
+        :param state: The pagination state, updated in place.
+        :type state: dict
+
+        :return: The kept reviews of every page.
+        :rtype: AsyncIterator[list]
+        """
+
+        unix_start_date = int(start_date.timestamp()) * 1000
+        unix_end_date = int(end_date.timestamp()) * 1000
+
+        has_next = not state.get("done")
+
+        while has_next is True:
+            indexes = self._get_page_indexes(state=state)
+
+            responses = await asyncio.gather(*[
+                self.client.request(
+                    url=self._get_url(app_id=app_id, index=index, country=country),
+                    method="GET",
+                )
+                for index in indexes
+            ])
+
+            for index, response in zip(indexes, responses):
+                page_reviews = []
+
+                has_next = self._process_page(
+                    state=state,
+                    index=index,
+                    data=response.get("data"),
+                    reviews=page_reviews,
+                    unix_start_date=unix_start_date,
+                    unix_end_date=unix_end_date,
+                    last_known_review_id=last_known_review_id,
+                )
+
+                yield page_reviews
+
+                self._save_checkpoint(key=key, state=state, index=index, reviews=page_reviews)
+
+                if has_next is False:
+                    break
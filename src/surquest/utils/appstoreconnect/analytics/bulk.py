@@ -0,0 +1,184 @@
+import time
+import itertools
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+from .enums import Measure, Group, Frequency
+from .formatter import Formatter
+
+
+class Job(NamedTuple):
+    """
+    A single time series request of a bulk extraction.
+    """
+
+    app_id: Union[str, tuple]
+    measure: Measure
+    grouping: Group
+    frequency: Frequency
+    start_date: dt.date
+    end_date: dt.date
+
+
+class JobResult(NamedTuple):
+    """
+    The outcome of a single job of a bulk extraction.
+    """
+
+    job: Job
+    data: Optional[list]
+    error: Optional[Exception]
+    duration: float
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+class BulkExtractor:
+    """
+    The BulkExtractor class runs a matrix of time series requests on a worker pool.
+    """
+
+    def __init__(self, analytics, max_workers: int = 8):
+        """
+        Initializes the BulkExtractor class.
+
+        :param analytics: The analytics object to use for the requests.
+        :type analytics: Analytics
+        :param max_workers: The maximum number of concurrent requests (default: 8).
+        :type max_workers: int
+        """
+        self.analytics = analytics
+        self.max_workers = max_workers
+
+    @staticmethod
+    def plan(
+        app_ids: Iterable[str],
+        measures: Union[Iterable[Measure], Dict[Measure, List[Group]]],
+        start_date: dt.date,
+        end_date: dt.date,
+        groupings: Iterable[Group] = (Group.TOTAL,),
+        frequencies: Iterable[Frequency] = (Frequency.DAY,),
+        apps_per_job: int = 1,
+    ) -> List[Job]:
+        """
+        Returns the jobs of the app x measure x grouping x frequency matrix.
+
+        :param app_ids: The App Store Connect app IDs.
+        :type app_ids: Iterable[str]
+        :param measures: The measures to retrieve data for. A dictionary maps every
+            measure to its own list of groupings and takes precedence over `groupings`.
+        :type measures: Union[Iterable[Measure], Dict[Measure, List[Group]]]
+        :param start_date: The start date for the time series data.
+        :type start_date: dt.date
+        :param end_date: The end date for the time series data.
+        :type end_date: dt.date
+        :param groupings: The groupings to retrieve data for (default: (Group.TOTAL,)).
+        :type groupings: Iterable[Group]
+        :param frequencies: The frequencies to retrieve data for (default: (Frequency.DAY,)).
+        :type frequencies: Iterable[Frequency]
+        :param apps_per_job: The number of app IDs packed into one job (default: 1).
+            Jobs with several apps are sent as one multi-app request.
+        :type apps_per_job: int
+
+        :return: The list of jobs.
+        :rtype: List[Job]
+        """
+        if isinstance(measures, dict):
+            combinations = [
+                (measure, grouping)
+                for measure, measure_groupings in measures.items()
+                for grouping in measure_groupings
+            ]
+        else:
+            combinations = list(itertools.product(measures, list(groupings)))
+
+        app_ids = [str(app_id) for app_id in app_ids]
+
+        if apps_per_job > 1:
+            app_ids = [
+                tuple(app_ids[i:i + apps_per_job])
+                for i in range(0, len(app_ids), apps_per_job)
+            ]
+
+        return [
+            Job(
+                app_id=app_id,
+                measure=measure,
+                grouping=grouping,
+                frequency=frequency,
+                start_date=start_date,
+                end_date=end_date,
+            )
+            for app_id in app_ids
+            for measure, grouping in combinations
+            for frequency in frequencies
+        ]
+
+    def run(
+        self,
+        jobs: Iterable[Job],
+        formatter: Callable = Formatter.run,
+    ) -> Iterator[JobResult]:
+        """
+        Runs the jobs concurrently and yields their results as they complete.
+
+        Jobs are submitted lazily, so at most twice `max_workers` jobs are pending
+        at any time. A failing job does not stop the others; its exception is
+        recorded in the result instead.
+
+        :param jobs: The jobs to run.
+        :type jobs: Iterable[Job]
+        :param formatter: The formatter to apply to the data.
+        :type formatter: Callable
+
+        :return: The results of the jobs in the order of completion.
+        :rtype: Iterator[JobResult]
+        """
+        jobs = iter(jobs)
+        pending = set()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+
+            for job in itertools.islice(jobs, self.max_workers * 2):
+                pending.add(executor.submit(self._run_job, job, formatter))
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    yield future.result()
+
+                    job = next(jobs, None)
+                    if job is not None:
+                        pending.add(executor.submit(self._run_job, job, formatter))
+
+    def _run_job(self, job: Job, formatter: Callable) -> JobResult:
+        """
+        Runs a single job and records its outcome.
+
+        :param job: The job to run.
+        :type job: Job
+        :param formatter: The formatter to apply to the data.
+        :type formatter: Callable
+
+        :return: The result of the job.
+        :rtype: JobResult
+        """
+        start = time.perf_counter()
+
+        try:
+            data = self.analytics.get_time_series(
+                app_id=job.app_id,
+                measure=job.measure,
+                start_date=job.start_date,
+                end_date=job.end_date,
+                grouping=job.grouping,
+                frequency=job.frequency,
+                formatter=formatter,
+            )
+        except Exception as error:
+            return JobResult(job=job, data=None, error=error, duration=time.perf_counter() - start)
+
+        return JobResult(job=job, data=data, error=None, duration=time.perf_counter() - start)
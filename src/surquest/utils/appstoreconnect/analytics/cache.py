@@ -0,0 +1,308 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import abc
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import datetime as dt
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+class Cache(abc.ABC):
+    """
+    Base class of the response caches used by Analytics.
+
+    Responses are keyed by the account identity of the client, the URL and the
+    normalized request payload, so clients of different accounts never share a
+    response. Apple restates the most recent days for a while, so only requests
+    whose `endTime` lies more than `restatement_days` days before today cover a
+    closed period; they are kept for `closed_ttl` seconds (forever when None).
+    More recent requests are kept for `ttl` seconds only.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = 300,
+        closed_ttl: Optional[float] = None,
+        max_size: int = 1024,
+        restatement_days: int = 3,
+    ):
+        """
+        Initializes the Cache class.
+
+        :param ttl: Time to live in seconds of responses of open periods (default: 300).
+        :type ttl: Optional[float]
+        :param closed_ttl: Time to live in seconds of responses of closed periods,
+            None to never expire them (default: None).
+        :type closed_ttl: Optional[float]
+        :param max_size: The maximum number of cached responses (default: 1024).
+        :type max_size: int
+        :param restatement_days: The number of days before today whose data Apple may
+            still restate (default: 3).
+        :type restatement_days: int
+        """
+        self.ttl = ttl
+        self.closed_ttl = closed_ttl
+        self.max_size = max_size
+        self.restatement_days = restatement_days
+
+    @staticmethod
+    def get_key(url: str, payload: Optional[dict], identity: Optional[str] = None) -> str:
+        """
+        Returns the cache key of the request.
+
+        :param url: The URL of the API endpoint.
+        :type url: str
+        :param payload: The request payload.
+        :type payload: Optional[dict]
+        :param identity: The identity of the account sending the request, e.g.
+            Client.identity (default: None).
+        :type identity: Optional[str]
+        :return: The cache key.
+        :rtype: str
+        """
+
+        request = {"url": url, "payload": payload}
+
+        # Keys without an identity stay those of the unscoped requests.
+        if identity is not None:
+            request["identity"] = identity
+
+        normalized = json.dumps(
+            request,
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    def get_ttl(self, payload: Optional[dict]) -> Optional[float]:
+        """
+        Returns the time to live of the response of the request.
+
+        :param payload: The request payload.
+        :type payload: Optional[dict]
+        :return: The time to live in seconds, None for no expiry.
+        :rtype: Optional[float]
+        """
+
+        end_time = (payload or {}).get("endTime")
+        closed = dt.datetime.now(dt.timezone.utc).date() - dt.timedelta(days=self.restatement_days)
+
+        if end_time is not None and str(end_time)[:10] < closed.isoformat():
+            return self.closed_ttl
+
+        return self.ttl
+
+    def get(self, url: str, payload: Optional[dict], identity: Optional[str] = None) -> Optional[Any]:
+        """
+        Returns the cached response of the request.
+
+        :param url: The URL of the API endpoint.
+        :type url: str
+        :param payload: The request payload.
+        :type payload: Optional[dict]
+        :param identity: The identity of the account sending the request (default: None).
+        :type identity: Optional[str]
+        :return: The cached response or None.
+        :rtype: Optional[Any]
+        """
+
+        return self._get(key=self.get_key(url=url, payload=payload, identity=identity))
+
+    def set(self, url: str, payload: Optional[dict], value: Any, identity: Optional[str] = None) -> None:
+        """
+        Caches the response of the request.
+
+        :param url: The URL of the API endpoint.
+        :type url: str
+        :param payload: The request payload.
+        :type payload: Optional[dict]
+        :param value: The decoded response.
+        :type value: Any
+        :param identity: The identity of the account sending the request (default: None).
+        :type identity: Optional[str]
+        """
+
+        ttl = self.get_ttl(payload=payload)
+
+        if ttl is not None and ttl <= 0:
+            return
+
+        expires_at = None if ttl is None else time.time() + ttl
+
+        self._set(key=self.get_key(url=url, payload=payload, identity=identity), value=value, expires_at=expires_at)
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        """
+        Removes all cached responses.
+        """
+
+    @abc.abstractmethod
+    def _get(self, key: str) -> Optional[Any]:
+        """
+        Returns the cached value of the key unless it expired.
+        """
+
+    @abc.abstractmethod
+    def _set(self, key: str, value: Any, expires_at: Optional[float]) -> None:
+        """
+        Stores the value of the key until `expires_at`, forever when None.
+        """
+
+
+class MemoryCache(Cache):
+    """
+    An in-memory LRU cache of decoded responses.
+
+    The cached responses are shared with the callers and must not be mutated.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = 300,
+        closed_ttl: Optional[float] = None,
+        max_size: int = 1024,
+        restatement_days: int = 3,
+    ):
+        super().__init__(ttl=ttl, closed_ttl=closed_ttl, max_size=max_size, restatement_days=restatement_days)
+        self.__items = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__items)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__items.clear()
+
+    def _get(self, key: str) -> Optional[Any]:
+
+        with self.__lock:
+            item = self.__items.get(key)
+
+            if item is None:
+                return None
+
+            value, expires_at = item
+
+            if expires_at is not None and expires_at <= time.time():
+                del self.__items[key]
+                return None
+
+            self.__items.move_to_end(key)
+
+            return value
+
+    def _set(self, key: str, value: Any, expires_at: Optional[float]) -> None:
+
+        with self.__lock:
+            self.__items[key] = (value, expires_at)
+            self.__items.move_to_end(key)
+
+            while len(self.__items) > self.max_size:
+                self.__items.popitem(last=False)
+
+
+class SQLiteCache(Cache):
+    """
+    An on-disk cache of responses stored in a SQLite database.
+
+    The least recently used responses are evicted once the cache holds more
+    than `max_size` responses.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: Optional[float] = 300,
+        closed_ttl: Optional[float] = None,
+        max_size: int = 100000,
+        restatement_days: int = 3,
+    ):
+        """
+        Initializes the SQLiteCache class.
+
+        :param path: The path of the SQLite database file.
+        :type path: str
+        :param ttl: Time to live in seconds of responses of open periods (default: 300).
+        :type ttl: Optional[float]
+        :param closed_ttl: Time to live in seconds of responses of closed periods,
+            None to never expire them (default: None).
+        :type closed_ttl: Optional[float]
+        :param max_size: The maximum number of cached responses (default: 100000).
+        :type max_size: int
+        :param restatement_days: The number of days before today whose data Apple may
+            still restate (default: 3).
+        :type restatement_days: int
+        """
+        super().__init__(ttl=ttl, closed_ttl=closed_ttl, max_size=max_size, restatement_days=restatement_days)
+        self.path = path
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            + "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL, accessed_at REAL NOT NULL)"
+        )
+        self.__connection.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+        )
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return self.__connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+
+        self.__connection.close()
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__connection.execute("DELETE FROM responses")
+
+    def _get(self, key: str) -> Optional[Any]:
+
+        now = time.time()
+
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            value, expires_at = row
+
+            if expires_at is not None and expires_at <= now:
+                self.__connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+
+            self.__connection.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+
+        return json.loads(value)
+
+    def _set(self, key: str, value: Any, expires_at: Optional[float]) -> None:
+
+        with self.__lock:
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, separators=(",", ":")), expires_at, time.time()),
+            )
+            self.__connection.execute(
+                "DELETE FROM responses WHERE key IN ("
+                + "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_size,),
+            )
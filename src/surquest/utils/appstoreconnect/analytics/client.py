@@ -1,10 +1,21 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import hashlib
+import logging
 import requests
+import threading
 import time
-from typing import Dict, Optional
-from .exceptions import AppStoreConnectAnalyticsRequestError
+from typing import Any, Callable, Dict, Iterator, Optional
+from requests.adapters import BaseAdapter, HTTPAdapter
+from .ratelimit import RateLimiter
+from .retry import RetryState
+from .coordination import Coordinator
+from .instrumentation import Instrumentation
+from .decoder import JSONDecoder
+from .streaming import iter_array
+
+logger = logging.getLogger(__name__)
 
 
 class Client:
@@ -14,17 +25,141 @@ class Client:
 
     BASE_URL = "https://appstoreconnect.apple.com"
 
-    def __init__(self, mayacinfo: str):
+    HEADERS = {
+        "Content-Type": "application/json",
+        "Accept": "application/json, text/plain, */*",
+        "X-Requested-By": "analytics.itunes.apple.com",
+    }
+
+    WIDGET_KEY_URL = BASE_URL + "/olympus/v1/app/config?hostname=itunesconnect.apple.com"
+
+    SESSION_URL = BASE_URL + "/olympus/v1/session"
+
+    SESSION_HEADERS = {
+        "X-Requested-By": "dev.apple.com    ",
+        "Referrer": "https://appstoreconnect.apple.com/login",
+    }
+
+    def __init__(
+        self,
+        mayacinfo: str,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        rate_limiter: Optional[RateLimiter] = None,
+        coordinator: Optional[Coordinator] = None,
+        session_ttl: float = 1800,
+        instrumentation: Optional[Instrumentation] = None,
+        decoder: Optional[Callable[[bytes], Any]] = None,
+        transport: Optional[BaseAdapter] = None,
+    ):
         """
         Initializes the Client class.
 
         :param mayacinfo: The myacinfo cookie value for the App Store Connect API.
         :type mayacinfo: str
+        :param pool_connections: The number of connection pools to cache (default: 10).
+        :type pool_connections: int
+        :param pool_maxsize: The maximum number of keep-alive connections per pool (default: 10).
+        :type pool_maxsize: int
+        :param rate_limiter: The rate limit controller shared by all requests of the client,
+            it may also be shared between clients (default: a new RateLimiter).
+        :type rate_limiter: Optional[RateLimiter]
+        :param coordinator: The backend sharing the authentication session and a global
+            request budget with other clients of the same account (default: None).
+        :type coordinator: Optional[Coordinator]
+        :param session_ttl: The number of seconds after which the itctx session is
+            refreshed proactively (default: 1800).
+        :type session_ttl: float
+        :param instrumentation: The instrumentation receiving the request events (default: None).
+        :type instrumentation: Optional[Instrumentation]
+        :param decoder: The callable decoding the raw response bodies
+            (default: a JSONDecoder using orjson when installed).
+        :type decoder: Optional[Callable[[bytes], Any]]
+        :param transport: The requests transport adapter sending the requests, e.g. a
+            ReplayTransport for offline tests (default: a pooled HTTPAdapter).
+        :type transport: Optional[BaseAdapter]
         """
 
         self.__mayacinfo = mayacinfo
+        self.identity = Client.get_identity(mayacinfo=mayacinfo)
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self.coordinator = coordinator
+        self.session_ttl = session_ttl
+        self.instrumentation = instrumentation
+        self.decoder = decoder if decoder is not None else JSONDecoder()
         self.__apple_widget_key = None
         self.__itctx = None
+        self.__session_expires_at = 0.0
+        self.__auth_lock = threading.RLock()
+        self.session = self._create_session(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            transport=transport,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the underlying HTTP session and releases its pooled connections.
+        """
+
+        self.session.close()
+
+    def _create_session(
+        self,
+        pool_connections: int,
+        pool_maxsize: int,
+        transport: Optional[BaseAdapter] = None,
+    ) -> requests.Session:
+        """
+        Creates the HTTP session shared by all requests of the client.
+
+        The session keeps the connections to App Store Connect alive, so
+        consecutive requests skip the TCP and TLS handshakes. It also holds
+        the default headers and the cookie jar with the authentication cookies.
+
+        :param pool_connections: The number of connection pools to cache.
+        :type pool_connections: int
+        :param pool_maxsize: The maximum number of keep-alive connections per pool.
+        :type pool_maxsize: int
+        :param transport: The transport adapter to mount instead of the pooled HTTPAdapter.
+        :type transport: Optional[BaseAdapter]
+        :return: The configured session.
+        :rtype: requests.Session
+        """
+
+        session = requests.Session()
+        adapter = transport if transport is not None else HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(Client.HEADERS)
+        session.cookies.set("myacinfo", self.__mayacinfo)
+
+        return session
+
+    @staticmethod
+    def get_identity(mayacinfo: str) -> str:
+        """
+        Returns the identity of the account owning the myacinfo cookie.
+
+        The identity is a hash of the cookie, so it can be used in keys and
+        names shared with other processes without disclosing the cookie.
+
+        :param mayacinfo: The myacinfo cookie value for the App Store Connect API.
+        :type mayacinfo: str
+        :return: The identity of the account.
+        :rtype: str
+        """
+
+        return hashlib.sha256(mayacinfo.encode("utf-8")).hexdigest()
 
     @staticmethod
     def get_endpoint(
@@ -78,34 +213,122 @@ class Client:
         :rtype: requests.Response
         """
 
-        iteration = 0
-        response = self.do_request(url=url, method=method, data=data)
+        response = self._send(url=url, method=method, data=data)
 
-        while response.status_code == 429 and iteration < 5:
-            iteration += 1
-            sleep = iteration * 3
-            print("-> Too many requests. Waiting for {sleep} seconds.")
-            time.sleep(sleep)
+        return self.decoder(response.content)
 
-            response = self.do_request(url=url, method=method, data=data)
+    def stream(
+        self,
+        url: str,
+        method: str = "POST",
+        data: Optional[Dict] = None,
+        path: str = "results",
+        chunk_size: int = 65536,
+    ) -> Iterator[Any]:
+        """
+        Sends a request to the App Store Connect API and yields the elements of
+        one array of the response while it is being received.
 
-        if response.status_code != 200:
-            message = (
-                f"--> Request failed with status code: {response.status_code}. "
-                + f"Response: {response.text}"
+        The body is parsed incrementally, so only the element being received
+        is kept in memory instead of the whole body and its object tree.
+        Failed requests are retried like in `request`, but a connection lost
+        in the middle of the body is raised.
+
+        :param url: The URL of the API endpoint.
+        :type url: str
+        :param method: The HTTP method to use (default: "POST").
+        :type method: str
+        :param data: The request data (default: None).
+        :type data: Optional[Dict]
+        :param path: The dot separated keys of the objects enclosing the array,
+            e.g. "results" or "data.reviews" (default: "results").
+        :type path: str
+        :param chunk_size: The number of bytes read from the socket at once (default: 65536).
+        :type chunk_size: int
+        :return: The decoded elements of the array.
+        :rtype: Iterator[Any]
+        """
+
+        response = self._send(url=url, method=method, data=data, stream=True)
+
+        try:
+            yield from iter_array(
+                chunks=response.iter_content(chunk_size=chunk_size),
+                path=path,
+                decoder=self.decoder,
             )
+        finally:
+            response.close()
 
-            print(message)
+    def _send(
+        self,
+        url: str,
+        method: str = "POST",
+        data: Optional[Dict] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """
+        Sends a request, pacing it with the rate limiter and retrying it when it fails.
 
-            raise AppStoreConnectAnalyticsRequestError(message=message)
+        :param url: The URL of the API endpoint.
+        :type url: str
+        :param method: The HTTP method to use (default: "POST").
+        :type method: str
+        :param data: The request data (default: None).
+        :type data: Optional[Dict]
+        :param stream: Whether to defer reading the body of the response (default: False).
+        :type stream: bool
+        :return: The successful API response.
+        :rtype: requests.Response
+        """
+
+        state = RetryState(client=self, method=method, url=url)
+
+        while True:
+            time.sleep(state.get_wait())
+            state.start()
+
+            try:
+                itctx = self._get_itctx()
+                response = self.do_request(url=url, method=method, data=data, stream=stream)
+            except (requests.ConnectionError, requests.Timeout) as error:
+                sleep = state.on_connection_error(error=error)
+
+                if sleep is None:
+                    raise
+
+                time.sleep(sleep)
+                continue
+
+            action, sleep = state.on_response(
+                status=response.status_code,
+                headers=response.headers,
+                size=None if stream else len(response.content),
+            )
+
+            if action == RetryState.DONE:
+                break
 
-        return response.json()
+            response.close()
+
+            if action == RetryState.REAUTHENTICATE:
+                self._reset_session(itctx=itctx)
+            else:
+                time.sleep(sleep)
+
+        if response.status_code != 200:
+            raise state.on_failure(status=response.status_code, text=response.text)
+
+        state.on_success()
+
+        return response
 
     def do_request(
         self,
         url: str,
         method: str = "POST",
         data: Optional[Dict] = None,
+        stream: bool = False,
     ) -> requests.Response:
         """
         Sends a request to the App Store Connect API.
@@ -116,24 +339,22 @@ class Client:
         :type method: str
         :param data: The request data (default: None).
         :type data: Optional[Dict]
+        :param stream: Whether to defer reading the body of the response (default: False).
+        :type stream: bool
         :return: The API response.
         :rtype: requests.Response
         """
 
-        print("-" * 50)
-        print(f"Requesting URL: {url}")
+        logger.debug("Requesting URL: %s %s", method, url)
+
+        # Make sure the session holds the widget key header and the itctx cookie.
+        self._get_itctx()
 
-        response = requests.request(
+        response = self.session.request(
             method=method,
             url=url,
             json=data,
-            headers={
-                "Content-Type": "application/json",
-                "X-Apple-Widget-Key": self._get_apple_widget_key(),
-                "Accept": "application/json, text/plain, */*",
-                "X-Requested-By": "analytics.itunes.apple.com",
-            },
-            cookies={"itctx": self._get_itctx(), "myacinfo": self.__mayacinfo},
+            stream=stream,
         )
 
         return response
@@ -149,13 +370,14 @@ class Client:
         if self.__apple_widget_key is not None:
             return self.__apple_widget_key
 
-        url = (
-            Client.BASE_URL + "/olympus/v1/app/config?hostname=itunesconnect.apple.com"
-        )
-
-        response = requests.get(url=url)
+        with self.__auth_lock:
+            # Another thread may have fetched the key while this one waited for the lock.
+            if self.__apple_widget_key is None:
+                logger.debug("Fetching the Apple widget key.")
+                response = self.session.get(url=Client.WIDGET_KEY_URL)
 
-        self.__apple_widget_key = response.json().get("authServiceKey")
+                self.__apple_widget_key = response.json().get("authServiceKey")
+                self.session.headers["X-Apple-Widget-Key"] = self.__apple_widget_key
 
         return self.__apple_widget_key
 
@@ -163,26 +385,97 @@ class Client:
         """
         Retrieves the itctx cookie for the App Store Connect API.
 
+        The session is bootstrapped by one thread at a time and refreshed once
+        it is older than `session_ttl`.
+
         :return: The itctx cookie value.
         :rtype: str
         """
 
-        if self.__itctx is not None:
+        if self.__itctx is not None and time.monotonic() < self.__session_expires_at:
             return self.__itctx
 
-        url = Client.BASE_URL + "/olympus/v1/session"
+        with self.__auth_lock:
+            if self.__itctx is None or time.monotonic() >= self.__session_expires_at:
+                self._bootstrap_session()
+
+        return self.__itctx
+
+    def _bootstrap_session(self) -> None:
+        """
+        Bootstraps the itctx session, or adopts the one shared by the coordinator.
+
+        Must be called with the authentication lock held.
+        """
+
+        if self.coordinator is not None:
+            session = self.coordinator.get_session(identity=self.identity)
+
+            if session is None and not self.coordinator.claim_bootstrap(identity=self.identity):
+                session = self.coordinator.wait_for_session(identity=self.identity)
+
+            if session is not None:
+                logger.debug("Adopting the session shared by the coordinator.")
+                self._set_session(session=session)
+                return
 
         headers = {
-            "Content-Type": "application/json",
             "X-Apple-Widget-Key": self._get_apple_widget_key(),
-            "X-Requested-By": "dev.apple.com    ",
-            "Accept": "application/json, text/plain, */*",
-            "Referrer": "https://appstoreconnect.apple.com/login",
-            "Cookie": "myacinfo=" + self.__mayacinfo,
+            **Client.SESSION_HEADERS,
         }
 
-        response = requests.get(url=url, headers=headers)
+        logger.debug("Bootstrapping the itctx session.")
+
+        # The itctx cookie set by the response is stored in the session cookie jar.
+        response = self.session.get(url=Client.SESSION_URL, headers=headers)
 
         self.__itctx = response.cookies.get_dict().get("itctx")
+        self.__session_expires_at = time.monotonic() + self.session_ttl
+
+        if self.coordinator is not None:
+            self.coordinator.set_session(
+                {"widget_key": self.__apple_widget_key, "itctx": self.__itctx},
+                identity=self.identity,
+            )
+
+    def _set_session(self, session: dict) -> str:
+        """
+        Adopts the authentication session bootstrapped by another client.
+
+        :param session: The session with the "widget_key" and "itctx" keys.
+        :type session: dict
+        :return: The itctx cookie value.
+        :rtype: str
+        """
+
+        with self.__auth_lock:
+            self.__apple_widget_key = session.get("widget_key")
+            self.__itctx = session.get("itctx")
+            self.__session_expires_at = time.monotonic() + self.session_ttl
+            self.session.headers["X-Apple-Widget-Key"] = self.__apple_widget_key
+
+            if self.__itctx is not None:
+                self.session.cookies.set("itctx", self.__itctx)
 
         return self.__itctx
+
+    def _reset_session(self, itctx: Optional[str]) -> None:
+        """
+        Discards the itctx session rejected by the API, so the next request
+        bootstraps a new one.
+
+        :param itctx: The itctx cookie value of the rejected request. The session
+            is kept when another thread has already replaced it.
+        :type itctx: Optional[str]
+        """
+
+        with self.__auth_lock:
+            if self.__itctx != itctx:
+                return
+
+            self.__itctx = None
+            self.__session_expires_at = 0.0
+            self.session.cookies.set("itctx", None)
+
+            if self.coordinator is not None:
+                self.coordinator.clear_session(itctx=itctx, identity=self.identity)
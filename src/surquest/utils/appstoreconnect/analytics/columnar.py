@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import math
+import datetime as dt
+from array import array
+from typing import Iterator, List, Optional
+
+EPOCH_ORDINAL = dt.date(1970, 1, 1).toordinal()
+
+
+class DictionaryColumn:
+    """
+    A dictionary encoded column of strings.
+
+    Every distinct value is stored once in `categories` and the rows hold
+    32-bit indexes into it.
+    """
+
+    def __init__(self):
+        self.codes = array("i")
+        self.categories = []
+        self.__index = {}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, position: int):
+        return self.categories[self.codes[position]]
+
+    def get_code(self, value) -> int:
+        """
+        Returns the code of the value, adding it to the categories when new.
+
+        :param value: The value to encode.
+        :type value: str
+        :return: The code of the value.
+        :rtype: int
+        """
+
+        code = self.__index.get(value)
+
+        if code is None:
+            code = self.__index[value] = len(self.categories)
+            self.categories.append(value)
+
+        return code
+
+    def extend(self, value, count: int) -> None:
+        """
+        Appends the value `count` times.
+
+        :param value: The value to append.
+        :type value: str
+        :param count: The number of repetitions.
+        :type count: int
+        """
+
+        self.codes.extend(array("i", [self.get_code(value)]) * count)
+
+
+class ColumnarTable:
+    """
+    Time series data stored column by column in typed arrays.
+
+    Dates are stored as days since 1970-01-01 in an int32 array, values as
+    doubles with NaN for the values Apple hides (-1.0), and the app and segment
+    columns are dictionary encoded.
+    """
+
+    def __init__(
+        self,
+        measure,
+        segmentation_name: str,
+        record_month: Optional[int] = None,
+        record_create_date: Optional[str] = None,
+    ):
+        """
+        Initializes the ColumnarTable class.
+
+        :param measure: The measure of the values.
+        :type measure: Measure
+        :param segmentation_name: The name of the segmentation of the data.
+        :type segmentation_name: str
+        :param record_month: The month of the batch as YYYYMM (default: None).
+        :type record_month: Optional[int]
+        :param record_create_date: The creation timestamp of the batch (default: None).
+        :type record_create_date: Optional[str]
+        """
+        self.measure = measure
+        self.segmentation_name = segmentation_name
+        self.record_month = record_month
+        self.record_create_date = record_create_date
+        self.date = array("i")
+        self.value = array("d")
+        self.app_id = DictionaryColumn()
+        self.segment = DictionaryColumn()
+
+    def __len__(self) -> int:
+        return len(self.date)
+
+    @property
+    def columns(self) -> List[str]:
+        return ["date", "app_id", "segmentation_name", "segment", self.measure.value]
+
+    def iter_rows(self) -> Iterator[dict]:
+        """
+        Returns the rows as dictionaries shaped like the output of Formatter.run,
+        including the batch metadata of the table.
+
+        :return: The rows.
+        :rtype: Iterator[dict]
+        """
+
+        for position in range(len(self)):
+            value = self.value[position]
+
+            yield {
+                "date": dt.date.fromordinal(self.date[position] + EPOCH_ORDINAL).isoformat(),
+                "app_id": self.app_id[position],
+                "segmentation_name": self.segmentation_name,
+                "segment": self.segment[position],
+                self.measure: None if math.isnan(value) else value,
+                "__record_month": self.record_month,
+                "__record_create_date": self.record_create_date,
+            }
+
+    def to_numpy(self) -> dict:
+        """
+        Returns the columns as NumPy arrays, with the dates as datetime64[D].
+
+        The date and value arrays share the memory of the table.
+
+        :return: The NumPy arrays keyed by the column name.
+        :rtype: dict
+        """
+
+        import numpy as np
+
+        return {
+            "date": np.frombuffer(self.date, dtype=np.int32).astype("datetime64[D]"),
+            "app_id": np.array(self.app_id.categories, dtype=object)[
+                np.frombuffer(self.app_id.codes, dtype=np.int32)
+            ],
+            "segmentation_name": np.full(len(self), self.segmentation_name, dtype=object),
+            "segment": np.array(self.segment.categories, dtype=object)[
+                np.frombuffer(self.segment.codes, dtype=np.int32)
+            ],
+            self.measure.value: np.frombuffer(self.value, dtype=np.float64),
+        }
+
+    def to_arrow(self):
+        """
+        Returns the table as a pyarrow Table with dictionary encoded string columns.
+
+        :return: The Arrow table.
+        :rtype: pyarrow.Table
+        """
+
+        import pyarrow as pa
+
+        def numbers(values, type):
+            return pa.Array.from_buffers(type, len(values), [None, pa.py_buffer(values)])
+
+        def dictionary(column):
+            return pa.DictionaryArray.from_arrays(
+                numbers(column.codes, pa.int32()),
+                pa.array(column.categories, type=pa.string()),
+            )
+
+        return pa.table({
+            "date": numbers(self.date, pa.date32()),
+            "app_id": dictionary(self.app_id),
+            "segmentation_name": pa.DictionaryArray.from_arrays(
+                numbers(array("i", [0]) * len(self), pa.int32()),
+                pa.array([self.segmentation_name], type=pa.string()),
+            ),
+            "segment": dictionary(self.segment),
+            self.measure.value: numbers(self.value, pa.float64()),
+        })
+
+    def to_pandas(self):
+        """
+        Returns the table as a pandas DataFrame with categorical string columns.
+
+        :return: The data frame.
+        :rtype: pandas.DataFrame
+        """
+
+        import numpy as np
+        import pandas as pd
+
+        columns = self.to_numpy()
+
+        return pd.DataFrame({
+            "date": columns.get("date"),
+            "app_id": pd.Categorical.from_codes(
+                np.frombuffer(self.app_id.codes, dtype=np.int32), categories=self.app_id.categories
+            ),
+            "segmentation_name": self.segmentation_name,
+            "segment": pd.Categorical.from_codes(
+                np.frombuffer(self.segment.codes, dtype=np.int32), categories=self.segment.categories
+            ),
+            self.measure.value: columns.get(self.measure.value),
+        })
+
+
+class CohortMatrix:
+    """
+    Retention data of one app stored as cohort x period offset matrices.
+
+    `percentage` and `count` are row-major double arrays with one row per
+    cohort in `cohorts` and `offsets` columns; missing cells are NaN.
+    """
+
+    def __init__(self, app_id: str, segmentation_name: str, segment: str, offsets: int):
+        """
+        Initializes the CohortMatrix class.
+
+        :param app_id: The App Store Connect app ID.
+        :type app_id: str
+        :param segmentation_name: The name of the segmentation of the data.
+        :type segmentation_name: str
+        :param segment: The name of the segment of the data.
+        :type segment: str
+        :param offsets: The number of period offsets per cohort.
+        :type offsets: int
+        """
+        self.app_id = app_id
+        self.segmentation_name = segmentation_name
+        self.segment = segment
+        self.offsets = offsets
+        self.cohorts = []
+        self.percentage = array("d")
+        self.count = array("d")
+
+    def __len__(self) -> int:
+        return len(self.cohorts)
+
+    def row(self, position: int, values: str = "percentage") -> array:
+        """
+        Returns the values of one cohort.
+
+        :param position: The position of the cohort.
+        :type position: int
+        :param values: The name of the matrix, "percentage" or "count" (default: "percentage").
+        :type values: str
+        :return: The values per period offset.
+        :rtype: array
+        """
+
+        start = position * self.offsets
+
+        return getattr(self, values)[start:start + self.offsets]
+
+    def to_numpy(self, values: str = "percentage"):
+        """
+        Returns the matrix as a 2D NumPy array sharing the memory of the matrix.
+
+        :param values: The name of the matrix, "percentage" or "count" (default: "percentage").
+        :type values: str
+        :return: The cohort x period offset array.
+        :rtype: numpy.ndarray
+        """
+
+        import numpy as np
+
+        return np.frombuffer(getattr(self, values), dtype=np.float64).reshape(len(self), self.offsets)
@@ -0,0 +1,353 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import abc
+import json
+import time
+import sqlite3
+import threading
+from typing import Callable, Optional
+
+
+class Coordinator(abc.ABC):
+    """
+    Base class of the backends coordinating several clients of one Apple account.
+
+    The coordinator holds the state shared by the clients: the authentication
+    session (widget key and itctx cookie) with its expiry, and a global request
+    budget. The state is kept per account identity, so clients of different
+    accounts sharing one coordinator never adopt each other's session. The
+    budget is a token bucket whose rate adapts like RateLimiter: it is halved
+    by every 429 response of any client, raised by `increase` after every
+    successful request, and a Retry-After header blocks all clients.
+
+    Backends only implement `_transaction`, which applies an update to the
+    state atomically.
+    """
+
+    def __init__(
+        self,
+        name: str = "default",
+        rate: float = 10.0,
+        burst: int = 10,
+        min_rate: float = 0.2,
+        max_rate: Optional[float] = None,
+        increase: float = 0.05,
+        session_ttl: float = 1800,
+    ):
+        """
+        Initializes the Coordinator class.
+
+        :param name: The name of the shared state; the states of the accounts are kept
+            apart under it (default: "default").
+        :type name: str
+        :param rate: The initial global rate in requests per second (default: 10.0).
+        :type rate: float
+        :param burst: The capacity of the global token bucket (default: 10).
+        :type burst: int
+        :param min_rate: The lowest rate the budget adapts down to (default: 0.2).
+        :type min_rate: float
+        :param max_rate: The highest rate the budget adapts up to (default: None).
+        :type max_rate: Optional[float]
+        :param increase: The rate increase after every successful request (default: 0.05).
+        :type increase: float
+        :param session_ttl: The number of seconds a shared session is reused (default: 1800).
+        :type session_ttl: float
+        """
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.session_ttl = session_ttl
+
+    def get_session(self, identity: Optional[str] = None) -> Optional[dict]:
+        """
+        Returns the shared authentication session unless it has expired.
+
+        :param identity: The identity of the account, e.g. Client.identity, None for
+            the state of the coordinator name only (default: None).
+        :type identity: Optional[str]
+        :return: The session with the "widget_key" and "itctx" keys or None.
+        :rtype: Optional[dict]
+        """
+
+        def update(state, now):
+            if state.get("session_expires_at", 0) <= now:
+                return None
+
+            return state.get("session")
+
+        return self._transaction(update, identity=identity)
+
+    def set_session(self, session: dict, identity: Optional[str] = None) -> None:
+        """
+        Shares the authentication session with the other clients.
+
+        :param session: The session with the "widget_key" and "itctx" keys.
+        :type session: dict
+        :param identity: The identity of the account, e.g. Client.identity, None for
+            the state of the coordinator name only (default: None).
+        :type identity: Optional[str]
+        """
+
+        def update(state, now):
+            state["session"] = session
+            state["session_expires_at"] = now + self.session_ttl
+            state["bootstrap_until"] = 0.0
+
+        self._transaction(update, identity=identity)
+
+    def clear_session(self, itctx: Optional[str] = None, identity: Optional[str] = None) -> None:
+        """
+        Discards the shared authentication session, e.g. after it was rejected.
+
+        :param itctx: The itctx cookie value of the rejected session. When given, a
+            session already replaced by another client is kept (default: None).
+        :type itctx: Optional[str]
+        :param identity: The identity of the account, e.g. Client.identity, None for
+            the state of the coordinator name only (default: None).
+        :type identity: Optional[str]
+        """
+
+        def update(state, now):
+            if itctx is not None and (state.get("session") or {}).get("itctx") != itctx:
+                return
+
+            state.pop("session", None)
+            state.pop("session_expires_at", None)
+
+        self._transaction(update, identity=identity)
+
+    def claim_bootstrap(self, timeout: float = 30, identity: Optional[str] = None) -> bool:
+        """
+        Claims the right to bootstrap a new session.
+
+        Only one client gets the claim until it shares the session or the claim
+        times out; the others should wait for the session with `wait_for_session`.
+
+        :param timeout: The number of seconds the claim is held (default: 30).
+        :type timeout: float
+        :param identity: The identity of the account, e.g. Client.identity, None for
+            the state of the coordinator name only (default: None).
+        :type identity: Optional[str]
+        :return: True if the caller should bootstrap the session.
+        :rtype: bool
+        """
+
+        def update(state, now):
+            if state.get("bootstrap_until", 0) > now:
+                return False
+
+            state["bootstrap_until"] = now + timeout
+
+            return True
+
+        return self._transaction(update, identity=identity)
+
+    def wait_for_session(
+        self,
+        timeout: float = 30,
+        interval: float = 0.1,
+        identity: Optional[str] = None,
+    ) -> Optional[dict]:
+        """
+        Waits until another client shares the session.
+
+        :param timeout: The maximum number of seconds to wait (default: 30).
+        :type timeout: float
+        :param interval: The polling interval in seconds (default: 0.1).
+        :type interval: float
+        :param identity: The identity of the account, e.g. Client.identity, None for
+            the state of the coordinator name only (default: None).
+        :type identity: Optional[str]
+        :return: The session or None when the wait timed out.
+        :rtype: Optional[dict]
+        """
+
+        deadline = time.time() + timeout
+
+        while True:
+            session = self.get_session(identity=identity)
+
+            if session is not None or time.time() >= deadline:
+                return session
+
+            time.sleep(interval)
+
+    def acquire(self, identity: Optional[str] = None) -> float:
+        """
+        Takes a token of the global budget for one request.
+
+        :param identity: The identity of the account, e.g. Client.identity, None for
+            the state of the coordinator name only (default: None).
+        :type identity: Optional[str]
+        :return: The number of seconds the caller has to wait before sending the request.
+        :rtype: float
+        """
+
+        def update(state, now):
+            rate = state.setdefault("rate", self.rate)
+            tokens = min(
+                float(self.burst),
+                state.get("tokens", float(self.burst)) + (now - state.get("updated_at", now)) * rate,
+            ) - 1
+
+            state["tokens"] = tokens
+            state["updated_at"] = now
+
+            wait = -tokens / rate if tokens < 0 else 0.0
+
+            return max(wait, state.get("blocked_until", 0.0) - now)
+
+        return self._transaction(update, identity=identity)
+
+    def on_success(self, identity: Optional[str] = None) -> None:
+        """
+        Records a successful request and raises the global rate.
+
+        :param identity: The identity of the account, e.g. Client.identity, None for
+            the state of the coordinator name only (default: None).
+        :type identity: Optional[str]
+        """
+
+        def update(state, now):
+            rate = state.get("rate", self.rate) + self.increase
+
+            if self.max_rate is not None:
+                rate = min(rate, self.max_rate)
+
+            state["rate"] = rate
+
+        self._transaction(update, identity=identity)
+
+    def on_throttle(self, retry_after: Optional[float] = None, identity: Optional[str] = None) -> None:
+        """
+        Records a 429 response and lowers the global rate.
+
+        :param retry_after: The delay requested by the Retry-After header in seconds.
+        :type retry_after: Optional[float]
+        :param identity: The identity of the account, e.g. Client.identity, None for
+            the state of the coordinator name only (default: None).
+        :type identity: Optional[str]
+        """
+
+        def update(state, now):
+            state["rate"] = max(self.min_rate, state.get("rate", self.rate) / 2)
+            state["tokens"] = min(state.get("tokens", 0.0), 0.0)
+
+            if retry_after is not None:
+                state["blocked_until"] = max(state.get("blocked_until", 0.0), now + retry_after)
+
+        self._transaction(update, identity=identity)
+
+    def get_key(self, identity: Optional[str] = None) -> str:
+        """
+        Returns the key of the state of the account.
+
+        :param identity: The identity of the account, e.g. Client.identity, None for
+            the state of the coordinator name only (default: None).
+        :type identity: Optional[str]
+        :return: The key of the state.
+        :rtype: str
+        """
+
+        return self.name if identity is None else f"{self.name}:{identity}"
+
+    @abc.abstractmethod
+    def _transaction(self, update: Callable[[dict, float], object], identity: Optional[str] = None):
+        """
+        Applies the update to the state of the account atomically.
+
+        :param update: The function called with the state and the current time. It
+            may modify the state in place and its return value is returned.
+        :type update: Callable[[dict, float], object]
+        :param identity: The identity of the account, e.g. Client.identity, None for
+            the state of the coordinator name only (default: None).
+        :type identity: Optional[str]
+        :return: The value returned by the update.
+        """
+
+
+class MemoryCoordinator(Coordinator):
+    """
+    A coordinator kept in memory, sharing the state between the clients of one process.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.__states = {}
+        self.__lock = threading.Lock()
+
+    def _transaction(self, update: Callable[[dict, float], object], identity: Optional[str] = None):
+
+        with self.__lock:
+            state = self.__states.setdefault(self.get_key(identity=identity), {})
+
+            return update(state, time.time())
+
+
+class SQLiteCoordinator(Coordinator):
+    """
+    A coordinator persisted in a SQLite database, sharing the state between
+    the processes of one host.
+
+    Every update runs in an immediate transaction, so the database lock
+    serializes the processes.
+    """
+
+    def __init__(self, path: str, timeout: float = 30, **kwargs):
+        """
+        Initializes the SQLiteCoordinator class.
+
+        :param path: The path of the SQLite database file shared by the processes.
+        :type path: str
+        :param timeout: The number of seconds to wait for the database lock (default: 30).
+        :type timeout: float
+        :param kwargs: The parameters of the Coordinator class.
+        """
+        super().__init__(**kwargs)
+        self.path = path
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(
+            path, timeout=timeout, check_same_thread=False, isolation_level=None
+        )
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS coordination (name TEXT PRIMARY KEY, state TEXT NOT NULL)"
+        )
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+
+        self.__connection.close()
+
+    def _transaction(self, update: Callable[[dict, float], object], identity: Optional[str] = None):
+
+        key = self.get_key(identity=identity)
+
+        with self.__lock:
+            self.__connection.execute("BEGIN IMMEDIATE")
+
+            try:
+                row = self.__connection.execute(
+                    "SELECT state FROM coordination WHERE name = ?", (key,)
+                ).fetchone()
+                state = {} if row is None else json.loads(row[0])
+
+                result = update(state, time.time())
+
+                self.__connection.execute(
+                    "INSERT OR REPLACE INTO coordination (name, state) VALUES (?, ?)",
+                    (key, json.dumps(state, separators=(",", ":"))),
+                )
+            except BaseException:
+                self.__connection.execute("ROLLBACK")
+                raise
+
+            self.__connection.execute("COMMIT")
+
+        return result
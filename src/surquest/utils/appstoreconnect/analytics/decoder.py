@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import json
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:  # pragma: no cover
+    simdjson = None
+
+
+class JSONDecoder:
+    """
+    The JSONDecoder class decodes the response bodies of the clients.
+
+    The body is decoded straight from the bytes received from the socket.
+    orjson and simdjson parse the bytes without building an intermediate
+    string; the standard library decoder is the fallback when neither is
+    installed.
+    """
+
+    BACKENDS = ("orjson", "simdjson", "json")
+
+    def __init__(self, backend: Optional[str] = None):
+        """
+        Initializes the JSONDecoder class.
+
+        :param backend: The backend to use: "orjson", "simdjson" or "json".
+            None picks the fastest installed one (default: None).
+        :type backend: Optional[str]
+        """
+
+        if backend is None:
+            backend = "orjson" if orjson is not None else "simdjson" if simdjson is not None else "json"
+
+        if backend not in JSONDecoder.BACKENDS:
+            raise ValueError(f"Invalid JSON backend: {backend}")
+
+        if backend == "orjson" and orjson is None:
+            raise ImportError(
+                "The orjson JSON backend is not installed. "
+                + "Install it with: pip install surquest-utils-appstoreconnect-analytics-api[fast]"
+            )
+
+        if backend == "simdjson" and simdjson is None:
+            raise ImportError(
+                "The simdjson JSON backend is not installed. "
+                + "Install it with: pip install pysimdjson"
+            )
+
+        self.backend = backend
+        self.__loads = {
+            "orjson": orjson.loads if orjson is not None else None,
+            "simdjson": simdjson.loads if simdjson is not None else None,
+            "json": json.loads,
+        }.get(backend)
+
+    def __call__(self, body: Union[bytes, bytearray, memoryview, str]) -> Any:
+        """
+        Decodes a JSON document.
+
+        :param body: The raw response body.
+        :type body: Union[bytes, bytearray, memoryview, str]
+        :return: The decoded document.
+        :rtype: Any
+        """
+
+        if isinstance(body, memoryview) and self.backend != "orjson":
+            body = body.tobytes()
+
+        return self.__loads(body)
+
+    def __repr__(self) -> str:
+        return f"JSONDecoder(backend={self.backend!r})"
@@ -21,3 +21,17 @@ class AppStoreConnectAnalyticsRequestError(AppStoreConnectAnalyticsError):
 
     def __init__(self, message: str) -> None:
         self.message = message
+
+
+class AppStoreConnectAnalyticsIncompleteError(AppStoreConnectAnalyticsError):
+
+    """Exception raised when the segments of a grouping do not add up to the totals.
+
+    Attributes:
+        message -- explanation of the error
+        gaps -- sum of the absolute differences of the totals and the sums of the segments per date, by app ID
+    """
+
+    def __init__(self, message: str, gaps: dict) -> None:
+        self.message = message
+        self.gaps = gaps
@@ -0,0 +1,343 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import abc
+import bz2
+import csv
+import gzip
+import json
+import lzma
+import logging
+import datetime as dt
+import itertools
+from typing import Any, Iterable, List, Optional
+from .enums import Measure
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+class Exporter(abc.ABC):
+    """
+    Base class of the exporters writing formatted rows to a file.
+
+    The rows are consumed from any iterable, e.g. the output of a formatter or
+    of `iter_time_series`, in chunks of `chunk_size` rows. Every chunk is
+    serialized at once and handed to a buffered file, so the memory used does
+    not depend on the size of the extract. Rows can be dictionaries or records
+    with a `to_dict` method.
+
+    Exporters are context managers; `write` can be called several times before
+    the file is closed.
+    """
+
+    # Compressions of the text exporters by file suffix.
+    COMPRESSIONS = {
+        ".gz": "gzip",
+        ".bz2": "bz2",
+        ".xz": "xz",
+    }
+
+    OPENERS = {
+        "gzip": gzip.open,
+        "bz2": bz2.open,
+        "xz": lzma.open,
+    }
+
+    def __init__(
+        self,
+        path: str,
+        compression: Optional[str] = None,
+        chunk_size: int = 10000,
+        buffer_size: int = 1 << 20,
+    ):
+        """
+        Initializes the Exporter class.
+
+        :param path: The path of the file.
+        :type path: str
+        :param compression: "gzip", "bz2" or "xz", None to infer it from the suffix of the path (default: None).
+        :type compression: Optional[str]
+        :param chunk_size: The number of rows serialized at once (default: 10000).
+        :type chunk_size: int
+        :param buffer_size: The size of the write buffer of uncompressed files in bytes (default: 1 MiB).
+        :type buffer_size: int
+        """
+
+        if compression is None:
+            compression = next(
+                (name for suffix, name in Exporter.COMPRESSIONS.items() if path.endswith(suffix)),
+                None,
+            )
+
+        if compression is not None and compression not in Exporter.OPENERS:
+            raise ValueError(f"Invalid compression: {compression}")
+
+        self.path = path
+        self.compression = compression
+        self.chunk_size = max(1, chunk_size)
+        self.buffer_size = buffer_size
+        self.rows = 0
+        self.__file = None
+
+    def write(self, rows: Iterable) -> int:
+        """
+        Writes the rows to the file.
+
+        :param rows: The formatted rows.
+        :type rows: Iterable
+        :return: The number of rows written.
+        :rtype: int
+        """
+
+        rows = iter(rows)
+        count = 0
+
+        while True:
+            chunk = [
+                row.to_dict() if hasattr(row, "to_dict") else row
+                for row in itertools.islice(rows, self.chunk_size)
+            ]
+
+            if not chunk:
+                break
+
+            self._write_chunk(chunk=chunk)
+            count += len(chunk)
+
+        self.rows += count
+        logger.debug("Exported %d rows to %s", count, self.path)
+
+        return count
+
+    def close(self) -> None:
+        """
+        Flushes and closes the file.
+        """
+
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    @abc.abstractmethod
+    def _write_chunk(self, chunk: List[dict]) -> None:
+        """
+        Serializes the chunk of rows and writes it to the file.
+        """
+
+    def _get_file(self, newline: Optional[str] = None):
+        """
+        Returns the text file, opening it on the first call.
+        """
+
+        if self.__file is None:
+
+            if self.compression is None:
+                self.__file = open(self.path, "w", buffering=self.buffer_size, encoding="utf-8", newline=newline)
+            else:
+                self.__file = Exporter.OPENERS.get(self.compression)(self.path, "wt", encoding="utf-8", newline=newline)
+
+        return self.__file
+
+    @staticmethod
+    def get_name(key) -> str:
+        """
+        Returns the column name of a row key; Measure keys are named by their value.
+
+        :param key: The key of the row.
+        :type key: Any
+        :return: The column name.
+        :rtype: str
+        """
+
+        return getattr(key, "value", key)
+
+    @staticmethod
+    def get_value(value) -> Any:
+        """
+        Returns the value as a JSON and CSV friendly scalar.
+
+        :param value: The value of the row.
+        :type value: Any
+        :return: The converted value.
+        :rtype: Any
+        """
+
+        if isinstance(value, (dt.date, dt.datetime)):
+            return value.isoformat()
+
+        return value
+
+    def __enter__(self) -> "Exporter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class NDJSONExporter(Exporter):
+    """
+    Writes the rows as newline delimited JSON, one object per line.
+
+    The rows are encoded with orjson when it is installed.
+    """
+
+    def _write_chunk(self, chunk: List[dict]) -> None:
+
+        if orjson is not None:
+            lines = b"\n".join(orjson.dumps(row, option=orjson.OPT_NON_STR_KEYS) for row in chunk)
+            self._get_file().write(lines.decode("utf-8") + "\n")
+            return
+
+        dumps = json.JSONEncoder(
+            ensure_ascii=False,
+            separators=(",", ":"),
+            default=Exporter.get_value,
+        ).encode
+
+        self._get_file().write("\n".join(dumps(row) for row in chunk) + "\n")
+
+
+class CSVExporter(Exporter):
+    """
+    Writes the rows as CSV with a header.
+
+    The columns are the keys of the first row; keys missing in a later row are
+    written as empty values and extra keys are dropped.
+    """
+
+    def __init__(self, path: str, delimiter: str = ",", **kwargs):
+        """
+        Initializes the CSVExporter class.
+
+        :param path: The path of the file.
+        :type path: str
+        :param delimiter: The delimiter of the values (default: ",").
+        :type delimiter: str
+        :param kwargs: The parameters of the Exporter class.
+        """
+
+        super().__init__(path=path, **kwargs)
+        self.delimiter = delimiter
+        self.__keys = None
+        self.__writer = None
+
+    def _write_chunk(self, chunk: List[dict]) -> None:
+
+        if self.__writer is None:
+            self.__keys = list(chunk[0])
+            self.__writer = csv.writer(self._get_file(newline=""), delimiter=self.delimiter)
+            self.__writer.writerow([Exporter.get_name(key) for key in self.__keys])
+
+        get_value = Exporter.get_value
+        keys = self.__keys
+
+        self.__writer.writerows(
+            [get_value(row.get(key)) for key in keys]
+            for row in chunk
+        )
+
+
+class ParquetExporter(Exporter):
+    """
+    Writes the rows as a Parquet file with a row group per chunk.
+
+    Requires pyarrow. Unless a schema is given, it is inferred from the first
+    chunk, with the measure and retention columns always typed as float64, so a
+    chunk without any value does not fix them to the null type. A
+    ColumnarTable can be written as well, without building any row.
+    """
+
+    # Columns typed as float64 whatever the values of the first chunk.
+    FLOAT_COLUMNS = frozenset(
+        [measure.value for measure in Measure]
+        + ["retentionPercentage", "retentionCount"]
+    )
+
+    def __init__(self, path: str, compression: Optional[str] = "snappy", schema=None, **kwargs):
+        """
+        Initializes the ParquetExporter class.
+
+        :param path: The path of the file.
+        :type path: str
+        :param compression: The Parquet compression codec, e.g. "snappy", "zstd" or "gzip" (default: "snappy").
+        :type compression: Optional[str]
+        :param schema: The schema of the file, None to infer it from the first chunk (default: None).
+        :type schema: Optional[pyarrow.Schema]
+        :param kwargs: The parameters of the Exporter class.
+        """
+
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError(
+                "The Parquet export requires pyarrow. "
+                + "Install it with: pip install surquest-utils-appstoreconnect-analytics-api[columnar]"
+            )
+
+        # The codec is applied by the Parquet writer, not to the file.
+        super().__init__(path=path, compression=None, **kwargs)
+        self.codec = compression
+        self.schema = schema
+        self.__pa = pyarrow
+        self.__pq = pyarrow.parquet
+        self.__writer = None
+        self.__keys = None
+
+    def write(self, rows: Iterable) -> int:
+        """
+        Writes the rows, or a ColumnarTable, to the file.
+
+        :param rows: The formatted rows or a ColumnarTable.
+        :type rows: Iterable
+        :return: The number of rows written.
+        :rtype: int
+        """
+
+        if hasattr(rows, "to_arrow"):
+            table = rows.to_arrow()
+            self._write_table(table=table)
+            self.rows += table.num_rows
+
+            return table.num_rows
+
+        return super().write(rows=rows)
+
+    def close(self) -> None:
+
+        if self.__writer is not None:
+            self.__writer.close()
+            self.__writer = None
+
+    def _write_chunk(self, chunk: List[dict]) -> None:
+
+        if self.__keys is None:
+            self.__keys = list(chunk[0])
+
+        float64 = self.__pa.float64()
+        columns = {}
+
+        for key in self.__keys:
+            name = Exporter.get_name(key)
+            columns[name] = self.__pa.array(
+                [row.get(key) for row in chunk],
+                type=float64 if name in ParquetExporter.FLOAT_COLUMNS else None,
+            )
+
+        self._write_table(table=self.__pa.table(columns))
+
+    def _write_table(self, table) -> None:
+
+        if self.__writer is None:
+            schema = self.schema if self.schema is not None else table.schema
+            self.__writer = self.__pq.ParquetWriter(self.path, schema, compression=self.codec)
+
+        if table.schema != self.__writer.schema:
+            table = table.cast(self.__writer.schema)
+
+        self.__writer.write_table(table, row_group_size=max(self.chunk_size, table.num_rows))
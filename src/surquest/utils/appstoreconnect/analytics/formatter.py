@@ -1,7 +1,12 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import functools
 import datetime as dt
+from array import array
+from .enums import Measure
+from .columnar import ColumnarTable, CohortMatrix, EPOCH_ORDINAL
+from .records import TimeSeriesRecord, RetentionRecord, ReviewRecord, intern
 
 
 class Formatter(object):
@@ -18,44 +23,281 @@ class Formatter(object):
         :type data: dict
         :param grouping: The grouping to use for the data.
         :type grouping: str
-        :param measure: The measure to use for the data.
-        :type measure: str
+        :param measure: The measure or a list of measures to use for the data.
+        :type measure: Union[Measure, List[Measure]]
         :return: The formatted data.
         :rtype: list
         """
 
         out = []
+        context = Formatter._get_run_context(grouping=grouping, measure=measure)
 
         for item in data.get("results"):
-            app_id = item.get("adamId")
-            segmentation = grouping
-            segment = (
-                "<total>"
-                if item.get("group") is None
-                else item.get("group").get("title")
-            )
-            segmentation_name = (
-                "<total>" if segmentation.value is None else segmentation.name
+            out.extend(Formatter._format_series(item=item, measure=measure, **context))
+
+        return out
+
+    @staticmethod
+    def iter_run(data, grouping, measure):
+        """
+        Formats data from the App Store Connect Analytics API row by row.
+
+        :param data: The data to format.
+        :type data: dict
+        :param grouping: The grouping to use for the data.
+        :type grouping: str
+        :param measure: The measure or a list of measures to use for the data.
+        :type measure: Union[Measure, List[Measure]]
+        :return: The formatted rows.
+        :rtype: Iterator[dict]
+        """
+
+        context = Formatter._get_run_context(grouping=grouping, measure=measure)
+
+        for item in data.get("results"):
+            yield from Formatter._format_series(item=item, measure=measure, **context)
+
+    @staticmethod
+    def _get_run_context(grouping, measure) -> dict:
+        """
+        Returns the values shared by all rows formatted in one call.
+
+        The batch metadata is computed once, so all rows of a response carry the
+        same record timestamps.
+
+        :param grouping: The grouping to use for the data.
+        :type grouping: str
+        :param measure: The measure to use for the data.
+        :type measure: str
+        :return: The shared values.
+        :rtype: dict
+        """
+
+        now = dt.datetime.utcnow()
+
+        return {
+            "segmentation_name": "<total>" if grouping.value is None else grouping.name,
+            "record_month": int(now.strftime("%Y%m")),
+            "record_create_date": now.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }
+
+    @staticmethod
+    def _format_series(item, measure, segmentation_name, record_month, record_create_date) -> list:
+        """
+        Formats the records of one series of the response.
+
+        :param item: The series of the response.
+        :type item: dict
+        :param measure: The measure or a list of measures to use for the data.
+        :type measure: Union[Measure, List[Measure]]
+        :param segmentation_name: The name of the segmentation.
+        :type segmentation_name: str
+        :param record_month: The month of the batch as YYYYMM.
+        :type record_month: int
+        :param record_create_date: The creation timestamp of the batch.
+        :type record_create_date: str
+        :return: The formatted rows.
+        :rtype: list
+        """
+
+        app_id = item.get("adamId")
+        group = item.get("group")
+        segment = "<total>" if group is None else group.get("title")
+
+        if isinstance(measure, (list, tuple)):
+            # One wide row per date with a column per measure.
+            return [
+                {
+                    "date": str(record.get("date")).partition("T")[0],
+                    "app_id": app_id,
+                    "segmentation_name": segmentation_name,
+                    "segment": segment,
+                    **{
+                        name: None if value == -1.0 else value
+                        for name in measure
+                        for value in (record.get(name.value),)
+                    },
+                    "__record_month": record_month,
+                    "__record_create_date": record_create_date,
+                }
+                for record in item.get("data")
+            ]
+
+        key = measure.value
+
+        return [
+            {
+                "date": str(record.get("date")).partition("T")[0],
+                "app_id": app_id,
+                "segmentation_name": segmentation_name,
+                "segment": segment,
+                measure: None if value == -1.0 else value,
+                "__record_month": record_month,
+                "__record_create_date": record_create_date,
+            }
+            for record in item.get("data")
+            for value in (record.get(key),)
+        ]
+
+    @staticmethod
+    def columnar(data, grouping, measure):
+        """
+        Formats data from the App Store Connect Analytics API into typed columns.
+
+        Each series of the response is appended to the columns in bulk, so no
+        per-row dictionary is created.
+
+        :param data: The data to format.
+        :type data: dict
+        :param grouping: The grouping to use for the data.
+        :type grouping: str
+        :param measure: The measure to use for the data; a list of measures raises a ValueError.
+        :type measure: Measure
+        :return: The formatted data.
+        :rtype: ColumnarTable
+        """
+
+        if not isinstance(measure, Measure):
+            raise ValueError(
+                f"Formatter.columnar supports a single measure, got: {measure}. "
+                + "Use Formatter.run to format several measures."
             )
 
-            for record in item.get("data"):
-                out.append(
-                    {
-                        "date": str(record.get("date")).split("T")[0],
-                        "app_id": app_id,
-                        "segmentation_name": segmentation_name,
-                        "segment": segment,
-                        measure: None
-                        if record.get(measure.value) == -1.0
-                        else record.get(measure),
-                        "__record_month": int(dt.datetime.utcnow().strftime("%Y%m")),
-                        "__record_create_date": dt.datetime.utcnow().strftime(
-                            "%Y-%m-%dT%H:%M:%SZ"
-                        ),
-                    }
+        context = Formatter._get_run_context(grouping=grouping, measure=measure)
+
+        table = ColumnarTable(
+            measure=measure,
+            segmentation_name=context.get("segmentation_name"),
+            record_month=context.get("record_month"),
+            record_create_date=context.get("record_create_date"),
+        )
+
+        # Dates repeat across the series, so each one is parsed only once.
+        days = {}
+        nan = float("nan")
+        key = measure.value
+
+        for item in data.get("results"):
+            records = item.get("data")
+            group = item.get("group")
+
+            for record in records:
+                date = record.get("date")
+
+                if date not in days:
+                    days[date] = dt.date.fromisoformat(str(date)[:10]).toordinal() - EPOCH_ORDINAL
+
+            table.date.extend([days[record.get("date")] for record in records])
+            table.value.extend([
+                nan if value is None or value == -1.0 else value
+                for value in (record.get(key) for record in records)
+            ])
+            table.app_id.extend(item.get("adamId"), len(records))
+            table.segment.extend("<total>" if group is None else group.get("title"), len(records))
+
+        return table
+
+    @staticmethod
+    def run_by_app(data, grouping, measure):
+        """
+        Formats data from the App Store Connect Analytics API and splits it per app.
+
+        :param data: The data to format.
+        :type data: dict
+        :param grouping: The grouping to use for the data.
+        :type grouping: str
+        :param measure: The measure to use for the data.
+        :type measure: str
+        :return: The formatted data keyed by the app ID.
+        :rtype: dict
+        """
+
+        return Formatter._split_by_app(
+            rows=Formatter.run(data=data, grouping=grouping, measure=measure),
+            key="app_id",
+        )
+
+    @staticmethod
+    def records(data, grouping, measure):
+        """
+        Formats data from the App Store Connect Analytics API into slotted rows.
+
+        :param data: The data to format.
+        :type data: dict
+        :param grouping: The grouping to use for the data.
+        :type grouping: str
+        :param measure: The measure or a list of measures to use for the data.
+        :type measure: Union[Measure, List[Measure]]
+        :return: The formatted data.
+        :rtype: List[TimeSeriesRecord]
+        """
+
+        return list(Formatter.iter_records(data=data, grouping=grouping, measure=measure))
+
+    @staticmethod
+    def iter_records(data, grouping, measure):
+        """
+        Formats data from the App Store Connect Analytics API into slotted rows, row by row.
+
+        The dates are parsed once per call into shared dt.date objects and the app
+        IDs and segments are interned, so the rows of different responses share
+        them as well.
+
+        :param data: The data to format.
+        :type data: dict
+        :param grouping: The grouping to use for the data.
+        :type grouping: str
+        :param measure: The measure or a list of measures to use for the data.
+        :type measure: Union[Measure, List[Measure]]
+        :return: The formatted rows.
+        :rtype: Iterator[TimeSeriesRecord]
+        """
+
+        context = Formatter._get_run_context(grouping=grouping, measure=measure)
+        segmentation_name = intern(context.get("segmentation_name"))
+        record_month = context.get("record_month")
+        record_create_date = context.get("record_create_date")
+
+        if isinstance(measure, (list, tuple)):
+            measures = tuple(measure)
+
+            def get_value(record):
+                return tuple(
+                    None if value == -1.0 else value
+                    for value in (record.get(item.value) for item in measures)
                 )
+        else:
+            measures = measure
+            key = measure.value
 
-        return out
+            def get_value(record):
+                value = record.get(key)
+                return None if value == -1.0 else value
+
+        days = {}
+
+        for item in data.get("results"):
+            app_id = intern(item.get("adamId"))
+            group = item.get("group")
+            segment = intern("<total>" if group is None else group.get("title"))
+
+            for record in item.get("data"):
+                date = record.get("date")
+                day = days.get(date)
+
+                if day is None:
+                    day = days[date] = dt.date.fromisoformat(str(date)[:10])
+
+                yield TimeSeriesRecord(
+                    day,
+                    app_id,
+                    segmentation_name,
+                    segment,
+                    measures,
+                    get_value(record),
+                    record_month,
+                    record_create_date,
+                )
 
     @staticmethod
     def retentions(data, grouping) -> list:
@@ -70,8 +312,212 @@ class Formatter(object):
         :rtype: list
         """
 
+        return list(Formatter.iter_retentions(data=data, grouping=grouping))
+
+    @staticmethod
+    def iter_retentions(data, grouping):
+        """
+        Formats data from the App Store Retentions API row by row.
+
+        :param data: List of retentions kpis.
+        :type data: dict
+        :param grouping: The grouping to use for the data.
+        :type grouping: list
+        :return: The formatted rows.
+        :rtype: Iterator[dict]
+        """
+
+        segmentation_name, segment_name = Formatter._get_retention_segment(grouping=grouping)
+        parse = Formatter.parse_timestamp
+
+        for purchase_day in data.get("results"):
+            purchased_at = parse(purchase_day.get("appPurchase"))
+            app_id = purchase_day.get("adamId")
+
+            for date in purchase_day.get("data"):
+                yield {
+                    "purchasedAt": purchased_at,
+                    "date": parse(date.get("date")),
+                    "appId": app_id,
+                    "segmentationName": segmentation_name,
+                    "segment": segment_name,
+                    "retentionPercentage": date.get("retentionPercentage"),
+                    "retentionCount": date.get("value"),
+                }
+
+    @staticmethod
+    def retention_records(data, grouping) -> list:
+        """
+        Formats data from the App Store Retentions API into slotted cells.
+
+        The timestamps are the shared objects of `parse_timestamp` and the app IDs
+        are interned, so a cell holds no copy of them.
+
+        :param data: List of retentions kpis.
+        :type data: dict
+        :param grouping: The grouping to use for the data.
+        :type grouping: list
+        :return: The formatted data.
+        :rtype: List[RetentionRecord]
+        """
+
+        segmentation_name, segment_name = Formatter._get_retention_segment(grouping=grouping)
+        segmentation_name, segment_name = intern(segmentation_name), intern(segment_name)
+        parse = Formatter.parse_timestamp
         out = []
 
+        for purchase_day in data.get("results"):
+            purchased_at = parse(purchase_day.get("appPurchase"))
+            app_id = intern(purchase_day.get("adamId"))
+
+            out.extend(
+                RetentionRecord(
+                    purchased_at,
+                    parse(date.get("date")),
+                    app_id,
+                    segmentation_name,
+                    segment_name,
+                    date.get("retentionPercentage"),
+                    date.get("value"),
+                )
+                for date in purchase_day.get("data")
+            )
+
+        return out
+
+    @staticmethod
+    def retention_matrices(data, grouping) -> dict:
+        """
+        Formats data from the App Store Retentions API into cohort matrices.
+
+        Every app gets one matrix with a row per purchase cohort and a column per
+        period offset since the purchase, instead of one dictionary per cell.
+
+        :param data: List of retentions kpis.
+        :type data: dict
+        :param grouping: The grouping to use for the data.
+        :type grouping: list
+        :return: The cohort matrices keyed by the app ID.
+        :rtype: dict
+        """
+
+        segmentation_name, segment_name = Formatter._get_retention_segment(grouping=grouping)
+        parse = Formatter.parse_timestamp
+        get_offset = Formatter._get_retention_offset(data=data)
+        cohorts = {}
+
+        # The column of a cell is its period offset since the purchase, so the
+        # dates missing inside a cohort are left as NaN instead of shifting the row.
+        for purchase_day in data.get("results"):
+            purchased_at = parse(purchase_day.get("appPurchase"))
+            cells = [
+                (get_offset(purchased_at, parse(date.get("date"))), date)
+                for date in purchase_day.get("data")
+            ]
+            cohorts.setdefault(purchase_day.get("adamId"), []).append((purchased_at, cells))
+
+        out = {}
+        nan = float("nan")
+
+        for app_id, purchase_days in cohorts.items():
+            offsets = 1 + max((offset for _, cells in purchase_days for offset, _ in cells), default=0)
+            matrix = CohortMatrix(
+                app_id=app_id,
+                segmentation_name=segmentation_name,
+                segment=segment_name,
+                offsets=offsets,
+            )
+
+            for purchased_at, cells in purchase_days:
+                percentage = array("d", [nan]) * offsets
+                count = array("d", [nan]) * offsets
+
+                for offset, date in cells:
+                    value = date.get("retentionPercentage")
+                    percentage[offset] = nan if value is None else value
+                    value = date.get("value")
+                    count[offset] = nan if value is None else value
+
+                matrix.cohorts.append(purchased_at.date())
+                matrix.percentage.extend(percentage)
+                matrix.count.extend(count)
+
+            out[app_id] = matrix
+
+        return out
+
+    @staticmethod
+    def _get_retention_offset(data):
+        """
+        Returns the function computing the period offset of a retention cell.
+
+        The response does not tell its frequency, so the period is the smallest
+        step between consecutive dates of a cohort: steps of 28 days or more are
+        calendar months, shorter ones a number of days (1 for daily, 7 for weekly).
+
+        :param data: List of retentions kpis.
+        :type data: dict
+        :return: The function of the purchase and the cell timestamps returning the offset.
+        :rtype: Callable[[dt.datetime, dt.datetime], int]
+        """
+
+        parse = Formatter.parse_timestamp
+        step = None
+
+        for purchase_day in data.get("results"):
+            dates = [parse(date.get("date")) for date in purchase_day.get("data")]
+
+            for previous, current in zip(dates, dates[1:]):
+                days = (current - previous).days
+
+                if days > 0 and (step is None or days < step):
+                    step = days
+
+        if step is not None and step >= 28:
+            return lambda purchased_at, date: (date.year - purchased_at.year) * 12 + date.month - purchased_at.month
+
+        step = step or 1
+
+        return lambda purchased_at, date: max(0, (date - purchased_at).days // step)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=65536)
+    def parse_timestamp(value: str) -> dt.datetime:
+        """
+        Parses a "%Y-%m-%dT%H:%M:%SZ" timestamp of the API.
+
+        The results are memoized, because the same dates repeat across the
+        cohorts of a retention response.
+
+        :param value: The timestamp to parse.
+        :type value: str
+        :return: The parsed timestamp.
+        :rtype: dt.datetime
+        """
+
+        if len(value) == 20 and value[4] == "-" and value[10] == "T" and value[19] == "Z":
+            return dt.datetime(
+                int(value[0:4]),
+                int(value[5:7]),
+                int(value[8:10]),
+                int(value[11:13]),
+                int(value[14:16]),
+                int(value[17:19]),
+            )
+
+        return dt.datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
+
+    @staticmethod
+    def _get_retention_segment(grouping) -> tuple:
+        """
+        Returns the segmentation and segment names of retention data.
+
+        :param grouping: The grouping to use for the data.
+        :type grouping: list
+        :return: The segmentation name and the segment name.
+        :rtype: tuple
+        """
+
         segmentation_name = "<total>"
         segment_name = "<total>"
 
@@ -79,26 +525,25 @@ class Formatter(object):
             segmentation_name = str(grouping[0].get("dimensionKey"))
             segment_name = ",".join(grouping[0].get("optionKeys"))
 
-        for purchase_day in data.get("results"):
+        return segmentation_name, segment_name
 
-            for date in purchase_day.get("data"):
-                out.append(
-                    {
-                        "purchasedAt": dt.datetime.strptime(
-                            purchase_day.get("appPurchase"), "%Y-%m-%dT%H:%M:%SZ"
-                        ),
-                        "date": dt.datetime.strptime(
-                            date.get("date"), "%Y-%m-%dT%H:%M:%SZ"
-                        ),
-                        "appId": purchase_day.get("adamId"),
-                        "segmentationName": segmentation_name,
-                        "segment": segment_name,
-                        "retentionPercentage": date.get("retentionPercentage"),
-                        "retentionCount": date.get("value"),
-                    }
-                )
+    @staticmethod
+    def retentions_by_app(data, grouping) -> dict:
+        """
+        Formats data from the App Store Retentions API and splits it per app.
 
-        return out
+        :param data: List of retentions kpis.
+        :type data: dict
+        :param grouping: The grouping to use for the data.
+        :type grouping: list
+        :return: The formatted data keyed by the app ID.
+        :rtype: dict
+        """
+
+        return Formatter._split_by_app(
+            rows=Formatter.retentions(data=data, grouping=grouping),
+            key="appId",
+        )
 
     @staticmethod
     def reviews(data):
@@ -112,3 +557,36 @@ class Formatter(object):
         """
 
         return data
+
+    @staticmethod
+    def review_records(data) -> list:
+        """
+        Formats data from the App Store Reviews API into slotted reviews.
+
+        :param data: List of reviews.
+        :type data: list
+        :return: The formatted data.
+        :rtype: List[ReviewRecord]
+        """
+
+        return [ReviewRecord.from_review(review) for review in data]
+
+    @staticmethod
+    def _split_by_app(rows, key) -> dict:
+        """
+        Groups formatted rows by the app ID.
+
+        :param rows: The formatted rows.
+        :type rows: list
+        :param key: The name of the app ID column.
+        :type key: str
+        :return: The rows keyed by the app ID.
+        :rtype: dict
+        """
+
+        out = {}
+
+        for row in rows:
+            out.setdefault(row.get(key), []).append(row)
+
+        return out
@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import bisect
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+
+class RequestEvent(NamedTuple):
+    """
+    A single event in the life of a request sent by a client.
+
+    `event` is one of "start", "end", "retry" and "error". `duration` and
+    `size` (bytes of the response body) are set on "end" events, `wait` (the
+    backoff before the next attempt) on "retry" events and `error` on "error"
+    events raised by a connection failure.
+    """
+
+    event: str
+    subject: str
+    method: str
+    url: str
+    attempt: int
+    status: Optional[int] = None
+    duration: Optional[float] = None
+    size: Optional[int] = None
+    wait: Optional[float] = None
+    error: Optional[Exception] = None
+
+
+class Instrumentation:
+    """
+    The Instrumentation class dispatches the request events of a client to sinks.
+
+    A sink is any callable taking a RequestEvent, e.g. a Metrics object or a
+    function forwarding the events to a monitoring system. Clients skip the
+    instrumentation entirely when it has no sinks.
+    """
+
+    def __init__(self, sinks: Optional[Iterable[Callable[[RequestEvent], None]]] = None):
+        """
+        Initializes the Instrumentation class.
+
+        :param sinks: The callables receiving the events (default: None).
+        :type sinks: Optional[Iterable[Callable[[RequestEvent], None]]]
+        """
+        self.sinks = list(sinks or [])
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.sinks)
+
+    def add_sink(self, sink: Callable[[RequestEvent], None]) -> None:
+        """
+        Adds a sink receiving the events.
+
+        :param sink: The callable receiving the events.
+        :type sink: Callable[[RequestEvent], None]
+        """
+
+        self.sinks.append(sink)
+
+    def emit(self, event: str, method: str, url: str, attempt: int, **fields) -> None:
+        """
+        Sends an event to all sinks.
+
+        :param event: The type of the event: "start", "end", "retry" or "error".
+        :type event: str
+        :param method: The HTTP method of the request.
+        :type method: str
+        :param url: The URL of the request.
+        :type url: str
+        :param attempt: The number of retries already done.
+        :type attempt: int
+        :param fields: The other fields of the RequestEvent.
+        """
+
+        if not self.sinks:
+            return
+
+        request_event = RequestEvent(
+            event=event,
+            subject=Instrumentation.get_subject(url=url),
+            method=method,
+            url=url,
+            attempt=attempt,
+            **fields,
+        )
+
+        for sink in self.sinks:
+            sink(request_event)
+
+    @staticmethod
+    def get_subject(url: str) -> str:
+        """
+        Returns the endpoint subject of the URL, as used by Client.get_endpoint.
+
+        :param url: The URL of the request.
+        :type url: str
+        :return: "time-series", "retention", "reviews" or "other".
+        :rtype: str
+        """
+
+        if "/time-series" in url:
+            return "time-series"
+
+        if "/data/retention" in url:
+            return "retention"
+
+        if "/reviews" in url:
+            return "reviews"
+
+        return "other"
+
+
+class Histogram:
+    """
+    A latency histogram with fixed buckets in seconds.
+    """
+
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(self, buckets: Iterable[float] = BUCKETS):
+        """
+        Initializes the Histogram class.
+
+        :param buckets: The upper bounds of the buckets (default: 5 ms to 60 s).
+        :type buckets: Iterable[float]
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Records a value.
+
+        :param value: The observed value.
+        :type value: float
+        """
+
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Returns the upper bound of the bucket holding the quantile.
+
+        :param q: The quantile between 0 and 1.
+        :type q: float
+        :return: The bucket bound, infinity for the overflow bucket, None when empty.
+        :rtype: Optional[float]
+        """
+
+        if self.count == 0:
+            return None
+
+        rank = q * self.count
+        seen = 0
+
+        for position, count in enumerate(self.counts):
+            seen += count
+
+            if seen >= rank and count:
+                return self.buckets[position] if position < len(self.buckets) else float("inf")
+
+        return float("inf")
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": dict(zip([*self.buckets, float("inf")], self.counts)),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class Metrics:
+    """
+    A sink keeping request counters and latency histograms per endpoint subject.
+    """
+
+    def __init__(self, buckets: Iterable[float] = Histogram.BUCKETS):
+        """
+        Initializes the Metrics class.
+
+        :param buckets: The upper bounds of the latency buckets (default: 5 ms to 60 s).
+        :type buckets: Iterable[float]
+        """
+        self.buckets = tuple(buckets)
+        self.__subjects: Dict[str, dict] = {}
+        self.__lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent) -> None:
+
+        with self.__lock:
+            subject = self.__subjects.get(event.subject)
+
+            if subject is None:
+                subject = self.__subjects[event.subject] = {
+                    "requests": 0,
+                    "responses": {},
+                    "retries": 0,
+                    "throttled": 0,
+                    "errors": 0,
+                    "bytes": 0,
+                    "latency": Histogram(buckets=self.buckets),
+                    "first_at": time.monotonic(),
+                    "last_at": None,
+                }
+
+            if event.event == "start":
+                subject["requests"] += 1
+
+            elif event.event == "end":
+                subject["responses"][event.status] = subject["responses"].get(event.status, 0) + 1
+                subject["throttled"] += event.status == 429
+                subject["bytes"] += event.size or 0
+                subject["latency"].observe(event.duration)
+                subject["last_at"] = time.monotonic()
+
+            elif event.event == "retry":
+                subject["retries"] += 1
+
+            elif event.event == "error":
+                subject["errors"] += 1
+
+    @property
+    def subjects(self) -> List[str]:
+        return list(self.__subjects)
+
+    def snapshot(self) -> dict:
+        """
+        Returns the current metrics per endpoint subject.
+
+        :return: The counters, the latency histogram and the throughput in
+            responses per second of every subject.
+        :rtype: dict
+        """
+
+        with self.__lock:
+            snapshot = {}
+
+            for name, subject in self.__subjects.items():
+                responses = sum(subject["responses"].values())
+                elapsed = (subject["last_at"] or subject["first_at"]) - subject["first_at"]
+
+                snapshot[name] = {
+                    "requests": subject["requests"],
+                    "responses": dict(subject["responses"]),
+                    "retries": subject["retries"],
+                    "throttled": subject["throttled"],
+                    "errors": subject["errors"],
+                    "bytes": subject["bytes"],
+                    "latency": subject["latency"].to_dict(),
+                    "throughput": responses / elapsed if elapsed > 0 else None,
+                }
+
+            return snapshot
+
+    def reset(self) -> None:
+        """
+        Removes all recorded metrics.
+        """
+
+        with self.__lock:
+            self.__subjects.clear()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+import random
+import threading
+import email.utils
+from collections import deque
+from typing import Iterable, Optional
+
+
+class RateLimiter:
+    """
+    A client-wide rate limit controller shared by all requests of a client.
+
+    Requests are paced by a token bucket. The bucket starts unlimited unless
+    `rate` is given; the first 429 response sets its rate to half of the
+    throughput observed just before, every further 429 halves it again, and
+    every successful request raises it by `increase` requests per second.
+    A Retry-After header blocks all requests of the client until it passes.
+    Failed requests with a retryable status or a connection error are retried
+    with jittered exponential backoff.
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: int = 10,
+        min_rate: float = 0.2,
+        max_rate: Optional[float] = None,
+        increase: float = 0.05,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        retry_statuses: Iterable[int] = RETRY_STATUSES,
+    ):
+        """
+        Initializes the RateLimiter class.
+
+        :param rate: The initial rate in requests per second, None for unlimited (default: None).
+        :type rate: Optional[float]
+        :param burst: The capacity of the token bucket (default: 10).
+        :type burst: int
+        :param min_rate: The lowest rate the limiter adapts down to (default: 0.2).
+        :type min_rate: float
+        :param max_rate: The highest rate the limiter adapts up to (default: None).
+        :type max_rate: Optional[float]
+        :param increase: The rate increase after every successful request (default: 0.05).
+        :type increase: float
+        :param max_retries: The maximum number of retries of one request (default: 5).
+        :type max_retries: int
+        :param backoff_base: The base of the exponential backoff in seconds (default: 1.0).
+        :type backoff_base: float
+        :param backoff_max: The maximum backoff in seconds (default: 60.0).
+        :type backoff_max: float
+        :param retry_statuses: The HTTP status codes to retry (default: 429 and 5xx gateway errors).
+        :type retry_statuses: Iterable[int]
+        """
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+        self.__lock = threading.Lock()
+        self.__tokens = float(burst)
+        self.__updated_at = time.monotonic()
+        self.__blocked_until = 0.0
+        self.__history = deque(maxlen=100)
+
+    def acquire(self) -> float:
+        """
+        Takes a token for one request.
+
+        :return: The number of seconds the caller has to wait before sending the request.
+        :rtype: float
+        """
+
+        with self.__lock:
+            now = time.monotonic()
+            wait = 0.0
+
+            if self.rate is not None:
+                self.__tokens = min(
+                    float(self.burst),
+                    self.__tokens + (now - self.__updated_at) * self.rate,
+                )
+                self.__tokens -= 1
+
+                if self.__tokens < 0:
+                    wait = -self.__tokens / self.rate
+
+            self.__updated_at = now
+            wait = max(wait, self.__blocked_until - now)
+            self.__history.append(now + wait)
+
+            return wait
+
+    def on_success(self) -> None:
+        """
+        Records a successful request and raises the rate.
+        """
+
+        with self.__lock:
+            if self.rate is not None:
+                self.rate += self.increase
+
+                if self.max_rate is not None:
+                    self.rate = min(self.rate, self.max_rate)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """
+        Records a 429 response and lowers the rate.
+
+        :param retry_after: The delay requested by the Retry-After header in seconds.
+        :type retry_after: Optional[float]
+        """
+
+        with self.__lock:
+            now = time.monotonic()
+
+            if self.rate is None:
+                self.rate = self._get_observed_rate(now=now)
+
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.__tokens = min(self.__tokens, 0.0)
+
+            if retry_after is not None:
+                self.__blocked_until = max(self.__blocked_until, now + retry_after)
+
+    def should_retry(self, status_code: Optional[int], attempt: int) -> bool:
+        """
+        Returns whether the request should be retried.
+
+        :param status_code: The HTTP status code, None for a connection error.
+        :type status_code: Optional[int]
+        :param attempt: The number of retries already done.
+        :type attempt: int
+        :return: True if the request should be retried.
+        :rtype: bool
+        """
+
+        if attempt >= self.max_retries:
+            return False
+
+        return status_code is None or status_code in self.retry_statuses
+
+    def get_backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Returns the delay before the next retry.
+
+        :param attempt: The number of retries already done.
+        :type attempt: int
+        :param retry_after: The delay requested by the Retry-After header in seconds.
+        :type retry_after: Optional[float]
+        :return: The delay in seconds.
+        :rtype: float
+        """
+
+        if retry_after is not None:
+            return retry_after
+
+        # Full jitter keeps concurrent workers from retrying in lockstep.
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """
+        Parses the Retry-After header.
+
+        :param value: The header value, either seconds or an HTTP date.
+        :type value: Optional[str]
+        :return: The delay in seconds or None.
+        :rtype: Optional[float]
+        """
+
+        if not value:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            date = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        return max(0.0, date.timestamp() - time.time())
+
+    def _get_observed_rate(self, now: float) -> float:
+        """
+        Returns the request rate observed over the recent requests.
+
+        :param now: The current monotonic time.
+        :type now: float
+        :return: The rate in requests per second.
+        :rtype: float
+        """
+
+        if len(self.__history) < 2:
+            return float(self.burst)
+
+        elapsed = max(now - self.__history[0], 1e-3)
+
+        return len(self.__history) / elapsed
@@ -0,0 +1,271 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import abc
+import sys
+import datetime as dt
+from typing import Optional
+
+
+def intern(value):
+    """
+    Returns the interned string, or the value itself when it is not a string.
+
+    :param value: The value to intern.
+    :type value: Any
+    :return: The interned value.
+    :rtype: Any
+    """
+
+    return sys.intern(value) if type(value) is str else value
+
+
+class Record(abc.ABC):
+    """
+    Base class of the compact rows emitted by the record formatters.
+
+    The rows have `__slots__` instead of a per-row dictionary, so a row costs
+    only a pointer per field. The repeated values (apps, segments, dates and
+    batch metadata) are shared objects rather than copies. `to_dict` returns
+    the row in the layout of the matching dictionary formatter.
+    """
+
+    __slots__ = ()
+
+    def to_tuple(self) -> tuple:
+        """
+        Returns the fields of the row in the order of `__slots__`.
+
+        :return: The fields.
+        :rtype: tuple
+        """
+
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    @abc.abstractmethod
+    def to_dict(self) -> dict:
+        """
+        Returns the row as a dictionary.
+
+        :return: The row.
+        :rtype: dict
+        """
+
+    def __eq__(self, other) -> bool:
+        return type(other) is type(self) and other.to_tuple() == self.to_tuple()
+
+    def __hash__(self) -> int:
+        return hash(self.to_tuple())
+
+    def __repr__(self) -> str:
+        fields = ", ".join(F"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return F"{type(self).__name__}({fields})"
+
+
+class TimeSeriesRecord(Record):
+    """
+    A time series row of Formatter.records.
+
+    `measure` is the Measure of the value, or a tuple of measures with `value`
+    holding a tuple of values in the same order for multi-measure requests.
+    """
+
+    __slots__ = (
+        "date",
+        "app_id",
+        "segmentation_name",
+        "segment",
+        "measure",
+        "value",
+        "record_month",
+        "record_create_date",
+    )
+
+    def __init__(
+        self,
+        date: dt.date,
+        app_id: str,
+        segmentation_name: str,
+        segment: str,
+        measure,
+        value,
+        record_month: Optional[int] = None,
+        record_create_date: Optional[str] = None,
+    ):
+        self.date = date
+        self.app_id = app_id
+        self.segmentation_name = segmentation_name
+        self.segment = segment
+        self.measure = measure
+        self.value = value
+        self.record_month = record_month
+        self.record_create_date = record_create_date
+
+    def to_dict(self) -> dict:
+        """
+        Returns the row in the layout of Formatter.run.
+
+        :return: The row.
+        :rtype: dict
+        """
+
+        out = {
+            "date": self.date.isoformat(),
+            "app_id": self.app_id,
+            "segmentation_name": self.segmentation_name,
+            "segment": self.segment,
+        }
+
+        if isinstance(self.measure, tuple):
+            out.update(zip(self.measure, self.value))
+        else:
+            out[self.measure] = self.value
+
+        out["__record_month"] = self.record_month
+        out["__record_create_date"] = self.record_create_date
+
+        return out
+
+
+class RetentionRecord(Record):
+    """
+    A retention cell of Formatter.retention_records.
+    """
+
+    __slots__ = (
+        "purchased_at",
+        "date",
+        "app_id",
+        "segmentation_name",
+        "segment",
+        "percentage",
+        "count",
+    )
+
+    def __init__(
+        self,
+        purchased_at: dt.datetime,
+        date: dt.datetime,
+        app_id: str,
+        segmentation_name: str,
+        segment: str,
+        percentage: Optional[float],
+        count: Optional[float],
+    ):
+        self.purchased_at = purchased_at
+        self.date = date
+        self.app_id = app_id
+        self.segmentation_name = segmentation_name
+        self.segment = segment
+        self.percentage = percentage
+        self.count = count
+
+    def to_dict(self) -> dict:
+        """
+        Returns the cell in the layout of Formatter.retentions.
+
+        :return: The cell.
+        :rtype: dict
+        """
+
+        return {
+            "purchasedAt": self.purchased_at,
+            "date": self.date,
+            "appId": self.app_id,
+            "segmentationName": self.segmentation_name,
+            "segment": self.segment,
+            "retentionPercentage": self.percentage,
+            "retentionCount": self.count,
+        }
+
+
+class ReviewRecord(Record):
+    """
+    A review of Formatter.review_records.
+
+    The fields below are kept in slots and the other keys of the API in the
+    `extra` dictionary; `to_dict` returns them all under the keys of the API,
+    omitting the missing ones.
+    """
+
+    __slots__ = (
+        "id",
+        "rating",
+        "title",
+        "review",
+        "nickname",
+        "store_front",
+        "app_version",
+        "created",
+        "last_modified",
+        "developer_response",
+        "extra",
+    )
+
+    # The keys of the API by field.
+    KEYS = {
+        "id": "id",
+        "rating": "rating",
+        "title": "title",
+        "review": "review",
+        "nickname": "nickname",
+        "store_front": "storeFront",
+        "app_version": "appVersionString",
+        "created": "created",
+        "last_modified": "lastModified",
+        "developer_response": "developerResponse",
+    }
+
+    # The keys of the API kept in slots.
+    API_KEYS = frozenset(KEYS.values())
+
+    def __init__(self, **fields):
+        for name in ReviewRecord.__slots__:
+            setattr(self, name, fields.get(name))
+
+    @classmethod
+    def from_review(cls, review: dict) -> "ReviewRecord":
+        """
+        Creates the record of a review of the API.
+
+        :param review: The review.
+        :type review: dict
+        :return: The record.
+        :rtype: ReviewRecord
+        """
+
+        return cls(
+            id=review.get("id"),
+            rating=review.get("rating"),
+            title=review.get("title"),
+            review=review.get("review"),
+            nickname=review.get("nickname"),
+            store_front=intern(review.get("storeFront")),
+            app_version=intern(review.get("appVersionString")),
+            created=review.get("created"),
+            last_modified=review.get("lastModified"),
+            developer_response=review.get("developerResponse"),
+            extra={
+                key: value
+                for key, value in review.items()
+                if key not in cls.API_KEYS
+            } or None,
+        )
+
+    def to_dict(self) -> dict:
+        """
+        Returns the review under the keys of the API.
+
+        :return: The review.
+        :rtype: dict
+        """
+
+        return {
+            **{
+                key: value
+                for name, key in ReviewRecord.KEYS.items()
+                for value in (getattr(self, name),)
+                if value is not None
+            },
+            **(self.extra or {}),
+        }
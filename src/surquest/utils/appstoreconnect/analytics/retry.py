@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import time
+import logging
+from typing import Optional, Tuple
+from .exceptions import AppStoreConnectAnalyticsRequestError
+from .ratelimit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class RetryState:
+    """
+    The retry, re-authentication and backoff decisions of one request.
+
+    Client and AsyncClient share the decisions and only perform the I/O
+    themselves: waiting, sending the request and resetting the session. The
+    state paces the attempts with the rate limiter and the coordinator of the
+    client, feeds the throttling back to them and emits the instrumentation
+    events of every attempt.
+    """
+
+    # Actions returned by `on_response`.
+    DONE = "done"
+    RETRY = "retry"
+    REAUTHENTICATE = "reauthenticate"
+
+    # Status codes returned when the session is no longer accepted.
+    AUTH_STATUSES = (401, 403)
+
+    def __init__(self, client, method: str, url: str, coordinate: bool = True):
+        """
+        Initializes the RetryState class.
+
+        :param client: The client sending the request, providing the `rate_limiter`,
+            `coordinator`, `instrumentation` and `identity` attributes.
+        :type client: Union[Client, AsyncClient]
+        :param method: The HTTP method of the request.
+        :type method: str
+        :param url: The URL of the request.
+        :type url: str
+        :param coordinate: Whether the state calls the coordinator of the client. The
+            coordinator may block, so AsyncClient calls it in an executor itself (default: True).
+        :type coordinate: bool
+        """
+        self.rate_limiter: RateLimiter = client.rate_limiter
+        self.coordinator = client.coordinator if coordinate else None
+        self.instrumentation = client.instrumentation
+        self.identity = client.identity
+        self.instrumented = self.instrumentation is not None and self.instrumentation.enabled
+        self.method = method
+        self.url = url
+        self.attempt = 0
+        self.reauthenticated = False
+        self.__started = None
+
+    def get_wait(self) -> float:
+        """
+        Returns the number of seconds to wait before the next attempt is sent.
+
+        :return: The wait in seconds.
+        :rtype: float
+        """
+
+        wait = self.rate_limiter.acquire()
+
+        if self.coordinator is not None:
+            wait = max(wait, self.coordinator.acquire(identity=self.identity))
+
+        return wait
+
+    def start(self) -> None:
+        """
+        Marks the start of an attempt.
+        """
+
+        if self.instrumented:
+            self._emit("start")
+            self.__started = time.perf_counter()
+
+    def on_connection_error(self, error: BaseException) -> Optional[float]:
+        """
+        Decides whether an attempt that failed to connect is retried.
+
+        :param error: The connection error.
+        :type error: BaseException
+        :return: The backoff in seconds before the next attempt, None when the
+            error is to be raised.
+        :rtype: Optional[float]
+        """
+
+        if not self.rate_limiter.should_retry(status_code=None, attempt=self.attempt):
+            if self.instrumented:
+                self._emit("error", error=error)
+
+            return None
+
+        sleep = self.rate_limiter.get_backoff(attempt=self.attempt)
+
+        if self.instrumented:
+            self._emit("retry", wait=sleep, error=error)
+
+        logger.warning("Connection error: %s. Waiting for %.1f seconds.", error, sleep)
+        self.attempt += 1
+
+        return sleep
+
+    def on_response(self, status: int, headers, size: Optional[int] = None) -> Tuple[str, float]:
+        """
+        Decides what follows a response.
+
+        :param status: The status code of the response.
+        :type status: int
+        :param headers: The headers of the response.
+        :type headers: Mapping[str, str]
+        :param size: The size of the body in bytes, None when it is not read yet (default: None).
+        :type size: Optional[int]
+        :return: DONE when the response is final, REAUTHENTICATE when the session
+            must be reset before the request is replayed at once, RETRY with the
+            backoff in seconds before the next attempt.
+        :rtype: Tuple[str, float]
+        """
+
+        if self.instrumented:
+            self._emit(
+                "end",
+                status=status,
+                duration=time.perf_counter() - self.__started,
+                size=size,
+            )
+
+        if status in RetryState.AUTH_STATUSES and not self.reauthenticated:
+            logger.warning("Session rejected with status code: %s. Re-authenticating.", status)
+            self.reauthenticated = True
+
+            if self.instrumented:
+                self._emit("retry", status=status)
+
+            return RetryState.REAUTHENTICATE, 0.0
+
+        retry_after = RateLimiter.parse_retry_after(headers.get("Retry-After"))
+
+        if status == 429:
+            self.rate_limiter.on_throttle(retry_after=retry_after)
+
+            if self.coordinator is not None:
+                self.coordinator.on_throttle(retry_after=retry_after, identity=self.identity)
+
+        if not self.rate_limiter.should_retry(status_code=status, attempt=self.attempt):
+            return RetryState.DONE, 0.0
+
+        sleep = self.rate_limiter.get_backoff(attempt=self.attempt, retry_after=retry_after)
+
+        if self.instrumented:
+            self._emit("retry", status=status, wait=sleep)
+
+        logger.warning("Request failed with status code: %s. Waiting for %.1f seconds.", status, sleep)
+        self.attempt += 1
+
+        return RetryState.RETRY, sleep
+
+    def on_failure(self, status: int, text: str) -> AppStoreConnectAnalyticsRequestError:
+        """
+        Returns the error of a final response that is not successful.
+
+        :param status: The status code of the response.
+        :type status: int
+        :param text: The body of the response.
+        :type text: str
+        :return: The error to raise.
+        :rtype: AppStoreConnectAnalyticsRequestError
+        """
+
+        if self.instrumented:
+            self._emit("error", status=status)
+
+        message = (
+            f"--> Request failed with status code: {status}. "
+            + f"Response: {text}"
+        )
+
+        logger.error(message)
+
+        return AppStoreConnectAnalyticsRequestError(message=message)
+
+    def on_success(self) -> None:
+        """
+        Feeds a successful request back to the rate limiter and the coordinator.
+        """
+
+        self.rate_limiter.on_success()
+
+        if self.coordinator is not None:
+            self.coordinator.on_success(identity=self.identity)
+
+    def _emit(self, event: str, **fields) -> None:
+        self.instrumentation.emit(event, method=self.method, url=self.url, attempt=self.attempt, **fields)
@@ -1,6 +1,11 @@
-from typing import Callable
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional
 import datetime as dt
 from .formatter import Formatter
+from .sync import StateStore
+
+logger = logging.getLogger(__name__)
 
 
 class Reviews:
@@ -8,14 +13,26 @@ class Reviews:
     The Reviews class is used to retrieve reviews from the App Store Connect API.
     """
 
-    def __init__(self, client):
+    def __init__(
+        self,
+        client,
+        max_workers: int = 4,
+        checkpoint: Optional[StateStore] = None,
+    ):
         """
         Initializes the Reviews class.
 
         :param client: The client to use for the requests.
         :type client: AppStoreConnectClient
+        :param max_workers: The maximum number of review pages fetched concurrently (default: 4).
+        :type max_workers: int
+        :param checkpoint: The store of the pagination progress. When set, an interrupted
+            fetch resumes after the last completed page (default: None).
+        :type checkpoint: Optional[StateStore]
         """
         self.client = client
+        self.max_workers = max_workers
+        self.checkpoint = checkpoint
 
     def fetch(
         self,
@@ -29,6 +46,11 @@ class Reviews:
         """
         Method to retrieve reviews of the AppStore app.
 
+        The first page tells the total number of reviews, which is used to plan
+        the remaining page indexes. The following pages are fetched up to
+        `max_workers` at a time and processed in order, so the fetch still stops
+        at the last known review or at the first review out of the date range.
+
         :param app_id: The App Store Connect app ID.
         :type app_id: str
         :param start_date: The start date for the reviews.
@@ -42,50 +64,427 @@ class Reviews:
         :rtype: dict
         """
 
+        key = self._get_checkpoint_key(
+            app_id=app_id,
+            start_date=start_date,
+            end_date=end_date,
+            country=country,
+            last_known_review_id=last_known_review_id,
+        )
+
         # Output variable with all reviews
-        reviews = []
-        reviews_count = 0
-        has_next = True
-        index = 0
+        state, reviews = self._load_checkpoint(key=key)
+
+        for page_reviews in self._iter_pages(
+            key=key,
+            state=state,
+            app_id=app_id,
+            start_date=start_date,
+            end_date=end_date,
+            country=country,
+            last_known_review_id=last_known_review_id,
+        ):
+            reviews.extend(page_reviews)
+
+        self._clear_checkpoint(key=key, state=state)
+
+        return state.get("reviews_count"), formatter(data=reviews)
+
+    def iter_reviews(
+        self,
+        app_id: str,
+        start_date: dt.datetime = dt.datetime(2020, 1, 1),
+        end_date: dt.datetime = dt.datetime(2050, 12, 31),
+        country: str | None = None,
+        last_known_review_id: int | None = None,
+    ) -> Iterator[dict]:
+        """
+        Method to iterate over reviews of the AppStore app page by page.
+
+        Only the reviews of the pages in flight are kept in memory. With a
+        checkpoint, a page is marked as completed once all its reviews were
+        consumed, and an interrupted iteration resumes after that page.
+
+        :param app_id: The App Store Connect app ID.
+        :type app_id: str
+        :param start_date: The start date for the reviews.
+        :type start_date: dt.date
+        :param end_date: The end date for the reviews.
+        :type end_date: dt.date
+
+        :return: The reviews, newest first.
+        :rtype: Iterator[dict]
+        """
+
+        key = self._get_checkpoint_key(
+            app_id=app_id,
+            start_date=start_date,
+            end_date=end_date,
+            country=country,
+            last_known_review_id=last_known_review_id,
+        )
+
+        state, _ = self._load_checkpoint(key=key, load_reviews=False)
+
+        for page_reviews in self._iter_pages(
+            key=key,
+            state=state,
+            app_id=app_id,
+            start_date=start_date,
+            end_date=end_date,
+            country=country,
+            last_known_review_id=last_known_review_id,
+        ):
+            yield from page_reviews
+
+        self._clear_checkpoint(key=key, state=state)
+
+    def _iter_pages(
+        self,
+        key: str,
+        state: dict,
+        app_id: str,
+        start_date: dt.datetime,
+        end_date: dt.datetime,
+        country: str | None,
+        last_known_review_id: int | None,
+    ) -> Iterator[list]:
+        """
+        Requests the review pages and yields the kept reviews of every page in order.
+
+        The progress is checkpointed after the reviews of a page were consumed. One
+        thread pool of `max_workers` threads serves all pages of the fetch.
+
+        :param key: The checkpoint key of the fetch.
+        :type key: str
+        :param state: The pagination state, updated in place.
+        :type state: dict
+        :param app_id: The App Store Connect app ID.
+        :type app_id: str
+        :param start_date: The start date for the reviews.
+        :type start_date: dt.datetime
+        :param end_date: The end date for the reviews.
+        :type end_date: dt.datetime
+        :param country: The storefront to retrieve reviews for.
+        :type country: str | None
+        :param last_known_review_id: The ID of the last already known review.
+        :type last_known_review_id: int | None
+
+        :return: The kept reviews of every page.
+        :rtype: Iterator[list]
+        """
 
         unix_start_date = int(start_date.timestamp()) * 1000
         unix_end_date = int(end_date.timestamp()) * 1000
 
-        while has_next is True:
-            # Get the endpoint for the request.
-            url = self.client.get_endpoint(
-                subject="reviews",
-            ).format(app_id=app_id, index=index)
+        has_next = not state.get("done")
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+
+            while has_next is True:
+                indexes = self._get_page_indexes(state=state)
+
+                pages = self._request_pages(
+                    urls=[self._get_url(app_id=app_id, index=index, country=country) for index in indexes],
+                    executor=executor,
+                )
+
+                for index, data in zip(indexes, pages):
+                    page_reviews = []
 
-            if country is not None:
-                url += f"&storefront={country}"
+                    has_next = self._process_page(
+                        state=state,
+                        index=index,
+                        data=data,
+                        reviews=page_reviews,
+                        unix_start_date=unix_start_date,
+                        unix_end_date=unix_end_date,
+                        last_known_review_id=last_known_review_id,
+                    )
+
+                    yield page_reviews
+
+                    self._save_checkpoint(key=key, state=state, index=index, reviews=page_reviews)
+
+                    if has_next is False:
+                        break
+
+    def _request_pages(self, urls: list, executor: ThreadPoolExecutor) -> Iterable[dict]:
+        """
+        Requests the review pages concurrently.
+
+        The pages are yielded in order as soon as they arrive, so the pages before a
+        failed one are still processed and checkpointed.
+
+        :param urls: The URLs of the review pages.
+        :type urls: list
+        :param executor: The thread pool of the fetch.
+        :type executor: ThreadPoolExecutor
+
+        :return: The data of the review pages in the order of the URLs.
+        :rtype: Iterable[dict]
+        """
+        if len(urls) == 1:
+            return [self.client.request(url=urls[0], method="GET").get("data")]
+
+        return (
+            response.get("data")
+            for response in executor.map(lambda url: self.client.request(url=url, method="GET"), urls)
+        )
+
+    def _get_page_indexes(self, state: dict) -> list:
+        """
+        Returns the indexes of the next review pages to request.
+
+        Until the first page is known only one page is requested. Afterwards up
+        to `max_workers` pages are requested, but never past the last page.
+
+        :param state: The pagination state.
+        :type state: dict
+
+        :return: The page indexes.
+        :rtype: list
+        """
+        index = state.get("next_index")
+        last_index = index
 
-            # Do the request.
-            data = self.client.request(url=url, method="GET").get("data")
+        if state.get("page_size"):
+            pages = -(-(state.get("reviews_count") or 0) // state.get("page_size"))
+            last_index = max(index, min(index + max(1, self.max_workers), pages) - 1)
 
-            # Set total reviews count
-            reviews_count = data.get("reviewCount")
+        return list(range(index, last_index + 1))
 
-            # loop in reviews and check if the review is in the date range
-            # or if the review is the last known review
-            for item in data.get("reviews"):
+    def _process_page(
+        self,
+        state: dict,
+        index: int,
+        data: dict,
+        reviews: list,
+        unix_start_date: int,
+        unix_end_date: int,
+        last_known_review_id: int | None = None,
+    ) -> bool:
+        """
+        Collects the reviews of one page and advances the pagination state.
+
+        :param state: The pagination state.
+        :type state: dict
+        :param index: The index of the reviews page.
+        :type index: int
+        :param data: The data of the reviews page.
+        :type data: dict
+        :param reviews: The list to append the reviews to.
+        :type reviews: list
+        :param unix_start_date: The start of the date range in milliseconds.
+        :type unix_start_date: int
+        :param unix_end_date: The end of the date range in milliseconds.
+        :type unix_end_date: int
+        :param last_known_review_id: The ID of the last already known review.
+        :type last_known_review_id: int | None
+
+        :return: True if the next page should be requested.
+        :rtype: bool
+        """
+        # Set total reviews count
+        state["reviews_count"] = data.get("reviewCount")
+
+        if not state.get("page_size"):
+            state["page_size"] = len(data.get("reviews") or [])
+
+        has_next = self._collect(
+            data=data,
+            reviews=reviews,
+            unix_start_date=unix_start_date,
+            unix_end_date=unix_end_date,
+            last_known_review_id=last_known_review_id,
+        )
+
+        state["next_index"] = index + 1
+
+        if not data.get("reviews"):
+            has_next = False
+
+        if state.get("page_size") and state.get("next_index") * state.get("page_size") >= (state.get("reviews_count") or 0):
+            has_next = False
+
+        state["done"] = not has_next
+
+        return has_next
+
+    @staticmethod
+    def _get_checkpoint_key(
+        app_id: str,
+        start_date: dt.datetime,
+        end_date: dt.datetime,
+        country: str | None,
+        last_known_review_id: int | None,
+    ) -> str:
+        """
+        Returns the checkpoint key of the fetch.
+
+        :param app_id: The App Store Connect app ID.
+        :type app_id: str
+        :param start_date: The start date for the reviews.
+        :type start_date: dt.datetime
+        :param end_date: The end date for the reviews.
+        :type end_date: dt.datetime
+        :param country: The storefront to retrieve reviews for.
+        :type country: str | None
+        :param last_known_review_id: The ID of the last already known review.
+        :type last_known_review_id: int | None
+
+        :return: The checkpoint key.
+        :rtype: str
+        """
+        return "|".join([
+            "reviews",
+            str(app_id),
+            str(country),
+            str(int(start_date.timestamp())),
+            str(int(end_date.timestamp())),
+            str(last_known_review_id),
+        ])
+
+    def _load_checkpoint(self, key: str, load_reviews: bool = True) -> tuple:
+        """
+        Returns the pagination state and the reviews of the completed pages.
+
+        :param key: The checkpoint key of the fetch.
+        :type key: str
+        :param load_reviews: Whether to load the reviews of the completed pages (default: True).
+        :type load_reviews: bool
+
+        :return: The pagination state and the list of reviews.
+        :rtype: tuple
+        """
+        state = {"next_index": 0, "reviews_count": 0, "page_size": None, "done": False}
+        reviews = []
+
+        if self.checkpoint is None:
+            return state, reviews
+
+        state = self.checkpoint.get(key) or state
+
+        if load_reviews is False:
+            return state, reviews
+
+        for index in range(state.get("next_index")):
+            page = self.checkpoint.get(f"{key}|{index}")
+
+            if page is not None:
+                reviews.extend(page.get("reviews"))
+
+        return state, reviews
+
+    def _save_checkpoint(self, key: str, state: dict, index: int, reviews: list) -> None:
+        """
+        Stores the reviews of the completed page and the pagination state.
+
+        :param key: The checkpoint key of the fetch.
+        :type key: str
+        :param state: The pagination state.
+        :type state: dict
+        :param index: The index of the completed page.
+        :type index: int
+        :param reviews: The reviews kept from the completed page.
+        :type reviews: list
+        """
+        if self.checkpoint is None:
+            return
+
+        if reviews:
+            self.checkpoint.set(f"{key}|{index}", {"reviews": reviews})
+
+        self.checkpoint.set(key, state)
+
+    def _clear_checkpoint(self, key: str, state: dict) -> None:
+        """
+        Removes the checkpoint of the finished fetch.
+
+        :param key: The checkpoint key of the fetch.
+        :type key: str
+        :param state: The pagination state.
+        :type state: dict
+        """
+        if self.checkpoint is None:
+            return
+
+        for index in range(state.get("next_index")):
+            self.checkpoint.delete(f"{key}|{index}")
+
+        self.checkpoint.delete(key)
+
+    def _get_url(self, app_id: str, index: int, country: str | None = None) -> str:
+        """
+        Returns the URL of the reviews page.
+
+        :param app_id: The App Store Connect app ID.
+        :type app_id: str
+        :param index: The index of the reviews page.
+        :type index: int
+        :param country: The storefront to retrieve reviews for.
+        :type country: str | None
+
+        :return: The URL of the reviews page.
+        :rtype: str
+        """
+        url = self.client.get_endpoint(
+            subject="reviews",
+        ).format(app_id=app_id, index=index)
+
+        if country is not None:
+            url += f"&storefront={country}"
+
+        return url
+
+    @staticmethod
+    def _collect(
+        data: dict,
+        reviews: list,
+        unix_start_date: int,
+        unix_end_date: int,
+        last_known_review_id: int | None = None,
+    ) -> bool:
+        """
+        Appends the reviews of one page to the list of reviews.
+
+        :param data: The data of the reviews page.
+        :type data: dict
+        :param reviews: The list to append the reviews to.
+        :type reviews: list
+        :param unix_start_date: The start of the date range in milliseconds.
+        :type unix_start_date: int
+        :param unix_end_date: The end of the date range in milliseconds.
+        :type unix_end_date: int
+        :param last_known_review_id: The ID of the last already known review.
+        :type last_known_review_id: int | None
+
+        :return: True if the next page should be requested.
+        :rtype: bool
+        """
+        has_next = True
+        # Checked once per page, so the loop below builds no log records when debug is off.
+        debug = logger.isEnabledFor(logging.DEBUG)
 
-                review = item.get("value")
-                print("-> review:", review)
+        # loop in reviews and check if the review is in the date range
+        # or if the review is the last known review
+        for item in data.get("reviews"):
 
-                if int(review.get("id")) == last_known_review_id:
-                    print("--> excluding due to last_known_review_id")
-                    has_next = False
-                    break
+            review = item.get("value")
+            if debug:
+                logger.debug("Review: %s", review)
 
-                if unix_start_date <= int(review.get("lastModified")) < unix_end_date:
-                    reviews.append(review)
+            if int(review.get("id")) == last_known_review_id:
+                logger.debug("Excluding review %s: last known review.", review.get("id"))
+                has_next = False
+                break
 
-                else:
-                    print("--> excluding due to date range")
-                    has_next = False
+            if unix_start_date <= int(review.get("lastModified")) < unix_end_date:
+                reviews.append(review)
 
-            if has_next is True:
-                index += 1
+            else:
+                if debug:
+                    logger.debug("Excluding review %s: outside of the date range.", review.get("id"))
+                has_next = False
 
-        return reviews_count, formatter(data=reviews)
+        return has_next
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """
+    A call in flight and its outcome.
+    """
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one call.
+
+    The first caller of a key runs the function, the callers arriving while it
+    runs wait for it and receive the same result, or the same exception. The key
+    is forgotten as soon as the call ends, so results are never reused by later
+    calls; caching them is left to Cache. The results are shared between the
+    callers and must not be mutated.
+
+    One instance can be shared by several Analytics objects and threads.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, function: Callable[[], Any]) -> Any:
+        """
+        Runs the function unless a call with the same key is in flight, then waits for it.
+
+        :param key: The key identifying the call, e.g. Cache.get_key of the request.
+        :type key: str
+        :param function: The function to run.
+        :type function: Callable[[], Any]
+        :return: The result of the function.
+        :rtype: Any
+        """
+
+        with self.__lock:
+            call = self.__calls.get(key)
+            leader = call is None
+
+            if leader:
+                call = self.__calls[key] = _Call()
+
+        if not leader:
+            logger.debug("Joining the call in flight: %s", key)
+            call.done.wait()
+
+            if call.error is not None:
+                raise call.error
+
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self.__lock:
+                del self.__calls[key]
+
+            call.done.set()
+
+        return call.result
+
+    def __len__(self) -> int:
+        return len(self.__calls)
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces concurrent coroutine calls with the same key into one task.
+
+    The first caller of a key starts the task, every caller awaits it shielded, so
+    a cancelled caller leaves the task running for the others. The task is
+    cancelled once all of its callers are cancelled. The results are shared between
+    the callers and must not be mutated.
+
+    One instance can be shared by several AsyncAnalytics objects of one event loop.
+    """
+
+    def __init__(self):
+        self.__tasks: Dict[str, asyncio.Future] = {}
+        self.__waiters: Dict[str, int] = {}
+
+    async def do(self, key: str, function: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Runs the coroutine function unless a call with the same key is in flight, then awaits it.
+
+        :param key: The key identifying the call, e.g. Cache.get_key of the request.
+        :type key: str
+        :param function: The coroutine function to run.
+        :type function: Callable[[], Awaitable[Any]]
+        :return: The result of the coroutine.
+        :rtype: Any
+        """
+
+        task = self.__tasks.get(key)
+
+        if task is None:
+            task = self.__tasks[key] = asyncio.ensure_future(function())
+            self.__waiters[key] = 0
+            task.add_done_callback(lambda done: self._forget(key=key, task=done))
+        else:
+            logger.debug("Joining the call in flight: %s", key)
+
+        self.__waiters[key] += 1
+
+        try:
+            return await asyncio.shield(task)
+
+        except asyncio.CancelledError:
+            if not task.done() and self.__tasks.get(key) is task:
+                self.__waiters[key] -= 1
+
+                # The last caller is gone, so nobody awaits the result anymore.
+                if self.__waiters[key] == 0:
+                    self._forget(key=key, task=task)
+                    task.cancel()
+
+            raise
+
+    def _forget(self, key: str, task: asyncio.Future) -> None:
+
+        if self.__tasks.get(key) is task:
+            del self.__tasks[key]
+            del self.__waiters[key]
+
+        # Mark the exception as retrieved when every caller was cancelled.
+        if task.done() and not task.cancelled():
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self.__tasks)
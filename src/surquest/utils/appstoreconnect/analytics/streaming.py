@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import re
+import json
+from typing import Any, Callable, Iterable, Iterator, Optional
+from .decoder import JSONDecoder
+
+# Marks an array on the stack of the containers enclosing the parser position.
+_ARRAY = object()
+
+
+class JSONArrayStream:
+    """
+    An incremental parser yielding the elements of one array of a JSON document.
+
+    The array is addressed by the dot separated keys of the objects enclosing
+    it, e.g. "results" or "data.reviews". The document is fed chunk by chunk
+    and every element is decoded as soon as its last byte arrives, so only the
+    bytes of the element being received are buffered. The rest of the document
+    is scanned but not decoded.
+    """
+
+    # Structural characters outside of the target array.
+    STRUCTURE = re.compile(rb'["{}\[\]:]')
+
+    # Everything up to the next bracket outside of a string, skipping complete strings at once.
+    CONTENT = re.compile(rb'[^"{}\[\]]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"{}\[\]]*)*')
+
+    # The rest of a string after its opening quote.
+    STRING_END = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+
+    # The end of a scalar element.
+    SCALAR_END = re.compile(rb"[,\]\s]")
+
+    SKIP = re.compile(rb"[\s,]*")
+
+    def __init__(self, path: str, decoder: Optional[Callable[[bytes], Any]] = None):
+        """
+        Initializes the JSONArrayStream class.
+
+        :param path: The dot separated keys of the objects enclosing the array.
+        :type path: str
+        :param decoder: The callable decoding the elements (default: a JSONDecoder).
+        :type decoder: Optional[Callable[[bytes], Any]]
+        """
+        self.path = path.split(".")
+        self.decoder = decoder if decoder is not None else JSONDecoder()
+        self.finished = False
+        self.__buffer = bytearray()
+        self.__position = 0
+        self.__stack = []
+        self.__string = None
+        self.__in_array = False
+        self.__element_start = None
+        self.__depth = 0
+
+    def feed(self, chunk: bytes) -> Iterator[Any]:
+        """
+        Parses the next chunk of the document.
+
+        :param chunk: The next bytes of the document.
+        :type chunk: bytes
+        :return: The elements completed by the chunk.
+        :rtype: Iterator[Any]
+        """
+
+        if self.finished:
+            return
+
+        self.__buffer += chunk
+
+        yield from self._parse()
+
+        # Drop the parsed bytes, keeping the element and the string being received.
+        start = self.__position if self.__element_start is None else self.__element_start
+
+        if start:
+            del self.__buffer[:start]
+            self.__position -= start
+
+            if self.__element_start is not None:
+                self.__element_start -= start
+
+    def _parse(self) -> Iterator[Any]:
+
+        buffer = self.__buffer
+
+        while not self.finished:
+
+            if self.__element_start is not None:
+                end = self._find_element_end()
+
+                if end is None:
+                    return
+
+                yield self.decoder(bytes(buffer[self.__element_start:end]))
+
+                self.__element_start = None
+                self.__position = end
+
+            elif self.__in_array:
+                position = JSONArrayStream.SKIP.match(buffer, self.__position).end()
+
+                if position >= len(buffer):
+                    self.__position = position
+                    return
+
+                if buffer[position] == ord("]"):
+                    self.finished = True
+                    self.__position = position + 1
+                    return
+
+                self.__element_start = self.__position = position
+                self.__depth = 0
+
+            else:
+                match = JSONArrayStream.STRUCTURE.search(buffer, self.__position)
+
+                if match is None:
+                    self.__position = len(buffer)
+                    return
+
+                char = buffer[match.start()]
+
+                if char == ord('"'):
+                    string = JSONArrayStream.STRING_END.match(buffer, match.end())
+
+                    if string is None:
+                        # Wait for the rest of the string.
+                        self.__position = match.start()
+                        return
+
+                    self.__string = bytes(buffer[match.start():string.end()])
+                    self.__position = string.end()
+                    continue
+
+                self.__position = match.end()
+
+                if char == ord(":"):
+                    self.__stack[-1] = json.loads(self.__string)
+
+                elif char == ord("{"):
+                    self.__stack.append(None)
+
+                elif char == ord("["):
+                    if self.__stack == self.path:
+                        self.__in_array = True
+                    else:
+                        self.__stack.append(_ARRAY)
+
+                elif self.__stack:
+                    self.__stack.pop()
+
+    def _find_element_end(self) -> Optional[int]:
+        """
+        Returns the position after the element being received, None if it is incomplete.
+        """
+
+        buffer = self.__buffer
+        start = self.__element_start
+        first = buffer[start]
+
+        if first not in b'{["':
+            match = JSONArrayStream.SCALAR_END.search(buffer, start)
+            return None if match is None else match.start()
+
+        if first == ord('"'):
+            match = JSONArrayStream.STRING_END.match(buffer, start + 1)
+            return None if match is None else match.end()
+
+        # Resume the scan where the previous chunk ended.
+        position = max(self.__position, start)
+        length = len(buffer)
+        depth = self.__depth
+
+        while True:
+            position = JSONArrayStream.CONTENT.match(buffer, position).end()
+
+            # The rest of the buffer is content or an incomplete string.
+            if position >= length or buffer[position] == 34:
+                self.__position = position
+                self.__depth = depth
+                return None
+
+            if buffer[position] in b"{[":
+                depth += 1
+            else:
+                depth -= 1
+
+            position += 1
+
+            if depth == 0:
+                self.__depth = depth
+                return position
+
+
+def iter_array(
+    chunks: Iterable[bytes],
+    path: str,
+    decoder: Optional[Callable[[bytes], Any]] = None,
+) -> Iterator[Any]:
+    """
+    Yields the elements of one array of a JSON document received in chunks.
+
+    :param chunks: The chunks of the document.
+    :type chunks: Iterable[bytes]
+    :param path: The dot separated keys of the objects enclosing the array.
+    :type path: str
+    :param decoder: The callable decoding the elements (default: a JSONDecoder).
+    :type decoder: Optional[Callable[[bytes], Any]]
+    :return: The decoded elements.
+    :rtype: Iterator[Any]
+    """
+
+    stream = JSONArrayStream(path=path, decoder=decoder)
+
+    for chunk in chunks:
+        yield from stream.feed(chunk)
+
+        if stream.finished:
+            return
@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import abc
+import json
+import sqlite3
+import threading
+import datetime as dt
+from typing import Optional
+from .enums import Measure, Group, Frequency
+
+
+class StateStore(abc.ABC):
+    """
+    Base class of the stores keeping the state of the incremental sync.
+    """
+
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Returns the state stored under the key.
+
+        :param key: The key of the series.
+        :type key: str
+        :return: The state or None.
+        :rtype: Optional[dict]
+        """
+
+    @abc.abstractmethod
+    def set(self, key: str, state: dict) -> None:
+        """
+        Stores the state under the key.
+
+        :param key: The key of the series.
+        :type key: str
+        :param state: The state to store.
+        :type state: dict
+        """
+
+    @abc.abstractmethod
+    def delete(self, key: str) -> None:
+        """
+        Removes the state stored under the key.
+
+        :param key: The key of the series.
+        :type key: str
+        """
+
+
+class MemoryStateStore(StateStore):
+    """
+    A state store kept in memory, mostly useful for tests.
+    """
+
+    def __init__(self):
+        self.__states = {}
+
+    def get(self, key: str) -> Optional[dict]:
+        state = self.__states.get(key)
+        return None if state is None else json.loads(state)
+
+    def set(self, key: str, state: dict) -> None:
+        self.__states[key] = json.dumps(state)
+
+    def delete(self, key: str) -> None:
+        self.__states.pop(key, None)
+
+
+class SQLiteStateStore(StateStore):
+    """
+    A state store persisted in a SQLite database.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initializes the SQLiteStateStore class.
+
+        :param path: The path of the SQLite database file.
+        :type path: str
+        """
+        self.path = path
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS watermarks (key TEXT PRIMARY KEY, state TEXT NOT NULL)"
+        )
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+
+        self.__connection.close()
+
+    def get(self, key: str) -> Optional[dict]:
+
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT state FROM watermarks WHERE key = ?", (key,)
+            ).fetchone()
+
+        return None if row is None else json.loads(row[0])
+
+    def set(self, key: str, state: dict) -> None:
+
+        with self.__lock:
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO watermarks (key, state) VALUES (?, ?)",
+                (key, json.dumps(state, separators=(",", ":"))),
+            )
+
+    def delete(self, key: str) -> None:
+
+        with self.__lock:
+            self.__connection.execute("DELETE FROM watermarks WHERE key = ?", (key,))
+
+
+class IncrementalSync:
+    """
+    The IncrementalSync class fetches only the new part of time series.
+
+    For every (app, measure, grouping, frequency) series the store keeps the
+    date of the last fetched record, the high-water mark. The next sync starts
+    `lookback` periods before the high-water mark, because Apple restates the
+    most recent days, and returns only the rows that are new or changed.
+    """
+
+    def __init__(self, analytics, store: StateStore, lookback: int = 3):
+        """
+        Initializes the IncrementalSync class.
+
+        :param analytics: The analytics object to use for the requests.
+        :type analytics: Analytics
+        :param store: The store of the high-water marks.
+        :type store: StateStore
+        :param lookback: The number of periods re-fetched before the high-water mark (default: 3).
+        :type lookback: int
+        """
+        self.analytics = analytics
+        self.store = store
+        self.lookback = lookback
+
+    @staticmethod
+    def get_key(
+        app_id: str,
+        measure: Measure,
+        grouping: Group = Group.TOTAL,
+        frequency: Frequency = Frequency.DAY,
+    ) -> str:
+        """
+        Returns the key of the series in the state store.
+
+        :param app_id: The App Store Connect app ID.
+        :type app_id: str
+        :param measure: The measure of the series.
+        :type measure: Measure
+        :param grouping: The grouping of the series.
+        :type grouping: Group
+        :param frequency: The frequency of the series.
+        :type frequency: Frequency
+        :return: The key of the series.
+        :rtype: str
+        """
+
+        return "|".join([str(app_id), measure.value, grouping.name, frequency.value])
+
+    def sync(
+        self,
+        app_id: str,
+        measure: Measure,
+        end_date: dt.date,
+        start_date: Optional[dt.date] = None,
+        grouping: Group = Group.TOTAL,
+        frequency: Frequency = Frequency.DAY,
+    ) -> list:
+        """
+        Fetches the series since its high-water mark and returns the new or changed rows.
+
+        :param app_id: The App Store Connect app ID.
+        :type app_id: str
+        :param measure: The measure to retrieve data for.
+        :type measure: Measure
+        :param end_date: The end date for the time series data.
+        :type end_date: dt.date
+        :param start_date: The start date of the first sync of the series. It is
+            ignored once the series has a high-water mark.
+        :type start_date: Optional[dt.date]
+        :param grouping: The grouping to retrieve data for.
+        :type grouping: Group
+        :param frequency: The frequency to retrieve data for.
+        :type frequency: Frequency
+        :return: The new or changed rows formatted by Formatter.run.
+        :rtype: list
+        """
+
+        key = self.get_key(app_id=app_id, measure=measure, grouping=grouping, frequency=frequency)
+        state = self.store.get(key) or {"watermark": None, "fingerprints": {}}
+
+        if state.get("watermark") is not None:
+            start_date = self._get_lookback_start(
+                watermark=dt.date.fromisoformat(state.get("watermark")),
+                frequency=frequency,
+            )
+
+        if start_date is None:
+            raise ValueError(f"The start_date is required for the first sync of: {key}")
+
+        if start_date > end_date:
+            return []
+
+        rows = self.analytics.get_time_series(
+            app_id=app_id,
+            measure=measure,
+            start_date=start_date,
+            end_date=end_date,
+            grouping=grouping,
+            frequency=frequency,
+        )
+
+        fingerprints = state.get("fingerprints")
+        changed = []
+
+        for row in rows:
+            row_key = "|".join([row.get("date"), str(row.get("app_id")), str(row.get("segment"))])
+            value = row.get(measure)
+
+            if row_key not in fingerprints or fingerprints.get(row_key) != value:
+                changed.append(row)
+
+            fingerprints[row_key] = value
+
+        if rows:
+            watermark = max(row.get("date") for row in rows)
+
+            if state.get("watermark") is None or watermark > state.get("watermark"):
+                state["watermark"] = watermark
+
+        # Only the rows inside the next lookback window can be restated.
+        if state.get("watermark") is not None:
+            lookback_start = self._get_lookback_start(
+                watermark=dt.date.fromisoformat(state.get("watermark")),
+                frequency=frequency,
+            ).isoformat()
+
+            state["fingerprints"] = {
+                row_key: value
+                for row_key, value in fingerprints.items()
+                if row_key[:10] >= lookback_start
+            }
+
+        self.store.set(key, state)
+
+        return changed
+
+    def _get_lookback_start(self, watermark: dt.date, frequency: Frequency) -> dt.date:
+        """
+        Returns the start date of the next sync.
+
+        :param watermark: The date of the last fetched record.
+        :type watermark: dt.date
+        :param frequency: The frequency of the series.
+        :type frequency: Frequency
+        :return: The date `lookback` periods before the high-water mark.
+        :rtype: dt.date
+        """
+
+        if frequency == Frequency.MONTH:
+            month = watermark.year * 12 + watermark.month - 1 - self.lookback
+            return dt.date(month // 12, month % 12 + 1, 1)
+
+        if frequency == Frequency.WEEK:
+            return watermark - dt.timedelta(weeks=self.lookback)
+
+        return watermark - dt.timedelta(days=self.lookback)
@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import io
+import json
+import time
+import random
+import threading
+from typing import Any, Optional, Union
+from requests import Response
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from .cache import Cache
+from .client import Client
+
+
+class RecordingTransport(HTTPAdapter):
+    """
+    A transport sending the requests to the network and recording the responses.
+
+    The recorded responses are saved with `save` and served again by
+    ReplayTransport.load. The authentication requests are not recorded, so the
+    recordings hold no credentials.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.records = []
+        self.__lock = threading.Lock()
+
+    def send(self, request, *args, **kwargs) -> Response:
+
+        response = super().send(request, *args, **kwargs)
+
+        if request.url not in (Client.WIDGET_KEY_URL, Client.SESSION_URL):
+            with self.__lock:
+                self.records.append({
+                    "method": request.method,
+                    "url": request.url,
+                    "payload": ReplayTransport.get_payload(request.body),
+                    "status": response.status_code,
+                    "body": response.text,
+                })
+
+        return response
+
+    def save(self, path: str) -> None:
+        """
+        Saves the recorded responses as a JSON file.
+
+        :param path: The path of the file.
+        :type path: str
+        """
+
+        with self.__lock, open(path, "w") as f:
+            json.dump(self.records, f)
+
+
+class ReplayTransport(BaseAdapter):
+    """
+    A transport answering the requests of a Client from canned responses.
+
+    Responses are matched by the method, the URL and the JSON payload of the
+    request, falling back to a response registered for the URL without a
+    payload. The authentication endpoints are answered with a fake widget key
+    and itctx cookie unless a response is registered for them. Every request
+    can be delayed by `latency` seconds and a `throttle_rate` share of the
+    requests is answered with 429 and a Retry-After header.
+    """
+
+    WIDGET_KEY = "replay-widget-key"
+
+    ITCTX = "replay-itctx"
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: Optional[float] = 0,
+        seed: Optional[int] = 0,
+    ):
+        """
+        Initializes the ReplayTransport class.
+
+        :param latency: The simulated latency of every request in seconds (default: 0.0).
+        :type latency: float
+        :param throttle_rate: The share of the requests answered with 429 (default: 0.0).
+        :type throttle_rate: float
+        :param retry_after: The Retry-After header of the 429 responses, None to omit it (default: 0).
+        :type retry_after: Optional[float]
+        :param seed: The seed of the throttling decisions (default: 0).
+        :type seed: Optional[int]
+        """
+        super().__init__()
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.calls = 0
+        self.throttled = 0
+        self.__responses = {}
+        self.__random = random.Random(seed)
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "ReplayTransport":
+        """
+        Creates a transport serving the responses saved by RecordingTransport.
+
+        :param path: The path of the file.
+        :type path: str
+        :param kwargs: The parameters of the ReplayTransport class.
+        :return: The transport.
+        :rtype: ReplayTransport
+        """
+
+        transport = cls(**kwargs)
+
+        with open(path) as f:
+            for record in json.load(f):
+                transport.add(
+                    url=record.get("url"),
+                    body=record.get("body"),
+                    method=record.get("method"),
+                    payload=record.get("payload"),
+                    status=record.get("status"),
+                )
+
+        return transport
+
+    def add(
+        self,
+        url: str,
+        body: Union[bytes, str, Any],
+        method: str = "POST",
+        payload: Optional[dict] = None,
+        status: int = 200,
+        headers: Optional[dict] = None,
+    ) -> None:
+        """
+        Registers the response of a request.
+
+        :param url: The URL of the request.
+        :type url: str
+        :param body: The body of the response; other values than bytes and strings are encoded as JSON.
+        :type body: Union[bytes, str, Any]
+        :param method: The HTTP method of the request (default: "POST").
+        :type method: str
+        :param payload: The JSON payload of the request, None to answer any payload (default: None).
+        :type payload: Optional[dict]
+        :param status: The status code of the response (default: 200).
+        :type status: int
+        :param headers: The headers of the response (default: None).
+        :type headers: Optional[dict]
+        """
+
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        elif not isinstance(body, bytes):
+            body = json.dumps(body, separators=(",", ":")).encode("utf-8")
+
+        self.__responses[self._get_key(method=method, url=url, payload=payload)] = (
+            status,
+            {"Content-Type": "application/json", **(headers or {})},
+            body,
+        )
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None) -> Response:
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        payload = ReplayTransport.get_payload(request.body)
+
+        with self.__lock:
+            self.calls += 1
+            throttled = (
+                request.url not in (Client.WIDGET_KEY_URL, Client.SESSION_URL)
+                and self.__random.random() < self.throttle_rate
+            )
+            self.throttled += throttled
+
+        if throttled:
+            headers = {} if self.retry_after is None else {"Retry-After": str(self.retry_after)}
+            return self._build_response(request=request, status=429, headers=headers, body=b"")
+
+        answer = (
+            self.__responses.get(self._get_key(method=request.method, url=request.url, payload=payload))
+            or self.__responses.get(self._get_key(method=request.method, url=request.url, payload=None))
+        )
+
+        if answer is None:
+            answer = self._get_auth_answer(url=request.url)
+
+        if answer is None:
+            return self._build_response(request=request, status=404, headers={}, body=b"")
+
+        status, headers, body = answer
+        response = self._build_response(request=request, status=status, headers=headers, body=body)
+
+        if request.url == Client.SESSION_URL:
+            response.cookies.set("itctx", ReplayTransport.ITCTX)
+
+        return response
+
+    def close(self) -> None:
+        pass
+
+    @staticmethod
+    def get_payload(body: Optional[Union[bytes, str]]) -> Optional[Any]:
+        """
+        Returns the decoded JSON payload of a request body.
+
+        :param body: The request body.
+        :type body: Optional[Union[bytes, str]]
+        :return: The payload or None.
+        :rtype: Optional[Any]
+        """
+
+        if not body:
+            return None
+
+        try:
+            return json.loads(body)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _get_key(method: str, url: str, payload: Optional[Any]) -> str:
+        return method + " " + Cache.get_key(url=url, payload=payload)
+
+    @staticmethod
+    def _get_auth_answer(url: str) -> Optional[tuple]:
+
+        if url == Client.WIDGET_KEY_URL:
+            return 200, {}, json.dumps({"authServiceKey": ReplayTransport.WIDGET_KEY}).encode("utf-8")
+
+        if url == Client.SESSION_URL:
+            return 200, {}, b"{}"
+
+        return None
+
+    @staticmethod
+    def _build_response(request, status: int, headers: dict, body: bytes) -> Response:
+
+        response = Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response.raw = io.BytesIO(body)
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+
+        return response
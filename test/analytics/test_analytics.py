@@ -7,6 +7,8 @@ import datetime as dt
 from surquest.utils.appstoreconnect.analytics.client import Client
 from surquest.utils.appstoreconnect.analytics.analytics import Analytics
 from surquest.utils.appstoreconnect.analytics.enums import Measure, Group, Frequency
+from surquest.utils.appstoreconnect.analytics.formatter import Formatter
+from surquest.utils.appstoreconnect.analytics.exceptions import AppStoreConnectAnalyticsIncompleteError
 
 class Params:
 
@@ -156,4 +158,423 @@ class TestAnalytics:
 
         assert isinstance(data, list), F"Expected type: list, got: {type(data)}."
         assert data != [], F"Expected data to not be empty, got: {data}."
-        assert len(data) == 90, F"Expected length should be 3, got: {len(data)}."
\ No newline at end of file
+        assert len(data) == 90, F"Expected length should be 3, got: {len(data)}."
+
+class FakeClient:
+    """
+    Stand-in for Client that answers time series requests from the payload.
+    """
+
+    get_endpoint = staticmethod(Client.get_endpoint)
+
+    def __init__(self):
+        self.payloads = []
+
+    def request(self, url, method="POST", data=None):
+
+        self.payloads.append(data)
+
+        start = dt.date.fromisoformat(data.get("startTime")[:10])
+        end = dt.date.fromisoformat(data.get("endTime")[:10])
+        dates = [start + dt.timedelta(days=i) for i in range((end - start).days + 1)]
+
+        return {
+            "size": len(data.get("adamId")),
+            "results": [
+                {
+                    "adamId": app_id,
+                    "group": None,
+                    "data": [
+                        {"date": date.strftime("%Y-%m-%dT00:00:00Z"), "installs": 1.0}
+                        for date in dates
+                    ]
+                }
+                for app_id in data.get("adamId")
+            ]
+        }
+
+
+class TestAnalyticsBatching:
+
+    def test_get_time_series_multiple_apps(self):
+
+        client = FakeClient()
+        analytics = Analytics(client=client, max_apps_per_request=4)
+
+        data = analytics.get_time_series(
+            app_id=[str(i) for i in range(10)],
+            measure=Measure.INSTALLS,
+            start_date=dt.date(2023, 6, 16),
+            end_date=dt.date(2023, 6, 16),
+            formatter=Formatter.run_by_app
+            )
+
+        assert len(client.payloads) == 3, F"Expected 3 requests, got: {len(client.payloads)}."
+        assert [len(p.get("adamId")) for p in client.payloads] == [4, 4, 2]
+        assert sorted(data.keys()) == [str(i) for i in range(10)]
+        assert all(len(rows) == 1 for rows in data.values())
+
+
+    def test_get_time_series_chunked(self):
+
+        client = FakeClient()
+        analytics = Analytics(client=client, chunk_periods={Frequency.DAY: 30})
+
+        data = analytics.get_time_series(
+            app_id=["1", "2"],
+            measure=Measure.INSTALLS,
+            start_date=dt.date(2023, 1, 1),
+            end_date=dt.date(2023, 12, 31),
+            )
+
+        assert len(client.payloads) == 13, F"Expected 13 requests, got: {len(client.payloads)}."
+        assert len(data) == 2 * 365, F"Expected 730 rows, got: {len(data)}."
+        assert [row.get("date") for row in data[:365]] == sorted(row.get("date") for row in data[:365])
+
+    def test_grouped_requests_are_chunked_only_with_pinned_segments(self):
+
+        client = FakeClient()
+        analytics = Analytics(client=client, chunk_periods={Frequency.DAY: 30})
+        kwargs = {
+            "app_id": "1",
+            "measure": Measure.INSTALLS,
+            "start_date": dt.date(2023, 1, 1),
+            "end_date": dt.date(2023, 3, 31),
+            "grouping": Group.DEVICE,
+        }
+
+        analytics.get_time_series(**kwargs)
+
+        assert len(client.payloads) == 1, F"Expected the top segments ranked over the whole range, got: {len(client.payloads)} requests."
+
+        analytics.get_time_series(
+            dimension_filters=[{"dimensionKey": "platform", "optionKeys": ["iPad", "iPhone"]}],
+            **kwargs,
+        )
+
+        assert len(client.payloads) == 1 + 3, F"Expected pinned segments to be chunked, got: {len(client.payloads) - 1} requests."
+
+    def test_get_date_chunks_monthly(self):
+
+        chunks = Analytics._get_date_chunks(
+            start_date=dt.date(2021, 5, 1),
+            end_date=dt.date(2023, 2, 28),
+            frequency=Frequency.MONTH,
+            periods=12
+            )
+
+        assert chunks == [
+            (dt.date(2021, 5, 1), dt.date(2022, 4, 30)),
+            (dt.date(2022, 5, 1), dt.date(2023, 2, 28)),
+        ], F"Unexpected chunks: {chunks}."
+
+    def test_get_date_chunks_weekly(self):
+
+        # Wednesday, 2023-01-04; the weeks of the API start on Sunday.
+        chunks = Analytics._get_date_chunks(
+            start_date=dt.date(2023, 1, 4),
+            end_date=dt.date(2023, 2, 10),
+            frequency=Frequency.WEEK,
+            periods=2
+            )
+
+        assert chunks == [
+            (dt.date(2023, 1, 4), dt.date(2023, 1, 14)),
+            (dt.date(2023, 1, 15), dt.date(2023, 1, 28)),
+            (dt.date(2023, 1, 29), dt.date(2023, 2, 10)),
+        ], F"Unexpected chunks: {chunks}."
+
+    def test_merge_time_series_boundaries(self):
+
+        def response(dates):
+            return {"results": [{"adamId": "1", "group": {"key": "iPad"}, "totals": {}, "data": [{"date": d} for d in dates]}]}
+
+        data = Analytics._merge_time_series(responses=[
+            response(["2023-01-01", "2023-01-08"]),
+            response(["2023-01-08", "2023-01-15"]),
+        ])
+
+        assert data.get("size") == 1
+        assert [r.get("date") for r in data["results"][0]["data"]] == ["2023-01-01", "2023-01-08", "2023-01-15"]
+        assert "totals" not in data["results"][0]
+
+    def test_iter_time_series(self):
+
+        analytics = Analytics(client=FakeClient(), chunk_periods={Frequency.DAY: 30})
+
+        rows = analytics.iter_time_series(
+            app_id="1",
+            measure=Measure.INSTALLS,
+            start_date=dt.date(2023, 1, 1),
+            end_date=dt.date(2023, 3, 31),
+            )
+
+        assert not isinstance(rows, list), "Expected a lazy iterator."
+
+        dates = [row.get("date") for row in rows]
+
+        assert len(dates) == 90, F"Expected 90 rows, got: {len(dates)}."
+        assert dates == sorted(set(dates)), "Expected ordered rows without duplicates."
+
+
+class SegmentedClient(FakeClient):
+    """
+    Stand-in for Client that answers grouped requests with the top ranked segments.
+    """
+
+    def __init__(self, segments):
+        super().__init__()
+        self.segments = segments
+
+    def request(self, url, method="POST", data=None):
+
+        self.payloads.append(data)
+
+        date = data.get("startTime")
+        group = data.get("group")
+
+        if group is None:
+            values = {None: sum(self.segments.values())}
+        else:
+            keys = list(self.segments)
+
+            for dimension_filter in data.get("dimensionFilters") or []:
+                if dimension_filter.get("dimensionKey") == group.get("dimension"):
+                    keys = [key for key in keys if key in dimension_filter.get("optionKeys")]
+
+            keys = sorted(keys, key=lambda key: -self.segments[key])[:group.get("limit")]
+            values = {key: self.segments[key] for key in keys}
+
+        return {
+            "size": len(values),
+            "results": [
+                {
+                    "adamId": "1",
+                    "group": None if key is None else {"key": key, "title": key},
+                    "data": [{"date": date, "installs": value}],
+                }
+                for key, value in values.items()
+            ]
+        }
+
+
+class AppSegmentedClient(FakeClient):
+    """
+    Stand-in for Client that answers grouped requests of one app with its top ranked segments.
+    """
+
+    def __init__(self, segments):
+        super().__init__()
+        self.segments = segments
+
+    def request(self, url, method="POST", data=None):
+
+        self.payloads.append(data)
+
+        app_id = data.get("adamId")[0]
+        group = data.get("group")
+        keys = list(self.segments[app_id])
+
+        for dimension_filter in data.get("dimensionFilters") or []:
+            if dimension_filter.get("dimensionKey") == group.get("dimension"):
+                keys = [key for key in keys if key in dimension_filter.get("optionKeys")]
+
+        keys = sorted(keys, key=lambda key: -self.segments[app_id][key])[:group.get("limit")]
+
+        return {
+            "size": len(keys),
+            "results": [
+                {
+                    "adamId": app_id,
+                    "group": {"key": key, "title": key},
+                    "data": [{"date": data.get("startTime"), "installs": self.segments[app_id][key]}],
+                }
+                for key in keys
+            ]
+        }
+
+
+class TestAnalyticsGrouping:
+
+    KWARGS = {
+        "app_id": "1",
+        "measure": Measure.INSTALLS,
+        "start_date": dt.date(2023, 7, 1),
+        "end_date": dt.date(2023, 7, 1),
+        "grouping": Group.COUNTRY,
+        "formatter": lambda data, grouping, measure: data,
+    }
+
+    def test_group_limit_and_dimension_filters(self):
+
+        client = FakeClient()
+        analytics = Analytics(client=client, group_limit=50)
+
+        analytics.get_time_series(
+            dimension_filters=[{"dimensionKey": "source", "optionKeys": ["Search"]}],
+            **self.KWARGS,
+        )
+
+        assert client.payloads[0]["group"]["limit"] == 50
+        assert client.payloads[0]["dimensionFilters"] == [{"dimensionKey": "source", "optionKeys": ["Search"]}]
+
+    def test_unsaturated_response_is_complete(self):
+
+        client = SegmentedClient(segments={"US": 5.0, "CZ": 3.0})
+        analytics = Analytics(client=client, group_limit=3)
+
+        data = analytics.get_complete_time_series(**self.KWARGS)
+
+        assert data["size"] == 2
+        assert len(client.payloads) == 2, "Expected the grouped and the totals request only."
+
+    def test_partitions_fetch_the_long_tail(self):
+
+        segments = {F"C{i:02d}": float(100 - i) for i in range(25)}
+        client = SegmentedClient(segments=segments)
+        analytics = Analytics(client=client, group_limit=10)
+
+        data = analytics.get_complete_time_series(option_keys=list(segments), **self.KWARGS)
+
+        keys = sorted(item["group"]["key"] for item in data["results"])
+        partitions = [p for p in client.payloads if p.get("dimensionFilters")]
+
+        assert keys == sorted(segments), F"Expected all 25 segments, got: {len(keys)}."
+        assert [len(p["dimensionFilters"][0]["optionKeys"]) for p in partitions] == [10, 5]
+        assert all(p["group"]["limit"] == len(p["dimensionFilters"][0]["optionKeys"]) for p in partitions)
+
+    def test_ranked_segments_missing_from_option_keys_are_kept(self):
+
+        client = AppSegmentedClient(segments={
+            "1": {"US": 5.0, "CZ": 4.0, "DE": 3.0},
+            "2": {"US": 5.0, "FR": 4.0, "DE": 3.0},
+        })
+        analytics = Analytics(client=client, group_limit=2, max_apps_per_request=1)
+
+        data = analytics.get_complete_time_series(
+            option_keys=["US", "DE"],
+            reconcile=False,
+            **{**self.KWARGS, "app_id": ["1", "2"]},
+        )
+
+        keys = sorted(Analytics._get_series_key(item=item) for item in data["results"])
+
+        assert keys == [("1", "CZ"), ("1", "DE"), ("1", "US"), ("2", "DE"), ("2", "FR"), ("2", "US")], F"Unexpected segments: {keys}."
+
+    def test_truncation_is_reconciled(self, caplog):
+
+        client = SegmentedClient(segments={F"C{i:02d}": 1.0 for i in range(5)})
+        analytics = Analytics(client=client, group_limit=3)
+
+        with pytest.raises(AppStoreConnectAnalyticsIncompleteError) as error:
+            analytics.get_complete_time_series(strict=True, **self.KWARGS)
+
+        assert error.value.gaps == {"1": 2.0}, F"Expected 2 missing installs, got: {error.value.gaps}."
+        assert "truncated to the top 3" in caplog.text
+
+    def test_hidden_values_are_not_reconciled(self):
+
+        data = {"results": [
+            {"adamId": "1", "data": [{"date": "d1", "installs": 2.0}, {"date": "d2", "installs": -1.0}]},
+        ]}
+        totals = {"results": [
+            {"adamId": "1", "data": [{"date": "d1", "installs": 2.0}, {"date": "d2", "installs": 7.0}]},
+        ]}
+
+        assert Analytics._reconcile_time_series(data=data, totals=totals, measure=Measure.INSTALLS) == {}
+
+    def test_differences_are_not_netted_across_dates(self):
+
+        data = {"results": [
+            {"adamId": "1", "data": [{"date": "d1", "installs": 3.0}, {"date": "d2", "installs": 5.0}]},
+        ]}
+        totals = {"results": [
+            {"adamId": "1", "data": [{"date": "d1", "installs": 4.0}, {"date": "d2", "installs": 4.0}]},
+        ]}
+
+        gaps = Analytics._reconcile_time_series(data=data, totals=totals, measure=Measure.INSTALLS)
+
+        assert gaps == {"1": 2.0}, F"Expected the differences of both dates, got: {gaps}."
+
+
+class MeasuresClient(FakeClient):
+    """
+    Stand-in for Client that answers every requested measure.
+    """
+
+    def request(self, url, method="POST", data=None):
+
+        self.payloads.append(data)
+
+        segments = [None] if data.get("group") is None else ["iPad", "iPhone"]
+
+        return {
+            "size": len(segments),
+            "results": [
+                {
+                    "adamId": "1",
+                    "group": None if segment is None else {"key": segment, "title": segment},
+                    "data": [
+                        {"date": data.get("startTime"), **{m: float(len(m)) for m in data.get("measures")}}
+                    ],
+                }
+                for segment in segments
+            ]
+        }
+
+
+class TestAnalyticsMeasures:
+
+    MEASURES = [Measure.INSTALLS, Measure.UNINSTALLS, Measure.SALES]
+
+    KWARGS = {
+        "app_id": "1",
+        "start_date": dt.date(2023, 7, 1),
+        "end_date": dt.date(2023, 7, 3),
+    }
+
+    def test_measures_are_batched(self):
+
+        client = MeasuresClient()
+        analytics = Analytics(client=client, chunk_periods={Frequency.DAY: 1})
+
+        rows = analytics.get_time_series(measure=self.MEASURES, **self.KWARGS)
+
+        assert len(client.payloads) == 3, F"Expected one request per day, got: {len(client.payloads)}."
+        assert client.payloads[0]["measures"] == ["installs", "uninstalls", "sales"]
+        assert len(rows) == 3, F"Expected one wide row per date, got: {len(rows)}."
+        assert [rows[0][m] for m in self.MEASURES] == [8.0, 10.0, 5.0]
+
+    def test_grouped_measures_fall_back_to_requests_per_measure(self):
+
+        client = MeasuresClient()
+        analytics = Analytics(client=client, chunk_periods={Frequency.DAY: 1})
+
+        rows = analytics.get_time_series(measure=self.MEASURES, grouping=Group.DEVICE, **self.KWARGS)
+
+        assert len(client.payloads) == 3, F"Expected one unchunked request per measure, got: {len(client.payloads)}."
+        assert all(len(p["measures"]) == 1 for p in client.payloads)
+        assert all(p["group"]["metric"] == p["measures"][0] for p in client.payloads)
+        assert len(rows) == 2, F"Expected one wide row per date and segment, got: {len(rows)}."
+        assert all(row[Measure.SALES] == 5.0 and row[Measure.INSTALLS] == 8.0 for row in rows)
+
+    def test_list_measures_are_rejected_by_single_measure_methods(self):
+
+        analytics = Analytics(client=MeasuresClient())
+
+        with pytest.raises(ValueError, match="iter_time_series supports a single measure"):
+            list(analytics.iter_time_series(measure=self.MEASURES, **self.KWARGS))
+
+        with pytest.raises(ValueError, match="get_complete_time_series supports a single measure"):
+            analytics.get_complete_time_series(measure=self.MEASURES, grouping=Group.DEVICE, **self.KWARGS)
+
+        assert analytics.client.payloads == [], "Expected no request to be sent."
+
+    def test_single_measure_rows(self):
+
+        rows = Analytics(client=MeasuresClient()).get_time_series(measure=Measure.INSTALLS, **self.KWARGS)
+
+        assert set(rows[0]) == {
+            "date", "app_id", "segmentation_name", "segment", Measure.INSTALLS,
+            "__record_month", "__record_create_date",
+        }
@@ -0,0 +1,227 @@
+import asyncio
+import pytest
+import datetime as dt
+
+pytest.importorskip("aiohttp")
+
+from surquest.utils.appstoreconnect.analytics.async_client import AsyncClient
+from surquest.utils.appstoreconnect.analytics.async_analytics import AsyncAnalytics
+from surquest.utils.appstoreconnect.analytics.enums import Measure, Group, Frequency
+
+
+class FakeAsyncClient:
+    """
+    Stand-in for AsyncClient that answers time series requests from the payload.
+    """
+
+    get_endpoint = staticmethod(AsyncClient.get_endpoint)
+
+    def __init__(self):
+        self.payloads = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def request(self, url, method="POST", data=None):
+
+        self.payloads.append(data)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        # Yield to the event loop, so the other requests get sent meanwhile.
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        start = dt.date.fromisoformat(data.get("startTime")[:10])
+        end = dt.date.fromisoformat(data.get("endTime")[:10])
+
+        # Retentions requests carry no measures.
+        if "measures" not in data:
+            return {
+                "size": len(data.get("adamId")),
+                "results": [
+                    {
+                        "adamId": app_id,
+                        "appPurchase": data.get("startTime"),
+                        "data": [{"date": data.get("endTime"), "retentionPercentage": 0.5, "value": 2.0}]
+                    }
+                    for app_id in data.get("adamId")
+                ]
+            }
+
+        return {
+            "size": len(data.get("adamId")),
+            "results": [
+                {
+                    "adamId": app_id,
+                    "group": None,
+                    "data": [
+                        {"date": (start + dt.timedelta(days=i)).strftime("%Y-%m-%dT00:00:00Z"), measure: 1.0}
+                        for i in range((end - start).days + 1)
+                        for measure in data.get("measures")
+                    ]
+                }
+                for app_id in data.get("adamId")
+            ]
+        }
+
+
+class SegmentedAsyncClient(FakeAsyncClient):
+    """
+    Stand-in for AsyncClient that answers grouped requests with the top ranked segments.
+    """
+
+    def __init__(self, segments):
+        super().__init__()
+        self.segments = segments
+
+    async def request(self, url, method="POST", data=None):
+
+        self.payloads.append(data)
+        await asyncio.sleep(0)
+
+        group = data.get("group")
+
+        if group is None:
+            values = {None: sum(self.segments.values())}
+        else:
+            keys = list(self.segments)
+
+            for dimension_filter in data.get("dimensionFilters") or []:
+                keys = [key for key in keys if key in dimension_filter.get("optionKeys")]
+
+            keys = sorted(keys, key=lambda key: -self.segments[key])[:group.get("limit")]
+            values = {key: self.segments[key] for key in keys}
+
+        return {
+            "size": len(values),
+            "results": [
+                {
+                    "adamId": "1",
+                    "group": None if key is None else {"key": key, "title": key},
+                    "data": [{"date": data.get("startTime"), "installs": value}],
+                }
+                for key, value in values.items()
+            ]
+        }
+
+
+class TestAsyncAnalytics:
+
+    def test_get_time_series_concurrently(self):
+
+        client = FakeAsyncClient()
+
+        async def extract():
+
+            analytics = AsyncAnalytics(client=client)
+
+            return await asyncio.gather(*[
+                analytics.get_time_series(
+                    app_id="1",
+                    measure=measure,
+                    start_date=dt.date(2023, 6, 16),
+                    end_date=dt.date(2023, 6, 18),
+                    grouping=Group.TOTAL,
+                    frequency=Frequency.DAY
+                )
+                for measure in [Measure.INSTALLS, Measure.UNINSTALLS, Measure.SALES]
+            ])
+
+        results = asyncio.run(extract())
+
+        assert len(results) == 3, F"Expected 3 results, got: {len(results)}."
+        assert client.max_in_flight == 3, F"Expected the 3 requests in flight together, got: {client.max_in_flight}."
+
+        for data in results:
+            assert isinstance(data, list), F"Expected type: list, got: {type(data)}."
+            assert len(data) == 3, F"Expected length: 3, got: {len(data)}."
+
+    def test_semaphore_bound(self):
+
+        async def create():
+
+            async with AsyncClient(mayacinfo="", max_concurrency=7) as client:
+                return client.semaphore._value
+
+        assert asyncio.run(create()) == 7
+
+    def test_iter_time_series(self):
+
+        client = FakeAsyncClient()
+
+        async def extract():
+
+            analytics = AsyncAnalytics(client=client, max_workers=2, chunk_periods={Frequency.DAY: 7})
+
+            return [
+                row
+                async for row in analytics.iter_time_series(
+                    app_id="1",
+                    measure=Measure.INSTALLS,
+                    start_date=dt.date(2023, 6, 1),
+                    end_date=dt.date(2023, 6, 30),
+                )
+            ]
+
+        rows = asyncio.run(extract())
+        dates = [row.get("date") for row in rows]
+
+        assert len(client.payloads) == 5, F"Expected 5 chunks, got: {len(client.payloads)}."
+        assert client.max_in_flight == 2, F"Expected 2 requests in flight together, got: {client.max_in_flight}."
+        assert len(rows) == 30, F"Expected 30 rows, got: {len(rows)}."
+        assert dates == sorted(set(dates)), "Expected the rows ordered by date without repeats."
+
+        with pytest.raises(ValueError):
+            asyncio.run(AsyncAnalytics(client=client).iter_time_series(
+                app_id="1",
+                measure=[Measure.INSTALLS, Measure.SALES],
+                start_date=dt.date(2023, 6, 1),
+                end_date=dt.date(2023, 6, 30),
+            ).__anext__())
+
+    def test_iter_retentions(self):
+
+        client = FakeAsyncClient()
+
+        async def extract():
+
+            analytics = AsyncAnalytics(client=client, max_apps_per_request=1)
+
+            return [
+                row
+                async for row in analytics.iter_retentions(
+                    app_id=["1", "2"],
+                    start_date=dt.datetime(2023, 6, 1),
+                    end_date=dt.datetime(2023, 6, 7),
+                )
+            ]
+
+        rows = asyncio.run(extract())
+
+        assert len(client.payloads) == 2, F"Expected a request per app, got: {len(client.payloads)}."
+        assert [row.get("appId") for row in rows] == ["1", "2"]
+        assert rows[0].get("retentionCount") == 2.0
+
+    def test_get_complete_time_series(self):
+
+        segments = {F"C{i:02d}": float(100 - i) for i in range(25)}
+        client = SegmentedAsyncClient(segments=segments)
+        analytics = AsyncAnalytics(client=client, group_limit=10)
+
+        data = asyncio.run(analytics.get_complete_time_series(
+            app_id="1",
+            measure=Measure.INSTALLS,
+            start_date=dt.date(2023, 7, 1),
+            end_date=dt.date(2023, 7, 1),
+            grouping=Group.COUNTRY,
+            option_keys=list(segments),
+            strict=True,
+            formatter=lambda data, grouping, measure: data,
+        ))
+
+        keys = sorted(item["group"]["key"] for item in data["results"])
+        partitions = [p for p in client.payloads if p.get("dimensionFilters")]
+
+        assert keys == sorted(segments), F"Expected all 25 segments, got: {len(keys)}."
+        assert [len(p["dimensionFilters"][0]["optionKeys"]) for p in partitions] == [10, 5]
+        assert len(client.payloads) == 4, "Expected the ranked, 2 partitioned and the totals requests."
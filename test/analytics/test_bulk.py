@@ -0,0 +1,72 @@
+import time
+import threading
+import datetime as dt
+
+from surquest.utils.appstoreconnect.analytics.bulk import BulkExtractor, Job
+from surquest.utils.appstoreconnect.analytics.enums import Measure, Group, Frequency
+
+
+class FakeAnalytics:
+    """
+    Stand-in for Analytics that records the concurrency of the calls.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def get_time_series(self, app_id, measure, start_date, end_date, grouping, frequency, formatter):
+
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+        time.sleep(0.01)
+
+        with self.lock:
+            self.active -= 1
+
+        if app_id == "broken":
+            raise ValueError("broken app")
+
+        return [{"app_id": app_id, "measure": measure}]
+
+
+class TestBulkExtractor:
+
+    def test_plan_matrix(self):
+
+        jobs = BulkExtractor.plan(
+            app_ids=["1", "2"],
+            measures={
+                Measure.ACTIVE_DEVICES: [Group.COUNTRY],
+                Measure.INSTALLS: [Group.TOTAL, Group.DEVICE],
+            },
+            start_date=dt.date(2023, 6, 16),
+            end_date=dt.date(2023, 6, 18),
+            frequencies=[Frequency.DAY, Frequency.WEEK]
+        )
+
+        assert len(jobs) == 12, F"Expected 12 jobs, got: {len(jobs)}."
+        assert all(isinstance(job, Job) for job in jobs)
+
+    def test_run_records_failures(self):
+
+        analytics = FakeAnalytics()
+        extractor = BulkExtractor(analytics=analytics, max_workers=3)
+
+        jobs = BulkExtractor.plan(
+            app_ids=["1", "2", "broken"],
+            measures=[Measure.INSTALLS, Measure.UNITS],
+            groupings=[Group.TOTAL, Group.DEVICE],
+            start_date=dt.date(2023, 6, 16),
+            end_date=dt.date(2023, 6, 18),
+        )
+
+        results = list(extractor.run(jobs))
+
+        assert len(results) == 12, F"Expected 12 results, got: {len(results)}."
+        assert len([r for r in results if not r.success]) == 4
+        assert all(isinstance(r.error, ValueError) for r in results if not r.success)
+        assert analytics.peak <= 3, F"Expected at most 3 concurrent calls, got: {analytics.peak}."
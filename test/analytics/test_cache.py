@@ -0,0 +1,135 @@
+import time
+import datetime as dt
+
+import pytest
+
+from surquest.utils.appstoreconnect.analytics.cache import Cache, MemoryCache, SQLiteCache
+from surquest.utils.appstoreconnect.analytics.client import Client
+from surquest.utils.appstoreconnect.analytics.analytics import Analytics
+from surquest.utils.appstoreconnect.analytics.enums import Measure
+
+URL = "https://appstoreconnect.apple.com/analytics/api/v1/data/time-series"
+
+CLOSED = {"adamId": ["1"], "startTime": "2023-06-16T00:00:00Z", "endTime": "2023-06-18T00:00:00Z"}
+
+OPEN = {"adamId": ["1"], "startTime": "2023-06-16T00:00:00Z", "endTime": "2999-01-01T00:00:00Z"}
+
+
+class CountingClient:
+
+    get_endpoint = staticmethod(Client.get_endpoint)
+
+    def __init__(self):
+        self.calls = 0
+
+    def request(self, url, method="POST", data=None):
+
+        self.calls += 1
+
+        return {"results": [{"adamId": "1", "group": None, "data": [{"date": "2023-06-16T00:00:00Z", "installs": 1.0}]}]}
+
+
+class TestCache:
+
+    def test_ttl_of_closed_and_open_periods(self):
+
+        cache = MemoryCache(ttl=60, closed_ttl=None)
+
+        assert cache.get_ttl(payload=CLOSED) is None, "Expected closed periods to never expire."
+        assert cache.get_ttl(payload=OPEN) == 60, "Expected periods touching today to use the short TTL."
+
+    def test_ttl_within_the_restatement_days(self):
+
+        cache = MemoryCache(ttl=60, closed_ttl=None, restatement_days=3)
+        today = dt.datetime.now(dt.timezone.utc).date()
+
+        def payload(days):
+            return {**CLOSED, "endTime": (today - dt.timedelta(days=days)).strftime("%Y-%m-%dT00:00:00Z")}
+
+        assert cache.get_ttl(payload=payload(1)) == 60, "Expected yesterday to be restated."
+        assert cache.get_ttl(payload=payload(3)) == 60, "Expected the restatement days to use the short TTL."
+        assert cache.get_ttl(payload=payload(4)) is None, "Expected older periods to be closed."
+
+    def test_keys_are_scoped_to_the_account(self):
+
+        cache = MemoryCache()
+        cache.set(url=URL, payload=CLOSED, value={"a": 1}, identity="a")
+
+        assert cache.get(url=URL, payload=CLOSED, identity="a") == {"a": 1}
+        assert cache.get(url=URL, payload=CLOSED, identity="b") is None, "Expected another account to miss."
+        assert cache.get(url=URL, payload=CLOSED) is None
+
+    def test_cache_is_abstract(self):
+
+        with pytest.raises(TypeError):
+            Cache()
+
+    def test_memory_cache_lru_eviction(self):
+
+        cache = MemoryCache(max_size=2)
+
+        for i in range(3):
+            cache.set(url=URL, payload={**CLOSED, "adamId": [str(i)]}, value={"i": i})
+
+        assert len(cache) == 2
+        assert cache.get(url=URL, payload={**CLOSED, "adamId": ["0"]}) is None
+        assert cache.get(url=URL, payload={**CLOSED, "adamId": ["2"]}) == {"i": 2}
+
+    def test_memory_cache_expiry(self):
+
+        cache = MemoryCache(ttl=0.01)
+        cache.set(url=URL, payload=OPEN, value={"a": 1})
+
+        time.sleep(0.02)
+
+        assert cache.get(url=URL, payload=OPEN) is None, "Expected the response to be expired."
+
+    def test_sqlite_cache(self, tmp_path):
+
+        path = str(tmp_path / "cache.sqlite")
+
+        cache = SQLiteCache(path=path, max_size=2)
+
+        for i in range(3):
+            cache.set(url=URL, payload={**CLOSED, "adamId": [str(i)]}, value={"i": i})
+
+        cache.close()
+
+        cache = SQLiteCache(path=path, max_size=2)
+
+        assert len(cache) == 2
+        assert cache.get(url=URL, payload={**CLOSED, "adamId": ["2"]}) == {"i": 2}
+        assert cache.get(url=URL, payload={**CLOSED, "adamId": ["0"]}) is None
+
+    def test_analytics_uses_cache(self):
+
+        client = CountingClient()
+        analytics = Analytics(client=client, cache=MemoryCache())
+
+        for _ in range(3):
+            data = analytics.get_time_series(
+                app_id="1",
+                measure=Measure.INSTALLS,
+                start_date=dt.date(2023, 6, 16),
+                end_date=dt.date(2023, 6, 18),
+            )
+
+        assert client.calls == 1, F"Expected 1 request, got: {client.calls}."
+        assert len(data) == 1
+
+    def test_analytics_scopes_cache_to_the_account(self):
+
+        cache = MemoryCache()
+        clients = [CountingClient(), CountingClient()]
+
+        for client, mayacinfo in zip(clients, ["a", "b"]):
+            client.identity = Client.get_identity(mayacinfo=mayacinfo)
+
+            Analytics(client=client, cache=cache).get_time_series(
+                app_id="1",
+                measure=Measure.INSTALLS,
+                start_date=dt.date(2023, 6, 16),
+                end_date=dt.date(2023, 6, 18),
+            )
+
+        assert [client.calls for client in clients] == [1, 1], F"Expected a request per account, got: {[client.calls for client in clients]}."
@@ -1,7 +1,13 @@
+import io
 import os
+import time
+import threading
 import pytest
+import requests
+from concurrent.futures import ThreadPoolExecutor
 
 from surquest.utils.appstoreconnect.analytics.client import Client
+from surquest.utils.appstoreconnect.analytics.exceptions import AppStoreConnectAnalyticsRequestError
 
 class TestClient:
     """
@@ -81,4 +87,103 @@ class TestClient:
         assert itctx != "", F"Expected itctx to not be empty, got: {itctx}."
 
         # check if the itctx is 32 characters long
-        assert len(itctx) >= 32, F"Expected itctx to be at least 32 characters long, got: {len(itctx)}."
\ No newline at end of file
+        assert len(itctx) >= 32, F"Expected itctx to be at least 32 characters long, got: {len(itctx)}."
+
+    def test_session_pool(self):
+        """
+        Test that the Client reuses one pooled session for all requests.
+        """
+        with Client(mayacinfo="cookie", pool_connections=2, pool_maxsize=20) as client:
+
+            adapter = client.session.get_adapter(Client.BASE_URL)
+
+            assert adapter._pool_maxsize == 20, F"Expected pool size: 20, got: {adapter._pool_maxsize}."
+            assert client.session.cookies.get("myacinfo") == "cookie", "Expected myacinfo cookie in the session."
+            assert client.session.headers.get("X-Requested-By") == "analytics.itunes.apple.com"
+
+
+class FakeAuthSession:
+    """
+    A stand-in for requests.Session counting the authentication calls.
+    """
+
+    def __init__(self, statuses):
+        self.headers = {}
+        self.cookies = requests.cookies.RequestsCookieJar()
+        self.statuses = list(statuses)
+        self.calls = {"widget": 0, "session": 0, "request": 0}
+        self.lock = threading.Lock()
+
+    def get(self, url, headers=None):
+
+        time.sleep(0.01)
+        response = requests.Response()
+
+        if url == Client.WIDGET_KEY_URL:
+            self.calls["widget"] += 1
+            response.raw = io.BytesIO(b'{"authServiceKey": "key"}')
+        else:
+            self.calls["session"] += 1
+            response.cookies.set("itctx", F"ctx{self.calls['session']}")
+
+        return response
+
+    def request(self, method, url, json=None, stream=False):
+
+        with self.lock:
+            self.calls["request"] += 1
+            status = self.statuses.pop(0)
+
+        response = requests.Response()
+        response.status_code = status
+        response.raw = io.BytesIO(b'{"results": []}')
+
+        return response
+
+    def close(self):
+        pass
+
+
+class TestClientAuth:
+
+    def test_single_flight_bootstrap(self):
+
+        client = Client(mayacinfo="")
+        client.session = FakeAuthSession(statuses=[])
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            itctxs = set(executor.map(lambda _: client._get_itctx(), range(32)))
+
+        assert itctxs == {"ctx1"}, F"Expected one shared itctx, got: {itctxs}."
+        assert client.session.calls["widget"] == 1, F"Expected one widget key call, got: {client.session.calls}."
+        assert client.session.calls["session"] == 1, F"Expected one session call, got: {client.session.calls}."
+
+    def test_session_expiry(self):
+
+        client = Client(mayacinfo="", session_ttl=0)
+        client.session = FakeAuthSession(statuses=[])
+
+        assert client._get_itctx() == "ctx1"
+        assert client._get_itctx() == "ctx2", "Expected an expired session to be refreshed."
+        assert client.session.calls["widget"] == 1, "Expected the widget key to be fetched once."
+
+    def test_reauthentication_and_replay(self):
+
+        client = Client(mayacinfo="")
+        client.session = FakeAuthSession(statuses=[401, 200])
+
+        data = client.request(url=Client.get_endpoint())
+
+        assert data == {"results": []}, F"Expected the replayed response, got: {data}."
+        assert client.session.calls["session"] == 2, F"Expected one re-authentication, got: {client.session.calls}."
+        assert client.session.calls["request"] == 2, F"Expected one replay, got: {client.session.calls}."
+
+    def test_replays_only_once(self):
+
+        client = Client(mayacinfo="")
+        client.session = FakeAuthSession(statuses=[401, 401])
+
+        with pytest.raises(AppStoreConnectAnalyticsRequestError):
+            client.request(url=Client.get_endpoint())
+
+        assert client.session.calls["request"] == 2, F"Expected a single replay, got: {client.session.calls}."
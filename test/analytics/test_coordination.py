@@ -0,0 +1,143 @@
+import asyncio
+import threading
+
+import pytest
+
+from surquest.utils.appstoreconnect.analytics.client import Client
+from surquest.utils.appstoreconnect.analytics.coordination import Coordinator, MemoryCoordinator, SQLiteCoordinator
+
+SESSION = {"widget_key": "key", "itctx": "ctx"}
+
+
+class TestCoordinator:
+
+    def test_session_expiry(self):
+
+        coordinator = MemoryCoordinator(session_ttl=0)
+        coordinator.set_session(SESSION)
+
+        assert coordinator.get_session() is None, "Expected the session to be expired."
+
+        coordinator = MemoryCoordinator()
+        coordinator.set_session(SESSION)
+
+        assert coordinator.get_session() == SESSION
+
+        coordinator.clear_session()
+
+        assert coordinator.get_session() is None, "Expected the session to be cleared."
+
+    def test_single_bootstrap_claim(self):
+
+        coordinator = MemoryCoordinator()
+
+        assert coordinator.claim_bootstrap() is True
+        assert coordinator.claim_bootstrap() is False, "Expected only one client to bootstrap."
+
+        coordinator.set_session(SESSION)
+
+        assert coordinator.wait_for_session(timeout=0) == SESSION
+
+    def test_sqlite_state_is_shared(self, tmp_path):
+
+        path = str(tmp_path / "coordination.db")
+
+        # Two connections to one file behave like two processes.
+        first = SQLiteCoordinator(path=path, rate=10.0, burst=2)
+        second = SQLiteCoordinator(path=path, rate=10.0, burst=2)
+
+        first.set_session(SESSION)
+
+        assert second.get_session() == SESSION, "Expected the session to be shared."
+
+        waits = [first.acquire(), second.acquire(), first.acquire(), second.acquire()]
+
+        assert waits[:2] == [0, 0], F"Expected the burst to pass immediately, got: {waits}."
+        assert waits[3] == pytest.approx(0.2, abs=0.02), F"Expected a shared budget, got: {waits}."
+
+        second.on_throttle(retry_after=5)
+
+        assert first.acquire() > 4.9, "Expected the Retry-After window to block all clients."
+
+        first.close()
+        second.close()
+
+    def test_throttle_and_success_adapt_the_rate(self):
+
+        coordinator = MemoryCoordinator(rate=8.0, min_rate=1.0, increase=0.5)
+
+        coordinator.on_throttle()
+        coordinator.on_success()
+
+        def update(state, now):
+            return state.get("rate")
+
+        rate = coordinator._transaction(update)
+
+        assert rate == 4.5, F"Expected the rate to be halved and increased, got: {rate}."
+
+    def test_state_is_kept_per_account(self, tmp_path):
+
+        for coordinator in [MemoryCoordinator(), SQLiteCoordinator(path=str(tmp_path / "coordination.db"))]:
+            coordinator.set_session(SESSION, identity="a")
+            coordinator.on_throttle(retry_after=5, identity="a")
+
+            assert coordinator.get_session(identity="a") == SESSION
+            assert coordinator.get_session(identity="b") is None, "Expected another account not to adopt the session."
+            assert coordinator.claim_bootstrap(identity="b") is True
+            assert coordinator.acquire(identity="b") == 0, "Expected another account not to be blocked."
+
+    def test_coordinator_is_abstract(self):
+
+        with pytest.raises(TypeError):
+            Coordinator()
+
+
+class TestClientCoordination:
+
+    def test_client_adopts_shared_session(self):
+
+        coordinator = MemoryCoordinator()
+        coordinator.set_session(SESSION, identity=Client.get_identity(mayacinfo="account"))
+
+        with Client(mayacinfo="account", coordinator=coordinator) as client:
+            itctx = client._get_itctx()
+
+            assert itctx == "ctx", F"Expected the shared itctx, got: {itctx}."
+            assert client.session.headers.get("X-Apple-Widget-Key") == "key"
+            assert client.session.cookies.get("itctx") == "ctx"
+
+    def test_async_client_calls_the_coordinator_off_the_event_loop(self):
+
+        pytest.importorskip("aiohttp")
+
+        from surquest.utils.appstoreconnect.analytics.async_client import AsyncClient
+
+        class RecordingCoordinator(MemoryCoordinator):
+
+            def __init__(self):
+                super().__init__()
+                self.threads = []
+
+            def _transaction(self, update, identity=None):
+                self.threads.append(threading.get_ident())
+                return super()._transaction(update, identity=identity)
+
+        coordinator = RecordingCoordinator()
+        coordinator.set_session(SESSION, identity=Client.get_identity(mayacinfo="account"))
+        coordinator.threads.clear()
+
+        async def run():
+
+            async with AsyncClient(mayacinfo="account", coordinator=coordinator) as client:
+
+                async def do_request(url, method="POST", data=None):
+                    return 200, {}, b'{"size": 0}'
+
+                client.do_request = do_request
+
+                return await client.request(url=Client.get_endpoint(subject="time-series"), data={})
+
+        assert asyncio.run(run()) == {"size": 0}
+        assert coordinator.threads, "Expected the coordinator to be called."
+        assert threading.get_ident() not in coordinator.threads, "Expected no coordinator call on the event loop."
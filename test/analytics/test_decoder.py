@@ -0,0 +1,60 @@
+import pytest
+
+from surquest.utils.appstoreconnect.analytics.client import Client
+from surquest.utils.appstoreconnect.analytics.decoder import JSONDecoder
+from surquest.utils.appstoreconnect.analytics.transport import ReplayTransport
+
+BODY = b'{"size": 1, "results": [{"adamId": "1", "group": null, "data": [{"date": "2023-07-01T00:00:00Z", "installs": 1.5}]}]}'
+
+EXPECTED = {"size": 1, "results": [{"adamId": "1", "group": None, "data": [{"date": "2023-07-01T00:00:00Z", "installs": 1.5}]}]}
+
+
+class TestJSONDecoder:
+
+    def test_stdlib_backend(self):
+
+        decoder = JSONDecoder(backend="json")
+
+        assert decoder(BODY) == EXPECTED
+        assert decoder(memoryview(BODY)) == EXPECTED, "Expected a memoryview to be decoded."
+
+    def test_orjson_backend(self):
+
+        pytest.importorskip("orjson")
+
+        decoder = JSONDecoder()
+
+        assert decoder.backend == "orjson", F"Expected orjson to be picked when installed, got: {decoder.backend}."
+        assert decoder(BODY) == EXPECTED
+        assert decoder(bytearray(BODY)) == EXPECTED
+
+    def test_invalid_backend(self):
+
+        with pytest.raises(ValueError):
+            JSONDecoder(backend="yaml")
+
+    def test_missing_backend(self, monkeypatch):
+
+        from surquest.utils.appstoreconnect.analytics import decoder
+
+        monkeypatch.setattr(decoder, "simdjson", None)
+
+        with pytest.raises(ImportError, match="pip install pysimdjson"):
+            JSONDecoder(backend="simdjson")
+
+    def test_client_decoder(self):
+
+        transport = ReplayTransport()
+        transport.add(url=Client.get_endpoint(), body=BODY)
+
+        bodies = []
+
+        def decoder(body):
+            bodies.append(body)
+            return JSONDecoder(backend="json")(body)
+
+        with Client(mayacinfo="", transport=transport, decoder=decoder) as client:
+            data = client.request(url=Client.get_endpoint(), data={})
+
+        assert data == EXPECTED
+        assert bodies == [BODY], "Expected the decoder to receive the raw bytes of the body."
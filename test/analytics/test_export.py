@@ -0,0 +1,142 @@
+import os
+import csv
+import gzip
+import json
+import datetime as dt
+
+import pytest
+
+from surquest.utils.appstoreconnect.analytics.formatter import Formatter
+from surquest.utils.appstoreconnect.analytics.export import Exporter, NDJSONExporter, CSVExporter, ParquetExporter
+from surquest.utils.appstoreconnect.analytics.enums import Measure, Group
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "..", "data", "sample", "input.grouped.json")
+
+
+def load_rows():
+
+    with open(SAMPLE) as f:
+        return Formatter.run(data=json.load(f), grouping=Group.DEVICE, measure=Measure.INSTALLS)
+
+
+class TestNDJSONExporter:
+
+    def test_rows_in_chunks(self, tmp_path):
+
+        rows = load_rows()
+        path = str(tmp_path / "rows.ndjson")
+
+        with NDJSONExporter(path=path, chunk_size=3) as exporter:
+            count = exporter.write(iter(rows))
+
+        with open(path) as f:
+            lines = [json.loads(line) for line in f]
+
+        assert count == len(rows) == len(lines), F"Expected {len(rows)} lines, got: {len(lines)}."
+        assert lines[1]["installs"] == rows[1][Measure.INSTALLS]
+        assert lines[1]["segment"] == rows[1]["segment"]
+
+    def test_compression_and_records(self, tmp_path):
+
+        rows = [{"purchasedAt": dt.datetime(2023, 6, 1), "appId": "1", "retentionCount": 2.0}] * 5
+        path = str(tmp_path / "retentions.ndjson.gz")
+
+        with NDJSONExporter(path=path, chunk_size=2) as exporter:
+            exporter.write(rows)
+            exporter.write(Formatter.review_records(data=[{"id": 1, "rating": 5}]))
+
+        with gzip.open(path, "rt") as f:
+            lines = [json.loads(line) for line in f]
+
+        assert len(lines) == 6 and exporter.rows == 6
+        assert lines[0]["purchasedAt"] == "2023-06-01T00:00:00"
+        assert lines[-1] == {"id": 1, "rating": 5}
+
+    def test_invalid_compression(self, tmp_path):
+
+        with pytest.raises(ValueError):
+            NDJSONExporter(path=str(tmp_path / "rows.ndjson"), compression="zip")
+
+    def test_exporter_is_abstract(self, tmp_path):
+
+        with pytest.raises(TypeError):
+            Exporter(path=str(tmp_path / "rows.txt"))
+
+
+class TestCSVExporter:
+
+    def test_header_and_values(self, tmp_path):
+
+        rows = load_rows()
+        path = str(tmp_path / "rows.csv")
+
+        with CSVExporter(path=path, chunk_size=4) as exporter:
+            exporter.write(rows)
+
+        with open(path, newline="") as f:
+            lines = list(csv.DictReader(f))
+
+        assert list(lines[0]) == ["date", "app_id", "segmentation_name", "segment", "installs", "__record_month", "__record_create_date"]
+        assert len(lines) == len(rows)
+        assert lines[0]["installs"] == "", "Expected the hidden values to be empty."
+        assert lines[2]["installs"] == str(rows[2][Measure.INSTALLS])
+
+
+class TestParquetExporter:
+
+    def test_rows_and_columnar_table(self, tmp_path):
+
+        pq = pytest.importorskip("pyarrow.parquet")
+
+        rows = load_rows()
+        path = str(tmp_path / "rows.parquet")
+
+        with ParquetExporter(path=path, chunk_size=4) as exporter:
+            exporter.write(Formatter.records(data={"results": []}, grouping=Group.DEVICE, measure=Measure.INSTALLS))
+            exporter.write(rows)
+
+        table = pq.read_table(path)
+
+        assert table.num_rows == len(rows)
+        assert pq.ParquetFile(path).num_row_groups == 3, "Expected a row group per chunk."
+        assert table.column("installs").to_pylist() == [row[Measure.INSTALLS] for row in rows]
+
+        with open(SAMPLE) as f:
+            columnar = Formatter.columnar(data=json.load(f), grouping=Group.DEVICE, measure=Measure.INSTALLS)
+
+        path = str(tmp_path / "columnar.parquet")
+
+        with ParquetExporter(path=path, compression="zstd") as exporter:
+            exporter.write(columnar)
+
+        assert pq.read_table(path).num_rows == len(columnar)
+
+    def test_missing_values_in_the_first_chunk(self, tmp_path):
+
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+
+        rows = [
+            {"date": "2023-06-01", "segment": None, Measure.INSTALLS: None, "retentionCount": None},
+            {"date": "2023-06-02", "segment": None, Measure.INSTALLS: None, "retentionCount": None},
+            {"date": "2023-06-03", "segment": None, Measure.INSTALLS: 1.5, "retentionCount": 2.0},
+        ]
+        path = str(tmp_path / "rows.parquet")
+
+        with ParquetExporter(path=path, chunk_size=2) as exporter:
+            exporter.write(rows)
+
+        table = pq.read_table(path)
+
+        assert table.schema.field("installs").type == pa.float64(), F"Expected float64, got: {table.schema.field('installs').type}."
+        assert table.column("installs").to_pylist() == [None, None, 1.5]
+        assert table.column("retentionCount").to_pylist() == [None, None, 2.0]
+
+        schema = pa.schema([("date", pa.string()), ("segment", pa.string()), ("installs", pa.float64()), ("retentionCount", pa.float64())])
+        rows[2]["segment"] = "iPhone"
+        path = str(tmp_path / "schema.parquet")
+
+        with ParquetExporter(path=path, chunk_size=2, schema=schema) as exporter:
+            exporter.write(rows)
+
+        assert pq.read_table(path).column("segment").to_pylist() == [None, None, "iPhone"]
@@ -1,3 +1,11 @@
+import os
+import json
+import pytest
+import datetime as dt
+from surquest.utils.appstoreconnect.analytics.formatter import Formatter
+from surquest.utils.appstoreconnect.analytics.enums import Measure, Group
+from surquest.utils.appstoreconnect.analytics.records import Record
+
 # import json
 # from surquest.utils.appstoreconnect.analytics.formatter import Formatter
 # from surquest.utils.appstoreconnect.analytics.enums import Measure, Group, Frequency
@@ -31,3 +39,181 @@
 #             for key in expected_keys:
 
 #                 assert key in item, F"Expected key: {key} to be in item: {item}."
+
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "..", "data", "sample", "input.grouped.json")
+
+
+def load_sample():
+
+    with open(SAMPLE) as f:
+        return json.load(f)
+
+
+class TestColumnarFormatter:
+
+    def test_columnar_matches_run(self):
+
+        data = load_sample()
+
+        table = Formatter.columnar(data=data, grouping=Group.DEVICE, measure=Measure.INSTALLS)
+        rows = Formatter.run(data=data, grouping=Group.DEVICE, measure=Measure.INSTALLS)
+
+        assert len(table) == len(rows), F"Expected {len(rows)} rows, got: {len(table)}."
+        assert table.segment.categories == ["Apple TV", "Desktop", "iPad", "iPhone", "iPod"]
+        assert table.app_id.categories == ["1207764294"]
+
+        for row, expected in zip(table.iter_rows(), rows):
+            assert list(row) == list(expected), F"Expected the keys: {list(expected)}, got: {list(row)}."
+
+            for key in ["date", "app_id", "segmentation_name", "segment", Measure.INSTALLS, "__record_month"]:
+                assert row.get(key) == expected.get(key), F"Expected {key}: {expected.get(key)}, got: {row.get(key)}."
+
+    def test_columnar_rejects_several_measures(self):
+
+        with pytest.raises(ValueError, match="supports a single measure"):
+            Formatter.columnar(data=load_sample(), grouping=Group.DEVICE, measure=[Measure.INSTALLS, Measure.SALES])
+
+    def test_columnar_to_arrow(self):
+
+        pa = pytest.importorskip("pyarrow")
+
+        table = Formatter.columnar(data=load_sample(), grouping=Group.DEVICE, measure=Measure.INSTALLS).to_arrow()
+
+        assert table.num_rows == 10
+        assert table.schema.field("date").type == pa.date32()
+        assert pa.types.is_dictionary(table.schema.field("segment").type)
+
+
+def retention_sample(cohorts):
+    """
+    Returns a retention response with `cohorts` daily cohorts of one app.
+    """
+
+    start = dt.datetime(2023, 6, 1)
+    stamp = lambda day: (start + dt.timedelta(days=day)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    return {"results": [
+        {
+            "adamId": "1",
+            "appPurchase": stamp(cohort),
+            "data": [
+                {"date": stamp(cohort + offset), "retentionPercentage": 100.0 - offset, "value": 10.0 * (cohorts - offset)}
+                for offset in range(cohorts - cohort)
+            ]
+        }
+        for cohort in range(cohorts)
+    ]}
+
+
+class TestRetentionFormatter:
+
+    def test_parse_timestamp(self):
+
+        for value in ["2023-06-10T00:00:00Z", "2024-02-29T23:59:58Z"]:
+            expected = dt.datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
+            assert Formatter.parse_timestamp(value) == expected, F"Expected {expected} for {value}."
+
+    def test_retention_matrices(self):
+
+        data = retention_sample(cohorts=4)
+
+        rows = Formatter.retentions(data=data, grouping=[])
+        matrix = Formatter.retention_matrices(data=data, grouping=[]).get("1")
+
+        assert len(rows) == 10, F"Expected 10 cells, got: {len(rows)}."
+        assert len(matrix) == 4 and matrix.offsets == 4
+        assert matrix.cohorts[0] == dt.date(2023, 6, 1)
+        assert list(matrix.row(2, values="count")[:2]) == [40.0, 30.0]
+        assert all(value != value for value in matrix.row(3)[1:]), "Expected NaN padding after the last offset."
+
+    def test_retention_matrices_with_missing_dates(self):
+
+        data = retention_sample(cohorts=4)
+        cohort = data["results"][0]["data"]
+        del cohort[1]
+
+        matrix = Formatter.retention_matrices(data=data, grouping=[]).get("1")
+        row = matrix.row(0, values="count")
+
+        assert matrix.offsets == 4, F"Expected 4 offsets, got: {matrix.offsets}."
+        assert row[0] == 40.0 and row[1] != row[1], "Expected NaN at the missing offset."
+        assert list(row[2:]) == [20.0, 10.0], F"Expected the later cells not to shift, got: {list(row)}."
+
+    def test_retention_matrices_weekly(self):
+
+        start = dt.datetime(2023, 6, 5)
+        stamp = lambda weeks: (start + dt.timedelta(weeks=weeks)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+        data = {"results": [{"adamId": "1", "appPurchase": stamp(0), "data": [
+            {"date": stamp(0), "retentionPercentage": 100.0, "value": 3.0},
+            {"date": stamp(1), "retentionPercentage": 50.0, "value": 2.0},
+            {"date": stamp(3), "retentionPercentage": 10.0, "value": 1.0},
+        ]}]}
+
+        matrix = Formatter.retention_matrices(data=data, grouping=[]).get("1")
+
+        assert matrix.offsets == 4
+        assert list(matrix.row(0, values="count"))[::3] == [3.0, 1.0]
+
+
+class TestRecordFormatter:
+
+    def test_records_match_run(self):
+
+        data = load_sample()
+
+        records = Formatter.records(data=data, grouping=Group.DEVICE, measure=Measure.INSTALLS)
+        rows = Formatter.run(data=data, grouping=Group.DEVICE, measure=Measure.INSTALLS)
+
+        assert [record.to_dict() for record in records] == rows, "Expected the records to convert to the rows of run."
+        assert not hasattr(records[0], "__dict__"), "Expected slotted records."
+        assert records[0].date is records[2].date, "Expected the dates to be shared."
+
+    def test_multi_measure_records(self):
+
+        data = {"results": [{"adamId": "1", "group": None, "data": [
+            {"date": "2023-07-01T00:00:00Z", "installs": 2.0, "uninstalls": -1.0},
+        ]}]}
+        measures = [Measure.INSTALLS, Measure.UNINSTALLS]
+
+        records = Formatter.records(data=data, grouping=Group.TOTAL, measure=measures)
+        rows = Formatter.run(data=data, grouping=Group.TOTAL, measure=measures)
+
+        assert records[0].value == (2.0, None)
+        assert [record.to_dict() for record in records] == rows
+
+    def test_retention_records_match_retentions(self):
+
+        data = retention_sample(cohorts=4)
+
+        records = Formatter.retention_records(data=data, grouping=[{"dimensionKey": "source", "optionKeys": ["Search"]}])
+        rows = Formatter.retentions(data=data, grouping=[{"dimensionKey": "source", "optionKeys": ["Search"]}])
+
+        assert [record.to_dict() for record in records] == rows
+        assert records[0].purchased_at is records[1].purchased_at, "Expected the timestamps to be shared."
+
+    def test_review_records(self):
+
+        reviews = [{"id": 1, "rating": 5, "storeFront": "US", "lastModified": 1689811200000}]
+
+        records = Formatter.review_records(data=reviews)
+
+        assert records[0].store_front == "US" and records[0].title is None
+        assert [record.to_dict() for record in records] == reviews
+        assert not hasattr(records[0], "__dict__"), "Expected the records to keep their slots."
+
+    def test_review_records_keep_unknown_fields(self):
+
+        reviews = [{"id": 1, "rating": 5, "edited": True, "helpfulViews": 3, "title": None}]
+
+        records = Formatter.review_records(data=reviews)
+
+        assert records[0].extra == {"edited": True, "helpfulViews": 3}, F"Unexpected extra fields: {records[0].extra}."
+        assert records[0].to_dict() == {"id": 1, "rating": 5, "edited": True, "helpfulViews": 3}
+        assert Formatter.review_records(data=[{"id": 2}])[0].extra is None
+
+    def test_record_is_abstract(self):
+
+        with pytest.raises(TypeError):
+            Record()
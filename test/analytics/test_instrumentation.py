@@ -0,0 +1,102 @@
+import io
+
+import pytest
+import requests
+
+from surquest.utils.appstoreconnect.analytics.client import Client
+from surquest.utils.appstoreconnect.analytics.ratelimit import RateLimiter
+from surquest.utils.appstoreconnect.analytics.exceptions import AppStoreConnectAnalyticsRequestError
+from surquest.utils.appstoreconnect.analytics.instrumentation import Histogram, Instrumentation, Metrics
+
+
+def make_response(status_code, content=b'{"results": []}'):
+
+    response = requests.Response()
+    response.status_code = status_code
+    response.raw = io.BytesIO(content)
+
+    return response
+
+
+class ScriptedClient(Client):
+
+    def __init__(self, responses, **kwargs):
+        super().__init__(mayacinfo="", rate_limiter=RateLimiter(backoff_base=0.001), **kwargs)
+        self.responses = list(responses)
+
+    def _get_itctx(self):
+        return "ctx"
+
+    def do_request(self, url, method="POST", data=None, stream=False):
+
+        response = self.responses.pop(0)
+
+        if isinstance(response, Exception):
+            raise response
+
+        return response
+
+
+class TestInstrumentation:
+
+    def test_subjects(self):
+
+        assert Instrumentation.get_subject(Client.get_endpoint("time-series")) == "time-series"
+        assert Instrumentation.get_subject(Client.get_endpoint("retention")) == "retention"
+        assert Instrumentation.get_subject(Client.get_endpoint("reviews")) == "reviews"
+        assert Instrumentation.get_subject(Client.WIDGET_KEY_URL) == "other"
+
+    def test_histogram(self):
+
+        histogram = Histogram(buckets=(0.1, 1.0))
+
+        for value in (0.05, 0.05, 0.5, 5.0):
+            histogram.observe(value)
+
+        assert histogram.counts == [2, 1, 1], F"Expected values in every bucket, got: {histogram.counts}."
+        assert histogram.quantile(0.5) == 0.1
+        assert histogram.quantile(0.75) == 1.0
+        assert histogram.quantile(1.0) == float("inf")
+        assert Histogram().quantile(0.5) is None
+
+    def test_events_of_a_retried_request(self):
+
+        events = []
+        metrics = Metrics()
+        client = ScriptedClient(
+            responses=[make_response(503), make_response(200)],
+            instrumentation=Instrumentation(sinks=[events.append, metrics]),
+        )
+
+        client.request(url=Client.get_endpoint("time-series"))
+
+        assert [event.event for event in events] == ["start", "end", "retry", "start", "end"]
+        assert events[-1].size == len(b'{"results": []}')
+
+        snapshot = metrics.snapshot().get("time-series")
+
+        assert snapshot["requests"] == 2, F"Expected 2 attempts, got: {snapshot}."
+        assert snapshot["responses"] == {503: 1, 200: 1}
+        assert snapshot["retries"] == 1
+        assert snapshot["latency"]["count"] == 2
+
+    def test_errors_are_counted(self):
+
+        metrics = Metrics()
+        client = ScriptedClient(
+            responses=[make_response(400), requests.ConnectionError("reset")],
+            instrumentation=Instrumentation(sinks=[metrics]),
+        )
+        client.rate_limiter.max_retries = 0
+
+        with pytest.raises(AppStoreConnectAnalyticsRequestError):
+            client.request(url=Client.get_endpoint("retention"))
+
+        with pytest.raises(requests.ConnectionError):
+            client.request(url=Client.get_endpoint("reviews"))
+
+        snapshot = metrics.snapshot()
+
+        assert snapshot["retention"]["errors"] == 1
+        assert snapshot["reviews"]["errors"] == 1
+        assert snapshot["reviews"]["responses"] == {}, "Expected no response of a failed connection."
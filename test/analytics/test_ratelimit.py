@@ -0,0 +1,213 @@
+import asyncio
+import json
+import email.utils
+import time
+
+import pytest
+import requests
+
+from surquest.utils.appstoreconnect.analytics.client import Client
+from surquest.utils.appstoreconnect.analytics.ratelimit import RateLimiter
+from surquest.utils.appstoreconnect.analytics.exceptions import AppStoreConnectAnalyticsRequestError
+
+
+class FakeResponse:
+
+    def __init__(self, status_code, headers=None, body=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = ""
+        self.content = json.dumps(body).encode("utf-8")
+
+    def close(self):
+        pass
+
+
+class ScriptedClient(Client):
+    """
+    A client replaying a fixed sequence of responses instead of calling the API.
+    """
+
+    def __init__(self, responses, rate_limiter):
+        super().__init__(mayacinfo="", rate_limiter=rate_limiter)
+        self.responses = list(responses)
+        self.calls = 0
+
+    def _get_itctx(self):
+        return "ctx"
+
+    def do_request(self, url, method="POST", data=None, stream=False):
+
+        self.calls += 1
+        response = self.responses.pop(0)
+
+        if isinstance(response, Exception):
+            raise response
+
+        return response
+
+
+class TestRateLimiter:
+
+    def test_parse_retry_after(self):
+
+        assert RateLimiter.parse_retry_after("3") == 3.0
+        assert RateLimiter.parse_retry_after(None) is None
+        assert RateLimiter.parse_retry_after("garbage") is None
+
+        date = email.utils.formatdate(time.time() + 30, usegmt=True)
+        delay = RateLimiter.parse_retry_after(date)
+
+        assert 25 <= delay <= 31, F"Expected a delay of about 30 seconds, got: {delay}."
+
+    def test_throttle_halves_the_rate(self):
+
+        limiter = RateLimiter(rate=8.0, min_rate=1.0)
+
+        limiter.on_throttle()
+        assert limiter.rate == 4.0, F"Expected the rate to be halved, got: {limiter.rate}."
+
+        for _ in range(5):
+            limiter.on_throttle()
+        assert limiter.rate == 1.0, F"Expected the rate to stop at min_rate, got: {limiter.rate}."
+
+        limiter.on_success()
+        assert limiter.rate == pytest.approx(1.05), F"Expected an additive increase, got: {limiter.rate}."
+
+    def test_token_bucket_paces_requests(self):
+
+        limiter = RateLimiter(rate=10.0, burst=2)
+
+        waits = [limiter.acquire() for _ in range(4)]
+
+        assert waits[0] == 0 and waits[1] == 0, F"Expected the burst to pass immediately, got: {waits}."
+        assert waits[3] == pytest.approx(0.2, abs=0.02), F"Expected the 4th request to wait 0.2 s, got: {waits}."
+
+    def test_retry_after_blocks_all_requests(self):
+
+        limiter = RateLimiter()
+        limiter.on_throttle(retry_after=5)
+
+        assert limiter.acquire() > 4.9, "Expected the Retry-After window to block the next request."
+
+    def test_backoff_is_bounded(self):
+
+        limiter = RateLimiter(backoff_base=1.0, backoff_max=4.0)
+
+        assert all(0 <= limiter.get_backoff(attempt=attempt) <= 4.0 for attempt in range(10))
+        assert limiter.get_backoff(attempt=3, retry_after=7.0) == 7.0
+
+    def test_should_retry(self):
+
+        limiter = RateLimiter(max_retries=2)
+
+        assert limiter.should_retry(status_code=429, attempt=0)
+        assert limiter.should_retry(status_code=None, attempt=1)
+        assert not limiter.should_retry(status_code=400, attempt=0)
+        assert not limiter.should_retry(status_code=503, attempt=2)
+
+
+class TestClientRetries:
+
+    def test_retries_throttled_and_failed_requests(self):
+
+        client = ScriptedClient(
+            responses=[
+                FakeResponse(429, headers={"Retry-After": "0"}),
+                requests.ConnectionError("reset"),
+                FakeResponse(503),
+                FakeResponse(200, body={"results": []}),
+            ],
+            rate_limiter=RateLimiter(backoff_base=0.001),
+        )
+
+        data = client.request(url="https://example.com")
+
+        assert data == {"results": []}, F"Expected the last response, got: {data}."
+        assert client.calls == 4, F"Expected 4 attempts, got: {client.calls}."
+        assert client.rate_limiter.rate is not None, "Expected the 429 to switch on the rate limit."
+
+    def test_gives_up_after_max_retries(self):
+
+        client = ScriptedClient(
+            responses=[FakeResponse(503) for _ in range(3)],
+            rate_limiter=RateLimiter(max_retries=2, backoff_base=0.001),
+        )
+
+        with pytest.raises(AppStoreConnectAnalyticsRequestError):
+            client.request(url="https://example.com")
+
+        assert client.calls == 3, F"Expected 3 attempts, got: {client.calls}."
+
+    def test_does_not_retry_client_errors(self):
+
+        client = ScriptedClient(
+            responses=[FakeResponse(400)],
+            rate_limiter=RateLimiter(backoff_base=0.001),
+        )
+
+        with pytest.raises(AppStoreConnectAnalyticsRequestError):
+            client.request(url="https://example.com")
+
+        assert client.calls == 1, F"Expected a single attempt, got: {client.calls}."
+
+
+class TestAsyncClientRetries:
+
+    def test_retries_like_the_client(self):
+
+        aiohttp = pytest.importorskip("aiohttp")
+
+        from surquest.utils.appstoreconnect.analytics.async_client import AsyncClient
+
+        class ScriptedAsyncClient(AsyncClient):
+
+            def __init__(self, responses, rate_limiter):
+                super().__init__(mayacinfo="", rate_limiter=rate_limiter)
+                self.responses = list(responses)
+                self.calls = 0
+                self.resets = 0
+
+            async def _get_itctx(self):
+                return "ctx"
+
+            async def _reset_session(self, itctx):
+                self.resets += 1
+
+            async def do_request(self, url, method="POST", data=None):
+
+                self.calls += 1
+                response = self.responses.pop(0)
+
+                if isinstance(response, Exception):
+                    raise response
+
+                return response.status_code, response.headers, response.content
+
+        client = ScriptedAsyncClient(
+            responses=[
+                FakeResponse(401),
+                FakeResponse(429, headers={"Retry-After": "0"}),
+                aiohttp.ClientConnectionError("reset"),
+                FakeResponse(503),
+                FakeResponse(200, body={"results": []}),
+            ],
+            rate_limiter=RateLimiter(backoff_base=0.001),
+        )
+
+        data = asyncio.run(client.request(url="https://example.com"))
+
+        assert data == {"results": []}, F"Expected the last response, got: {data}."
+        assert client.calls == 5, F"Expected 5 attempts, got: {client.calls}."
+        assert client.resets == 1, F"Expected a single re-authentication, got: {client.resets}."
+        assert client.rate_limiter.rate is not None, "Expected the 429 to switch on the rate limit."
+
+        client = ScriptedAsyncClient(
+            responses=[FakeResponse(503) for _ in range(3)],
+            rate_limiter=RateLimiter(max_retries=2, backoff_base=0.001),
+        )
+
+        with pytest.raises(AppStoreConnectAnalyticsRequestError):
+            asyncio.run(client.request(url="https://example.com"))
+
+        assert client.calls == 3, F"Expected 3 attempts, got: {client.calls}."
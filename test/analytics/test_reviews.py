@@ -1,8 +1,10 @@
 import os
+import pytest
 import datetime as dt
 
 from surquest.utils.appstoreconnect.analytics.client import Client
 from surquest.utils.appstoreconnect.analytics.reviews import Reviews
+from surquest.utils.appstoreconnect.analytics.sync import MemoryStateStore
        
 
 class TestReviews:
@@ -43,4 +45,102 @@ class TestReviews:
         assert len(reviews) > 0, F"Expected reviews to not be empty, got: {reviews}."
         assert isinstance(reviews_count, int), F"Expected type: int, got: {type(reviews_count)}."
         assert reviews_count > 0, F"Expected reviews count to be greater than 0, got: {reviews_count}."
-        assert len(reviews) == 2, F"Expected count of reviews is 2, got: {len(reviews)}"
\ No newline at end of file
+        assert len(reviews) == 2, F"Expected count of reviews is 2, got: {len(reviews)}"
+
+class PagedClient:
+    """
+    Stand-in for Client serving review pages of 3 reviews, newest first.
+    """
+
+    get_endpoint = staticmethod(Client.get_endpoint)
+
+    def __init__(self, count=10, fail_at=None):
+        self.count = count
+        self.fail_at = fail_at
+        self.indexes = []
+
+    def request(self, url, method="GET", data=None):
+
+        index = int(url.split("index=")[1].split("&")[0])
+        self.indexes.append(index)
+
+        if index == self.fail_at:
+            raise ConnectionError("connection reset")
+
+        ids = range(index * 3, min(index * 3 + 3, self.count))
+
+        return {"data": {
+            "reviewCount": self.count,
+            "reviews": [
+                {"value": {"id": 1000 - i, "lastModified": int(dt.datetime(2023, 7, 20).timestamp() * 1000) - i * 3600000}}
+                for i in ids
+            ]
+        }}
+
+
+class TestReviewsPagination:
+
+    def test_fetch_parallel(self):
+
+        client = PagedClient(count=10)
+        reviews = Reviews(client=client, max_workers=3)
+
+        reviews_count, data = reviews.fetch(app_id="1")
+
+        assert reviews_count == 10
+        assert [r.get("id") for r in data] == [1000 - i for i in range(10)]
+        assert sorted(client.indexes) == [0, 1, 2, 3], F"Expected pages 0-3, got: {client.indexes}."
+
+    def test_one_pool_per_fetch(self, monkeypatch):
+
+        from surquest.utils.appstoreconnect.analytics import reviews as module
+
+        pools = []
+
+        class CountingExecutor(module.ThreadPoolExecutor):
+
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                pools.append(self)
+
+        monkeypatch.setattr(module, "ThreadPoolExecutor", CountingExecutor)
+
+        client = PagedClient(count=30)
+        reviews_count, data = Reviews(client=client).fetch(app_id="1")
+
+        assert len(data) == 30
+        assert len(pools) == 1, F"Expected one thread pool for 10 pages, got: {len(pools)}."
+        assert pools[0]._max_workers == 4, "Expected the pages to be fetched concurrently by default."
+
+    def test_fetch_stops_at_last_known_review(self):
+
+        reviews = Reviews(client=PagedClient(count=10), max_workers=3)
+
+        reviews_count, data = reviews.fetch(app_id="1", last_known_review_id=995)
+
+        assert [r.get("id") for r in data] == [1000, 999, 998, 997, 996]
+
+    def test_fetch_resumes_from_checkpoint(self):
+
+        store = MemoryStateStore()
+        client = PagedClient(count=10, fail_at=2)
+
+        with pytest.raises(ConnectionError):
+            Reviews(client=client, checkpoint=store).fetch(app_id="1")
+
+        client = PagedClient(count=10)
+        reviews_count, data = Reviews(client=client, checkpoint=store).fetch(app_id="1")
+
+        assert client.indexes == [2, 3], F"Expected to resume at page 2, got: {client.indexes}."
+        assert [r.get("id") for r in data] == [1000 - i for i in range(10)]
+
+    def test_iter_reviews(self):
+
+        client = PagedClient(count=10)
+        reviews = Reviews(client=client, max_workers=2).iter_reviews(app_id="1")
+
+        first = next(reviews)
+
+        assert first.get("id") == 1000
+        assert client.indexes == [0], F"Expected only the first page to be requested, got: {client.indexes}."
+        assert len([first, *reviews]) == 10
@@ -0,0 +1,216 @@
+import time
+import asyncio
+import threading
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from surquest.utils.appstoreconnect.analytics.client import Client
+from surquest.utils.appstoreconnect.analytics.analytics import Analytics
+from surquest.utils.appstoreconnect.analytics.async_analytics import AsyncAnalytics
+from surquest.utils.appstoreconnect.analytics.singleflight import SingleFlight, AsyncSingleFlight
+from surquest.utils.appstoreconnect.analytics.enums import Measure
+
+
+class SlowClient:
+    """
+    Stand-in for Client counting the requests and answering them after a delay.
+    """
+
+    get_endpoint = staticmethod(Client.get_endpoint)
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+
+    def request(self, url, method="POST", data=None):
+
+        self.calls += 1
+        time.sleep(self.delay)
+
+        return {"size": 1, "results": [{"adamId": "1", "group": None, "data": [{"date": data.get("startTime"), "installs": 1.0}]}]}
+
+
+class AsyncSlowClient(SlowClient):
+
+    async def request(self, url, method="POST", data=None):
+
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+
+        return {"size": 1, "results": [{"adamId": "1", "group": None, "data": [{"date": data.get("startTime"), "installs": 1.0}]}]}
+
+
+KWARGS = {
+    "app_id": "1",
+    "measure": Measure.INSTALLS,
+    "start_date": dt.date(2023, 7, 1),
+    "end_date": dt.date(2023, 7, 1),
+}
+
+
+class TestSingleFlight:
+
+    def test_concurrent_calls_share_one_call(self):
+
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def function():
+            calls.append(1)
+            started.set()
+            release.wait()
+            return {"value": 1}
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            leader = executor.submit(flight.do, "key", function)
+            started.wait()
+            followers = [executor.submit(flight.do, "key", function) for _ in range(4)]
+
+            # Give the followers time to join the call in flight.
+            time.sleep(0.05)
+            release.set()
+
+            results = [leader.result()] + [future.result() for future in followers]
+
+        assert len(calls) == 1, F"Expected one call, got: {len(calls)}."
+        assert all(result is results[0] for result in results), "Expected a shared result."
+        assert len(flight) == 0, "Expected the finished call to be forgotten."
+
+    def test_errors_reach_every_caller(self):
+
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def function():
+            started.set()
+            release.wait()
+            raise ValueError("failed")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(flight.do, "key", function)
+            started.wait()
+            follower = executor.submit(flight.do, "key", function)
+            time.sleep(0.05)
+            release.set()
+
+            for future in (leader, follower):
+                with pytest.raises(ValueError):
+                    future.result()
+
+        assert flight.do("key", lambda: 2) == 2, "Expected a failed call not to be reused."
+
+    def test_analytics_coalesces_identical_requests(self):
+
+        client = SlowClient()
+        flight = SingleFlight()
+        tenants = [Analytics(client=client, single_flight=flight) for _ in range(4)]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda analytics: analytics.get_time_series(**KWARGS), tenants))
+
+        assert client.calls == 1, F"Expected one request, got: {client.calls}."
+        assert all(rows == results[0] for rows in results)
+
+    def test_analytics_does_not_coalesce_other_accounts(self):
+
+        clients = [SlowClient(), SlowClient()]
+        flight = SingleFlight()
+        tenants = [Analytics(client=client, single_flight=flight) for client in clients]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(lambda analytics: analytics.get_time_series(**KWARGS), tenants))
+
+        assert [client.calls for client in clients] == [1, 1], F"Expected a request per client, got: {[client.calls for client in clients]}."
+
+        # Clients of the same account share their requests.
+        for client, mayacinfo in zip(clients, ["a", "a"]):
+            client.identity = Client.get_identity(mayacinfo=mayacinfo)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            list(executor.map(lambda analytics: analytics.get_time_series(**KWARGS), tenants))
+
+        assert sum(client.calls for client in clients) == 3, F"Expected one more request, got: {[client.calls for client in clients]}."
+        assert Client.get_identity(mayacinfo="a") != Client.get_identity(mayacinfo="b")
+
+
+class TestAsyncSingleFlight:
+
+    def test_concurrent_calls_share_one_task(self):
+
+        async def run():
+            client = AsyncSlowClient()
+            analytics = AsyncAnalytics(client=client, single_flight=AsyncSingleFlight())
+
+            results = await asyncio.gather(*[analytics.get_time_series(**KWARGS) for _ in range(5)])
+
+            return client.calls, results
+
+        calls, results = asyncio.run(run())
+
+        assert calls == 1, F"Expected one request, got: {calls}."
+        assert len(results) == 5
+
+    def test_cancelled_caller_leaves_the_task_running(self):
+
+        async def run():
+            flight = AsyncSingleFlight()
+
+            async def function():
+                await asyncio.sleep(0.05)
+                return "done"
+
+            first = asyncio.ensure_future(flight.do("key", function))
+            second = asyncio.ensure_future(flight.do("key", function))
+            await asyncio.sleep(0)
+
+            first.cancel()
+
+            return await second, first.cancelled(), len(flight)
+
+        result, cancelled, pending = asyncio.run(run())
+
+        assert result == "done" and cancelled and pending == 0
+
+    def test_task_is_cancelled_with_its_last_caller(self):
+
+        async def run():
+            flight = AsyncSingleFlight()
+            finished = []
+
+            async def function():
+                await asyncio.sleep(0.05)
+                finished.append(1)
+
+            callers = [asyncio.ensure_future(flight.do("key", function)) for _ in range(2)]
+            await asyncio.sleep(0)
+
+            for caller in callers:
+                caller.cancel()
+
+            await asyncio.sleep(0.1)
+
+            return finished, len(flight)
+
+        finished, pending = asyncio.run(run())
+
+        assert finished == [] and pending == 0, "Expected the orphaned task to be cancelled."
+
+    def test_errors_reach_every_caller(self):
+
+        async def run():
+            flight = AsyncSingleFlight()
+
+            async def function():
+                await asyncio.sleep(0.01)
+                raise ValueError("failed")
+
+            return await asyncio.gather(*[flight.do("key", function) for _ in range(3)], return_exceptions=True)
+
+        results = asyncio.run(run())
+
+        assert all(isinstance(result, ValueError) for result in results), F"Unexpected results: {results}."
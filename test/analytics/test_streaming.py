@@ -0,0 +1,103 @@
+import os
+import json
+import datetime as dt
+
+from surquest.utils.appstoreconnect.analytics.client import Client
+from surquest.utils.appstoreconnect.analytics.analytics import Analytics
+from surquest.utils.appstoreconnect.analytics.streaming import JSONArrayStream, iter_array
+from surquest.utils.appstoreconnect.analytics.transport import ReplayTransport
+from surquest.utils.appstoreconnect.analytics.enums import Measure, Group
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "..", "data", "sample", "input.grouped.json")
+
+REVIEWS = {
+    "data": {
+        "reviewCount": 3,
+        "meta": [1, {"reviews": ["not", "this"]}],
+        "reviews": [
+            {"value": {"id": 1, "review": "Great \"app\" [5/5] {really}"}},
+            {"value": {"id": 2, "review": "Back\\slash é 😀"}},
+            {"value": {"id": 3, "review": ""}},
+        ],
+    },
+    "statusCode": "SUCCESS",
+}
+
+
+def chunked(body, size):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+class TestJSONArrayStream:
+
+    def test_every_chunk_boundary(self):
+
+        with open(SAMPLE, "rb") as f:
+            body = f.read()
+
+        expected = json.loads(body).get("results")
+
+        for size in (1, 2, 7, 64, len(body)):
+            actual = list(iter_array(chunks=chunked(body, size), path="results"))
+
+            assert actual == expected, F"Expected the results to be parsed with chunks of {size} bytes."
+
+    def test_nested_path_and_strings(self):
+
+        body = json.dumps(REVIEWS).encode("utf-8")
+
+        for size in (1, 3, len(body)):
+            actual = list(iter_array(chunks=chunked(body, size), path="data.reviews"))
+
+            assert actual == REVIEWS["data"]["reviews"], F"Expected the reviews to be parsed with chunks of {size} bytes."
+
+    def test_scalars_and_missing_array(self):
+
+        assert list(iter_array(chunks=[b'{"results": [1, "a,]", null, true]}'], path="results")) == [1, "a,]", None, True]
+        assert list(iter_array(chunks=[b'{"results": null}'], path="results")) == []
+        assert list(iter_array(chunks=[b'{"other": {"results": [1]}}'], path="results")) == []
+
+    def test_buffer_is_bounded(self):
+
+        stream = JSONArrayStream(path="results")
+        element = json.dumps({"adamId": "1", "data": [{"date": "2023-07-01", "installs": 1}] * 10}).encode("utf-8")
+        count = 0
+
+        for chunk in chunked(b'{"results": [' + b",".join([element] * 1000) + b"]}", 512):
+            count += sum(1 for _ in stream.feed(chunk))
+
+            assert len(stream._JSONArrayStream__buffer) < len(element) + 512, "Expected only one element to be buffered."
+
+        assert count == 1000 and stream.finished
+
+
+class TestClientStream:
+
+    def test_stream_matches_request(self):
+
+        with open(SAMPLE, "rb") as f:
+            body = f.read()
+
+        transport = ReplayTransport()
+        transport.add(url=Client.get_endpoint(), body=body)
+
+        with Client(mayacinfo="", transport=transport) as client:
+            streamed = list(client.stream(url=Client.get_endpoint(), data={}, chunk_size=16))
+
+            assert streamed == client.request(url=Client.get_endpoint(), data={}).get("results")
+
+            kwargs = {
+                "app_id": "1",
+                "measure": Measure.INSTALLS,
+                "start_date": dt.date(2023, 7, 1),
+                "end_date": dt.date(2023, 7, 2),
+                "grouping": Group.DEVICE,
+            }
+            analytics = Analytics(client=client)
+
+            strip = lambda rows: [{k: v for k, v in row.items() if not str(k).startswith("__")} for row in rows]
+
+            expected = strip(analytics.iter_time_series(**kwargs))
+            actual = strip(analytics.iter_time_series(stream=True, **kwargs))
+
+        assert actual == expected, "Expected the streamed rows to match the buffered rows."
@@ -0,0 +1,73 @@
+import datetime as dt
+
+import pytest
+
+from surquest.utils.appstoreconnect.analytics.client import Client
+from surquest.utils.appstoreconnect.analytics.analytics import Analytics
+from surquest.utils.appstoreconnect.analytics.enums import Measure
+from surquest.utils.appstoreconnect.analytics.sync import IncrementalSync, StateStore, MemoryStateStore, SQLiteStateStore
+
+
+class DailyClient:
+    """
+    Stand-in for Client serving one installs value per day from a dictionary.
+    """
+
+    get_endpoint = staticmethod(Client.get_endpoint)
+
+    def __init__(self, values):
+        self.values = values
+        self.payloads = []
+
+    def request(self, url, method="POST", data=None):
+
+        self.payloads.append(data)
+
+        start = dt.date.fromisoformat(data.get("startTime")[:10])
+        end = dt.date.fromisoformat(data.get("endTime")[:10])
+        dates = [start + dt.timedelta(days=i) for i in range((end - start).days + 1)]
+
+        return {"results": [{
+            "adamId": "1",
+            "group": None,
+            "data": [
+                {"date": date.isoformat() + "T00:00:00Z", "installs": self.values.get(date, 0.0)}
+                for date in dates
+            ]
+        }]}
+
+
+class TestIncrementalSync:
+
+    def test_sync_returns_new_and_restated_rows(self):
+
+        client = DailyClient(values={})
+        sync = IncrementalSync(analytics=Analytics(client=client), store=MemoryStateStore(), lookback=2)
+
+        rows = sync.sync(app_id="1", measure=Measure.INSTALLS, start_date=dt.date(2023, 1, 1), end_date=dt.date(2023, 1, 10))
+
+        assert len(rows) == 10, F"Expected 10 rows on the first sync, got: {len(rows)}."
+
+        # Apple restates the last day and adds two new days.
+        client.values[dt.date(2023, 1, 10)] = 5.0
+
+        rows = sync.sync(app_id="1", measure=Measure.INSTALLS, end_date=dt.date(2023, 1, 12))
+
+        assert client.payloads[-1].get("startTime") == "2023-01-08T00:00:00Z"
+        assert [row.get("date") for row in rows] == ["2023-01-10", "2023-01-11", "2023-01-12"]
+
+    def test_sqlite_state_store(self, tmp_path):
+
+        store = SQLiteStateStore(path=str(tmp_path / "state.sqlite"))
+        store.set("key", {"watermark": "2023-01-01", "fingerprints": {}})
+        store.close()
+
+        store = SQLiteStateStore(path=str(tmp_path / "state.sqlite"))
+
+        assert store.get("key") == {"watermark": "2023-01-01", "fingerprints": {}}
+        assert store.get("other") is None
+
+    def test_state_store_is_abstract(self):
+
+        with pytest.raises(TypeError):
+            StateStore()
@@ -0,0 +1,78 @@
+import os
+import json
+import datetime as dt
+
+from surquest.utils.appstoreconnect.analytics.client import Client
+from surquest.utils.appstoreconnect.analytics.analytics import Analytics
+from surquest.utils.appstoreconnect.analytics.ratelimit import RateLimiter
+from surquest.utils.appstoreconnect.analytics.transport import ReplayTransport
+from surquest.utils.appstoreconnect.analytics.enums import Measure, Group
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "..", "data", "sample", "input.grouped.json")
+
+URL = Client.get_endpoint(subject="time-series")
+
+
+def load_sample():
+
+    with open(SAMPLE) as f:
+        return json.load(f)
+
+
+class TestReplayTransport:
+
+    def test_pipeline_against_replayed_response(self):
+
+        transport = ReplayTransport()
+        transport.add(url=URL, body=load_sample())
+
+        with Client(mayacinfo="", transport=transport) as client:
+            rows = Analytics(client=client).get_time_series(
+                app_id="1",
+                measure=Measure.INSTALLS,
+                start_date=dt.date(2023, 7, 1),
+                end_date=dt.date(2023, 7, 2),
+                grouping=Group.DEVICE,
+            )
+
+            assert client.session.headers.get("X-Apple-Widget-Key") == ReplayTransport.WIDGET_KEY
+
+        assert len(rows) == 10, F"Expected 10 rows, got: {len(rows)}."
+        assert transport.calls == 3, F"Expected 2 auth calls and 1 data call, got: {transport.calls}."
+
+    def test_payload_matching(self):
+
+        transport = ReplayTransport()
+        transport.add(url=URL, payload={"a": 1}, body={"results": "a"})
+        transport.add(url=URL, body={"results": "any"})
+
+        with Client(mayacinfo="", transport=transport) as client:
+            assert client.request(url=URL, data={"a": 1}) == {"results": "a"}
+            assert client.request(url=URL, data={"b": 2}) == {"results": "any"}
+
+    def test_throttle_injection(self):
+
+        transport = ReplayTransport(throttle_rate=0.5, retry_after=0, seed=1)
+        transport.add(url=URL, body={"results": []})
+
+        client = Client(
+            mayacinfo="",
+            transport=transport,
+            rate_limiter=RateLimiter(max_retries=20, min_rate=1000),
+        )
+
+        for _ in range(10):
+            assert client.request(url=URL, data={}) == {"results": []}
+
+        assert transport.throttled > 0, "Expected some requests to be throttled."
+        assert transport.calls == 12 + transport.throttled, F"Expected every throttled request to be retried, got: {transport.calls}."
+
+    def test_load_recording(self, tmp_path):
+
+        path = str(tmp_path / "recording.json")
+
+        with open(path, "w") as f:
+            json.dump([{"method": "POST", "url": URL, "payload": None, "status": 200, "body": '{"results": []}'}], f)
+
+        with Client(mayacinfo="", transport=ReplayTransport.load(path)) as client:
+            assert client.request(url=URL) == {"results": []}
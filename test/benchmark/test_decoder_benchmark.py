@@ -0,0 +1,63 @@
+import os
+import json
+import time
+
+import pytest
+
+from surquest.utils.appstoreconnect.analytics.decoder import JSONDecoder
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "..", "data", "sample", "input.grouped.json")
+
+
+def grouped_body(scale):
+    """
+    Returns the encoded grouped sample response with its series repeated `scale` times.
+    """
+
+    with open(SAMPLE) as f:
+        data = json.load(f)
+
+    results = [
+        {**item, "adamId": str(int(item.get("adamId")) + i)}
+        for i in range(scale)
+        for item in data.get("results")
+    ]
+
+    return json.dumps({"size": len(results), "results": results}).encode("utf-8")
+
+
+def best_of(function, repeat=5):
+
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+class TestDecoderBenchmark:
+
+    body = grouped_body(scale=2000)
+
+    def test_orjson_decodes_like_json(self):
+
+        pytest.importorskip("orjson")
+
+        assert JSONDecoder(backend="orjson")(self.body) == json.loads(self.body)
+
+    @pytest.mark.benchmark
+    def test_orjson_speedup(self):
+
+        pytest.importorskip("orjson")
+
+        # requests.Response.json() decodes the text of the body with the standard library.
+        legacy = best_of(lambda: json.loads(self.body.decode("utf-8")))
+        optimized = best_of(lambda: JSONDecoder(backend="orjson")(self.body))
+
+        print(F"\nDecoding {len(self.body) / 1e6:.1f} MB: json {legacy:.4f}s, orjson {optimized:.4f}s, speedup {legacy / optimized:.1f}x")
+
+        # The grouped responses are mostly tiny objects, so allocation bounds the gain.
+        assert optimized < legacy, F"Expected orjson to be faster, got: {legacy / optimized:.1f}x."
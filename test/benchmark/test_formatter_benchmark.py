@@ -0,0 +1,194 @@
+import os
+import json
+import time
+import tracemalloc
+import datetime as dt
+
+import pytest
+
+from surquest.utils.appstoreconnect.analytics.formatter import Formatter
+from surquest.utils.appstoreconnect.analytics.enums import Measure, Group
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "..", "data", "sample", "input.grouped.json")
+
+
+def load_sample(scale):
+    """
+    Returns the grouped sample response with every series repeated `scale` times
+    for 30 days.
+    """
+
+    with open(SAMPLE) as f:
+        data = json.load(f)
+
+    dates = [(dt.date(2023, 1, 1) + dt.timedelta(days=i)).strftime("%Y-%m-%dT00:00:00Z") for i in range(30)]
+
+    results = []
+
+    for i in range(scale):
+        for item in data.get("results"):
+            results.append({
+                **item,
+                "adamId": str(int(item.get("adamId")) + i),
+                "data": [{"date": date, "installs": record.get("installs")} for date in dates for record in item.get("data")[:1]]
+            })
+
+    return {"size": len(results), "results": results}
+
+
+def legacy_run(data, grouping, measure):
+    """
+    Formatter.run before the per-call metadata was hoisted out of the row loop.
+    """
+
+    out = []
+
+    for item in data.get("results"):
+        app_id = item.get("adamId")
+        segmentation = grouping
+        segment = (
+            "<total>"
+            if item.get("group") is None
+            else item.get("group").get("title")
+        )
+        segmentation_name = (
+            "<total>" if segmentation.value is None else segmentation.name
+        )
+
+        for record in item.get("data"):
+            out.append(
+                {
+                    "date": str(record.get("date")).split("T")[0],
+                    "app_id": app_id,
+                    "segmentation_name": segmentation_name,
+                    "segment": segment,
+                    measure: None
+                    if record.get(measure.value) == -1.0
+                    else record.get(measure),
+                    "__record_month": int(dt.datetime.utcnow().strftime("%Y%m")),
+                    "__record_create_date": dt.datetime.utcnow().strftime(
+                        "%Y-%m-%dT%H:%M:%SZ"
+                    ),
+                }
+            )
+
+    return out
+
+
+def best_of(function, repeat=3, **kwargs):
+
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(**kwargs)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+class TestFormatterBenchmark:
+
+    data = load_sample(scale=200)
+
+    def test_run_matches_legacy(self):
+
+        kwargs = {"data": self.data, "grouping": Group.DEVICE, "measure": Measure.INSTALLS}
+
+        expected = legacy_run(**kwargs)
+        actual = Formatter.run(**kwargs)
+
+        strip = lambda rows: [{k: v for k, v in row.items() if not str(k).startswith("__")} for row in rows]
+
+        assert strip(actual) == strip(expected), "Expected the optimized formatter to produce the same rows."
+        assert len({row.get("__record_create_date") for row in actual}) == 1, "Expected one timestamp per call."
+
+    @pytest.mark.benchmark
+    def test_run_speedup(self):
+
+        kwargs = {"data": self.data, "grouping": Group.DEVICE, "measure": Measure.INSTALLS}
+
+        legacy = best_of(legacy_run, **kwargs)
+        optimized = best_of(Formatter.run, **kwargs)
+
+        rows = sum(len(item.get("data")) for item in self.data.get("results"))
+        print(F"\nFormatter.run on {rows} rows: legacy {legacy:.4f}s, optimized {optimized:.4f}s, speedup {legacy / optimized:.1f}x")
+
+        assert optimized * 2 < legacy, F"Expected at least 2x speedup, got: {legacy / optimized:.1f}x."
+
+    @pytest.mark.benchmark
+    def test_records_memory(self):
+
+        kwargs = {"data": self.data, "grouping": Group.DEVICE, "measure": Measure.INSTALLS}
+
+        peaks = {}
+
+        for formatter in (Formatter.run, Formatter.records):
+            tracemalloc.start()
+            rows = formatter(**kwargs)
+            peaks[formatter.__name__] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            del rows
+
+        print(
+            F"\nPeak memory on {len(self.data.get('results')) * 30} rows: run {peaks['run'] / 1e6:.1f} MB, "
+            + F"records {peaks['records'] / 1e6:.1f} MB, {peaks['run'] / peaks['records']:.1f}x less"
+        )
+
+        assert peaks["records"] * 2 < peaks["run"], F"Expected at least 2x less memory, got: {peaks}."
+
+
+def legacy_retentions(data):
+    """
+    Formatter.retentions before the timestamps were parsed once per distinct value.
+    """
+
+    return [
+        {
+            "purchasedAt": dt.datetime.strptime(purchase_day.get("appPurchase"), "%Y-%m-%dT%H:%M:%SZ"),
+            "date": dt.datetime.strptime(date.get("date"), "%Y-%m-%dT%H:%M:%SZ"),
+            "appId": purchase_day.get("adamId"),
+            "retentionPercentage": date.get("retentionPercentage"),
+            "retentionCount": date.get("value"),
+        }
+        for purchase_day in data.get("results")
+        for date in purchase_day.get("data")
+    ]
+
+
+def retention_sample(cohorts):
+    """
+    Returns a daily retention response with `cohorts` cohorts of one app.
+    """
+
+    start = dt.datetime(2021, 1, 1)
+    stamp = lambda day: (start + dt.timedelta(days=day)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    return {"results": [
+        {
+            "adamId": "1",
+            "appPurchase": stamp(cohort),
+            "data": [
+                {"date": stamp(cohort + offset), "retentionPercentage": 1.0, "value": 1.0}
+                for offset in range(cohorts - cohort)
+            ]
+        }
+        for cohort in range(cohorts)
+    ]}
+
+
+class TestRetentionBenchmark:
+
+    data = retention_sample(cohorts=180)
+
+    @pytest.mark.benchmark
+    def test_retentions_speedup(self):
+
+        Formatter.parse_timestamp.cache_clear()
+
+        legacy = best_of(legacy_retentions, data=self.data)
+        optimized = best_of(Formatter.retentions, data=self.data, grouping=[])
+
+        print(F"\nFormatter.retentions on 16290 cells: legacy {legacy:.4f}s, optimized {optimized:.4f}s, speedup {legacy / optimized:.1f}x")
+
+        assert optimized * 2 < legacy, F"Expected at least 2x speedup, got: {legacy / optimized:.1f}x."
@@ -0,0 +1,127 @@
+import os
+import json
+import time
+import datetime as dt
+import tracemalloc
+
+import pytest
+
+from surquest.utils.appstoreconnect.analytics.client import Client
+from surquest.utils.appstoreconnect.analytics.analytics import Analytics
+from surquest.utils.appstoreconnect.analytics.formatter import Formatter
+from surquest.utils.appstoreconnect.analytics.transport import ReplayTransport
+from surquest.utils.appstoreconnect.analytics.enums import Measure, Group
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "..", "data", "sample", "input.grouped.json")
+
+URL = Client.get_endpoint(subject="time-series")
+
+# The large scale only runs with --benchmark.
+SCALES = (1, 100, pytest.param(10000, marks=pytest.mark.benchmark))
+
+
+def scaled_body(scale):
+    """
+    Returns the encoded grouped sample response with its series repeated `scale`
+    times under distinct app IDs.
+    """
+
+    with open(SAMPLE) as f:
+        data = json.load(f)
+
+    results = [
+        {**item, "adamId": str(int(item.get("adamId")) + i)}
+        for i in range(scale)
+        for item in data.get("results")
+    ]
+
+    return json.dumps({"size": len(results), "results": results}).encode("utf-8")
+
+
+def extract(analytics, pipeline):
+    """
+    Runs the extract -> format pipeline against the replayed response and returns the number of rows.
+    """
+
+    kwargs = {
+        "app_id": "1",
+        "measure": Measure.INSTALLS,
+        "start_date": dt.date(2023, 7, 1),
+        "end_date": dt.date(2023, 7, 2),
+        "grouping": Group.DEVICE,
+    }
+
+    if pipeline == "rows":
+        return len(analytics.get_time_series(**kwargs))
+
+    if pipeline == "stream":
+        return sum(1 for _ in analytics.iter_time_series(**kwargs))
+
+    if pipeline == "incremental":
+        return sum(1 for _ in analytics.iter_time_series(stream=True, **kwargs))
+
+    return len(analytics.get_time_series(formatter=Formatter.columnar, **kwargs))
+
+
+def measure(function, repeat):
+    """
+    Returns the best time of `repeat` runs and the peak memory of one traced run.
+    """
+
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, min(timings), peak
+
+
+class TestPipelineBenchmark:
+
+    @pytest.mark.parametrize("scale", SCALES)
+    @pytest.mark.parametrize("pipeline", ["rows", "stream", "incremental", "columnar"])
+    def test_pipeline(self, scale, pipeline):
+
+        body = scaled_body(scale)
+
+        transport = ReplayTransport()
+        transport.add(url=URL, body=body)
+
+        with Client(mayacinfo="", transport=transport) as client:
+            analytics = Analytics(client=client)
+
+            rows, seconds, peak = measure(
+                lambda: extract(analytics=analytics, pipeline=pipeline),
+                repeat=3 if scale < 10000 else 1,
+            )
+
+        print(
+            F"\n{pipeline} x{scale}: {len(body) / 1e6:.2f} MB, {rows} rows in {seconds:.4f}s "
+            + F"({rows / seconds:,.0f} rows/s), peak memory {peak / 1e6:.1f} MB"
+        )
+
+        assert rows == 10 * scale, F"Expected {10 * scale} rows, got: {rows}."
+
+    def test_throttled_pipeline(self):
+
+        transport = ReplayTransport(latency=0.001, throttle_rate=0.2, retry_after=0)
+        transport.add(url=URL, body=scaled_body(1))
+
+        with Client(mayacinfo="", transport=transport) as client:
+            client.rate_limiter.min_rate = 1000
+            analytics = Analytics(client=client)
+
+            start = time.perf_counter()
+            rows = sum(extract(analytics=analytics, pipeline="rows") for _ in range(50))
+            seconds = time.perf_counter() - start
+
+        print(F"\n50 extractions with {transport.throttled} injected 429s in {seconds:.4f}s")
+
+        assert rows == 500, F"Expected 500 rows, got: {rows}."
@@ -0,0 +1,23 @@
+import pytest
+
+
+def pytest_addoption(parser):
+
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Run the timing and memory benchmarks marked with @pytest.mark.benchmark.",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+
+    if config.getoption("--benchmark"):
+        return
+
+    skip = pytest.mark.skip(reason="Benchmark, run with --benchmark.")
+
+    for item in items:
+        if item.get_closest_marker("benchmark") is not None:
+            item.add_marker(skip)